@@ -3,6 +3,7 @@ Example of using the SimpleAgent base class.
 """
 import os
 import sys
+import logging
 from dotenv import load_dotenv
 
 # Add the src directory to the path so we can import our modules
@@ -16,6 +17,8 @@ from src.agents.simpleagents.base_agent import SimpleAgent
 
 def main():
     """Run the SimpleAgent example."""
+    logging.basicConfig(level=logging.INFO)
+    
     # Get API keys from environment variables
     openai_api_key = os.environ.get('OPENAI_API_KEY')
     anthropic_api_key = os.environ.get('ANTHROPIC_API_KEY')
@@ -7,11 +7,11 @@ This script demonstrates how to use the data catalog agent and tests its functio
 import sys
 import os
 
-# Add the src directory to the path so we can import our agents
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Add the project root to the path so we can import our agents
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from agents.strands.data_catalog_agent import data_catalog_agent, orchestrate_data_catalog_query
-from agents.strands.excel_agent import excel_agent
+from src.agents.strands.data_catalog_agent import data_catalog_agent, orchestrate_data_catalog_query
+from src.agents.strands.excel_agent import excel_agent
 
 
 def test_data_catalog_agent():
@@ -8,7 +8,7 @@ setup(
         "anthropic>=0.5.0",
         "boto3>=1.28.0",
         "chromadb>=0.4.0",
-        "streamlit>=1.24.0",
+        "streamlit>=1.31.0",
         "chainlit>=0.7.0",
         "pyautogen>=0.1.0",
         "langchain>=0.0.267",
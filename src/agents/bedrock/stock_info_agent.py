@@ -57,21 +57,8 @@ class StockInfoAgent:
             Dict containing stock summary information
         """
         try:
-            # Fetch basic stock information
-            stock_info = yahoo_finance.get_stock_info(ticker)
-            
-            # Fetch historical data for the past month
-            historical_data = yahoo_finance.get_historical_data(ticker, period='1mo')
-            
-            # Fetch recent news about the company
-            news = yahoo_finance.get_company_news(ticker, limit=3)
-            
-            # Combine all the information
-            summary = {
-                'stock_info': stock_info,
-                'historical_data': historical_data,
-                'news': news
-            }
+            # Fetch basic information, the past month of prices and recent news in parallel
+            summary = yahoo_finance.get_stock_overview(ticker, period='1mo', news_limit=3)
             
             # Use Bedrock to generate a natural language summary
             nl_summary = self._generate_summary(summary)
@@ -102,10 +89,8 @@ class StockInfoAgent:
             # Fetch quotes for all tickers
             quotes = yahoo_finance.get_multiple_quotes(tickers)
             
-            # Fetch basic info for all tickers
-            stock_infos = {}
-            for ticker in tickers:
-                stock_infos[ticker] = yahoo_finance.get_stock_info(ticker)
+            # Fetch basic info for all tickers concurrently
+            stock_infos = yahoo_finance.get_multiple_stock_infos(tickers)
             
             # Combine the information
             comparison = {
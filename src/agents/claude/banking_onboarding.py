@@ -1,4 +1,4 @@
-import asyncio
+import functools
 import sys
 import os
 import uuid
@@ -33,14 +33,39 @@ from agent_squad.types import ConversationMessage
 
 
 # Import ChromaDB retriever from the new location
-from src.utils.db.chroma_retriever import ChromaDBRetriever, ChromaDBRetrieverOptions
+from src.utils.db.chroma_retriever import ChromaDBRetriever, ChromaDBRetrieverOptions, get_default_embedding_function
+from src.utils.db.faiss_retriever import FaissRetriever, FaissRetrieverOptions
 options = ChromaDBRetrieverOptions(
         persist_directory= './chromadb',
         collection_name='ubs-research',
         n_results= 5,
-        similarity_threshold= 0.3
+        similarity_threshold= 0.3,
+        # Load and warm the embedding model at startup instead of on the first query
+        embedding_function=get_default_embedding_function()
 )
 
+# FAISS index exported from the ubs-research collection (see src/utils/db/faiss_retriever.py).
+# Set RETRIEVER_BACKEND=chroma to query ChromaDB directly.
+faiss_options = FaissRetrieverOptions(
+        index_path='./faiss/ubs.index',
+        metadata_path='./faiss/ubs.json',
+        n_results=options.n_results,
+        # ChromaDB scores a hit as 1 - squared L2 distance, which is 2*cos - 1 for
+        # normalized embeddings, while FAISS scores the cosine itself
+        similarity_threshold=(options.similarity_threshold + 1) / 2,
+        embedding_function=options.embedding_function
+)
+
+# One retriever (and in-memory index) is shared by every investment agent
+@functools.lru_cache(maxsize=1)
+def get_research_retriever():
+    backend = os.getenv('RETRIEVER_BACKEND', 'faiss').lower()
+    if backend == 'faiss':
+        if os.path.exists(faiss_options.index_path):
+            return FaissRetriever(faiss_options)
+        logger.warning(f"FAISS index {faiss_options.index_path} not found, falling back to ChromaDB")
+    return ChromaDBRetriever(options)
+
 def create_relationship_agent(model:str,key:str):
     return AnthropicAgent(AnthropicAgentOptions(
         name="Relationship Agent",
@@ -73,7 +98,7 @@ def create_investment_agent(model:str, key:str):
         streaming=False,
         model_id=model,
         api_key=key,
-        retriever=ChromaDBRetriever(options)
+        retriever=get_research_retriever()
     ))
 
 async def handle_request(_orchestrator: AgentSquad, _user_input: str, _user_id: str, _session_id: str, chat_history: List[ConversationMessage]):
@@ -142,10 +167,16 @@ async def main(message: cl.Message):
     if user_input.lower() == 'quit':
             print("Exiting the program. Goodbye!")
             sys.exit()
-    response = asyncio.run(orchestrator.route_request(user_input, user_id, session_id, chat_history))
+    response = await handle_request(orchestrator, user_input, user_id, session_id, chat_history)
+    if response is None:
+        await cl.Message(
+            content="Sorry, something went wrong while processing your request.",
+        ).send()
+        return
 
-    #check if response includes the word TERMINATE
-    if 'TERMINATE' in response.output.content[0]['text']:
+    text = response.output.content[0]['text']
+    #check if the agent ended its reply with TERMINATE
+    if text.rstrip(" \n.").endswith('TERMINATE'):
         print('terminating')
         response = await reg_agent.process_request(user_input, user_id, session_id, chat_history)
         print(response.content)
@@ -154,7 +185,7 @@ async def main(message: cl.Message):
         ).send()
     else:
         await cl.Message(
-            content=response.output.content[0]['text'],
+            content=text,
         ).send()
 
 
@@ -6,17 +6,90 @@ This module provides the base class for Simple Language Model Agents (SimpleAgen
 import os
 import json
 import logging
-from typing import Dict, Any, List, Callable
+import functools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Callable, Iterator
 
 from dotenv import load_dotenv
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Set up logging; handlers are configured by the application entry point
 logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
+# Upper bound on tool calls executed concurrently for a single model response
+MAX_TOOL_WORKERS = 8
+
+# Defaults for the rolling chat history window
+DEFAULT_MAX_HISTORY_MESSAGES = 64
+DEFAULT_MAX_CONTEXT_TOKENS = 32000
+
+# Rough characters-per-token ratio used to estimate message sizes
+CHARS_PER_TOKEN = 4
+
+
+def _estimate_tokens(message: Dict[str, Any]) -> int:
+    """Cheaply estimate the number of tokens a history message will use."""
+    size = len(str(message.get("content") or ""))
+    if message.get("tool_calls"):
+        size += len(str(message["tool_calls"]))
+    return size // CHARS_PER_TOKEN + 1
+
+
+def _dumps_body(payload: Dict[str, Any]) -> bytes:
+    """Serialize a Bedrock request body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode("utf-8")
+
+
+def _loads_body(raw: bytes) -> Dict[str, Any]:
+    """Parse a Bedrock response body straight from bytes."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_openai_client(api_key: str):
+    """Return a shared OpenAI client for the given API key."""
+    from openai import OpenAI
+    return OpenAI(api_key=api_key)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_anthropic_client(api_key: str):
+    """Return a shared Anthropic client for the given API key."""
+    from anthropic import Anthropic
+    return Anthropic(api_key=api_key)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_huggingface_client(token: str):
+    """Return a shared Hugging Face inference client for the given token."""
+    from huggingface_hub import InferenceClient
+    return InferenceClient(token=token)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_bedrock_client(region: str):
+    """
+    Return a shared Bedrock runtime client for the given region.
+    
+    boto3 clients are thread-safe, so agents can share one client and its
+    connection pool instead of each building a new botocore session.
+    """
+    import boto3
+    return boto3.client('bedrock-runtime', region_name=region)
+
+
 class SimpleAgent:
     """
     Base class for Simple Language Model Agents.
@@ -34,7 +107,9 @@ class SimpleAgent:
         temperature: float = 0.2,
         max_tokens: int = 512,
         tools: List[Dict[str, Any]] = None,
-        system_prompt: str = None
+        system_prompt: str = None,
+        max_history_messages: int = DEFAULT_MAX_HISTORY_MESSAGES,
+        max_context_tokens: int = DEFAULT_MAX_CONTEXT_TOKENS
     ):
         """
         Initialize a SimpleAgent.
@@ -48,6 +123,8 @@ class SimpleAgent:
             max_tokens: Maximum number of tokens to generate
             tools: List of tools the agent can use
             system_prompt: System prompt to guide the agent's behavior
+            max_history_messages: Maximum number of non-system messages kept in the history
+            max_context_tokens: Approximate context budget shared by the history and the response
         """
         self.name = name
         self.description = description
@@ -55,51 +132,99 @@ class SimpleAgent:
         self.model_name = model_name
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self.max_history_messages = max_history_messages
+        self.max_context_tokens = max_context_tokens
         self.tools = tools or []
         self.system_prompt = system_prompt or f"You are {name}, {description}. Respond concisely and accurately."
         
+        # Tools don't change between calls, so build the provider payloads once
+        self._openai_tools_payload = self.tools or None
+        self._nova_tool_config = self._build_nova_tool_config()
+        
         # Initialize the appropriate client based on the model provider
         self._init_client()
         
-        # Message history
-        self.messages = [{"role": "system", "content": self.system_prompt}]
+        # Message history; the system message is kept apart from the rolling window
+        self._system_msg = {"role": "system", "content": self.system_prompt}
+        self._history = deque()
+        self._history_tokens = 0
         
         # Tool implementations
         self.tool_implementations = {}
+        
+        # Pool used to run independent tool calls concurrently (threads are spawned lazily)
+        self._tool_pool = ThreadPoolExecutor(max_workers=MAX_TOOL_WORKERS)
+    
+    def _build_nova_tool_config(self):
+        """
+        Convert the agent's tools to the Nova toolConfig format.
+        
+        Returns:
+            The toolConfig dictionary, or None if the agent has no function tools
+        """
+        nova_tools = []
+        for tool in self.tools:
+            if tool["type"] == "function":
+                nova_tools.append({
+                    "toolSpec": {
+                        "name": tool["function"]["name"],
+                        "description": tool["function"].get("description", ""),
+                        "inputSchema": {
+                            "json": tool["function"]["parameters"]
+                        }
+                    }
+                })
+        return {"tools": nova_tools} if nova_tools else None
     
     def _init_client(self):
         """Initialize the appropriate client based on the model provider."""
         if self.model_provider == "openai":
             try:
-                from openai import OpenAI
-                self.client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+                self.client = _get_openai_client(os.environ.get("OPENAI_API_KEY"))
             except ImportError:
                 logger.error("OpenAI package not installed. Install with: pip install openai")
                 raise
         elif self.model_provider == "anthropic":
             try:
-                from anthropic import Anthropic
-                self.client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+                self.client = _get_anthropic_client(os.environ.get("ANTHROPIC_API_KEY"))
             except ImportError:
                 logger.error("Anthropic package not installed. Install with: pip install anthropic")
                 raise
         elif self.model_provider == "huggingface":
             try:
-                from huggingface_hub import InferenceClient
-                self.client = InferenceClient(token=os.environ.get("HF_API_TOKEN"))
+                self.client = _get_huggingface_client(os.environ.get("HF_API_TOKEN"))
             except ImportError:
                 logger.error("Hugging Face package not installed. Install with: pip install huggingface_hub")
                 raise
         elif self.model_provider == "bedrock":
             try:
-                import boto3
-                self.client = boto3.client('bedrock-runtime', 
-                                          region_name=os.environ.get("AWS_REGION", "us-east-1"))
+                self.client = _get_bedrock_client(os.environ.get("AWS_REGION", "us-east-1"))
             except ImportError:
                 logger.error("Boto3 package not installed. Install with: pip install boto3")
                 raise
         else:
             raise ValueError(f"Unsupported model provider: {self.model_provider}")
+        
+        # Resolve the provider-specific call and stream implementations once
+        self._is_nova = False
+        self._stream_impl = None
+        if self.model_provider == "bedrock":
+            model_name = self.model_name.lower()
+            if "claude" in model_name:
+                self._call_impl = self._call_bedrock_claude
+                self._stream_impl = self._stream_bedrock_claude
+            elif "nova" in model_name:
+                self._call_impl = self._call_bedrock_nova
+                self._stream_impl = self._stream_bedrock_nova
+                self._is_nova = True
+            else:
+                self._call_impl = self._call_bedrock_generic
+        else:
+            self._call_impl = {
+                "openai": self._call_openai,
+                "anthropic": self._call_anthropic,
+                "huggingface": self._call_huggingface,
+            }[self.model_provider]
     
     def register_tool(self, tool_name: str, tool_function: Callable):
         """
@@ -122,267 +247,11 @@ class SimpleAgent:
             Model response
         """
         try:
-            logger.debug(f"Calling model {self.model_provider}/{self.model_name}")
-            logger.debug(f"Messages: {json.dumps(messages, indent=2)}")
+            logger.debug("Calling model %s/%s", self.model_provider, self.model_name)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Messages: %s", json.dumps(messages, indent=2))
             
-            if self.model_provider == "openai":
-                response = self.client.chat.completions.create(
-                    model=self.model_name,
-                    messages=messages,
-                    temperature=self.temperature,
-                    max_tokens=self.max_tokens,
-                    tools=self.tools if self.tools else None
-                )
-                logger.info(f"OpenAI response: {response.choices[0].message}")
-                return {
-                    "content": response.choices[0].message.content,
-                    "tool_calls": response.choices[0].message.tool_calls if hasattr(response.choices[0].message, 'tool_calls') else None
-                }
-            
-            elif self.model_provider == "anthropic":
-                message_content = []
-                for msg in messages:
-                    if msg["role"] == "system":
-                        continue  # System messages handled differently in Anthropic
-                    elif msg["role"] == "user":
-                        message_content.append({"type": "text", "text": msg["content"]})
-                    elif msg["role"] == "assistant":
-                        message_content.append({"type": "text", "text": msg["content"]})
-                
-                system_message = next((msg["content"] for msg in messages if msg["role"] == "system"), None)
-                
-                response = self.client.messages.create(
-                    model=self.model_name,
-                    max_tokens=self.max_tokens,
-                    temperature=self.temperature,
-                    system=system_message,
-                    messages=message_content
-                )
-                
-                return {
-                    "content": response.content[0].text,
-                    "tool_calls": None  # Anthropic doesn't support tool calls in the same way
-                }
-            
-            elif self.model_provider == "huggingface":
-                # Convert messages to a format HF can understand
-                prompt = ""
-                for msg in messages:
-                    if msg["role"] == "system":
-                        prompt += f"<|system|>\n{msg['content']}\n"
-                    elif msg["role"] == "user":
-                        prompt += f"<|user|>\n{msg['content']}\n"
-                    elif msg["role"] == "assistant":
-                        prompt += f"<|assistant|>\n{msg['content']}\n"
-                
-                prompt += "<|assistant|>\n"
-                
-                response = self.client.text_generation(
-                    prompt,
-                    model=self.model_name,
-                    max_new_tokens=self.max_tokens,
-                    temperature=self.temperature
-                )
-                
-                return {
-                    "content": response,
-                    "tool_calls": None  # HF doesn't support tool calls in the same way
-                }
-            
-            elif self.model_provider == "bedrock":
-                # Convert messages to a format suitable for the Bedrock model
-                if "claude" in self.model_name.lower():
-                    # Claude format
-                    prompt = "\n\nHuman: "
-                    for msg in messages:
-                        if msg["role"] == "system":
-                            prompt = f"{msg['content']}\n\nHuman: "
-                        elif msg["role"] == "user":
-                            prompt += f"{msg['content']}\n\n"
-                        elif msg["role"] == "assistant":
-                            prompt += f"Assistant: {msg['content']}\n\nHuman: "
-                    
-                    prompt += "\n\nAssistant:"
-                    
-                    body = json.dumps({
-                        "prompt": prompt,
-                        "max_tokens_to_sample": self.max_tokens,
-                        "temperature": self.temperature
-                    })
-                    
-                    response = self.client.invoke_model(
-                        modelId=self.model_name,
-                        body=body
-                    )
-                    
-                    response_body = json.loads(response['body'].read().decode('utf-8'))
-                    return {
-                        "content": response_body.get("completion", ""),
-                        "tool_calls": None
-                    }
-                
-                elif "nova" in self.model_name.lower():
-                    # Nova format - Nova requires a specific message format
-                    # and doesn't support system messages
-                    
-                    # Format messages for Nova - only include user and assistant roles
-                    formatted_messages = []
-                    for msg in messages:
-                        if msg["role"] == "user":
-                            formatted_messages.append({
-                                "role": "user",
-                                "content": [{"text": msg["content"]}]
-                            })
-                        elif msg["role"] == "assistant":
-                            if msg.get("content") is not None:
-                                formatted_messages.append({
-                                    "role": "assistant",
-                                    "content": [{"text": msg["content"]}]
-                                })
-                            # elif msg.get("tool_calls"):
-                            #     # Format tool calls for Nova
-                            #     tool_call_content = []
-                            #     for tool_call in msg["tool_calls"]:
-                            #         tool_call_content.append({
-                            #             "id": tool_call["id"],
-                            #             "name": tool_call["function"]["name"],
-                            #             "input": json.loads(tool_call["function"]["arguments"])
-                            #         })
-                            #     formatted_messages.append({
-                            #         "role": "assistant",
-                            #         "toolUse": tool_call_content
-                            # })
-                        # elif msg["role"] == "tool":
-                        #     # Format tool results for Nova
-                        #     formatted_messages.append({
-                        #         "role": "user",
-                        #         "toolResult": {
-                        #             "toolUseId": msg.get("tool_call_id", "unknown"),
-                        #             "content": json.loads(msg["content"]) if isinstance(msg["content"], str) else msg["content"]
-                        #         }
-                        #     })
-                    
-                    # Make sure we have at least one message
-                    if not formatted_messages:
-                        formatted_messages = [{
-                            "role": "user", 
-                            "content": [{"type": "text", "text": "Hello"}]
-                        }]
-                    
-                    # Prepare the request body
-                    request_body = {
-                        "messages": formatted_messages
-                    }
-                    
-                    # Add tools if available
-                    if self.tools:
-                        # Convert tools to Nova format
-                        nova_tools = []
-                        for tool in self.tools:
-                            if tool["type"] == "function":
-                                nova_tools.append({
-                                    "toolSpec": {
-                                        "name": tool["function"]["name"],
-                                        "description": tool["function"].get("description", ""),
-                                        "inputSchema": {
-                                            "json": tool["function"]["parameters"]
-                                        }
-                                    }
-                                })
-                        if nova_tools:
-                            request_body["toolConfig"] = {
-                                "tools": nova_tools
-                            }
-                    
-                    body = json.dumps(request_body)
-                    
-                    # Log the request body for debugging
-                    logger.debug(f"Request body: {body}")
-                    
-                    response = self.client.invoke_model(
-                        modelId=self.model_name,
-                        body=body
-                    )
-                    
-                    response_body = json.loads(response['body'].read().decode('utf-8'))
-                    logger.debug(f"Response body: {json.dumps(response_body, indent=2)}")
-                    
-                    # Parse the response
-                    content = None
-                    tool_calls = None
-                    responseContent = response_body["output"]["message"]["content"]
-                    
-                    # Check for text content first
-                    for content_item in responseContent:
-                        if content_item.get("text") is not None:
-                            content = content_item.get("text", "")
-                            logger.debug(f"Content: {content}")
-                            break
-                    
-                    # Check for tool use
-                    tool_calls = []
-                    for content_item in responseContent:
-                        if content_item.get("toolUse") is not None:
-                            tool_use = content_item["toolUse"]
-                            tool_calls.append({
-                                "id": tool_use.get("toolUseId", "unknown"),
-                                "function": {
-                                    "name": tool_use.get("name", ""),
-                                    "arguments": json.dumps(tool_use.get("input", {}))
-                                }
-                            })
-                    logger.debug(tool_calls)   
-                    return {
-                        "content": content,
-                        "tool_calls": tool_calls
-                    }
-                    
-                
-                else:
-                    # Generic format
-                    prompt = ""
-                    for msg in messages:
-                        if msg["role"] == "system":
-                            prompt += f"System: {msg['content']}\n"
-                        elif msg["role"] == "user":
-                            prompt += f"User: {msg['content']}\n"
-                        elif msg["role"] == "assistant":
-                            prompt += f"Assistant: {msg['content']}\n"
-                    
-                    body = json.dumps({
-                        "prompt": prompt,
-                        "max_tokens": self.max_tokens,
-                        "temperature": self.temperature
-                    })
-                    
-                    response = self.client.invoke_model(
-                        modelId=self.model_name,
-                        body=body
-                    )
-                    
-                    response_body = json.loads(response['body'].read().decode('utf-8'))
-                    
-                    # Try to find the response in various formats
-                    content = None
-                    if "completion" in response_body:
-                        content = response_body["completion"]
-                    elif "generated_text" in response_body:
-                        content = response_body["generated_text"]
-                    elif "results" in response_body and len(response_body["results"]) > 0:
-                        content = response_body["results"][0]["outputText"]
-                    else:
-                        for key, value in response_body.items():
-                            if isinstance(value, str) and len(value) > 50:
-                                content = value
-                                break
-                    
-                    return {
-                        "content": content or "No response generated",
-                        "tool_calls": None
-                    }
-            
-            else:
-                raise ValueError(f"Unsupported model provider: {self.model_provider}")
+            return self._call_impl(messages)
         
         except Exception as e:
             logger.error(f"Error calling model: {str(e)}")
@@ -391,6 +260,267 @@ class SimpleAgent:
                 "tool_calls": None
             }
     
+    def _call_openai(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Call an OpenAI chat completion model."""
+        response = self.client.chat.completions.create(
+            model=self.model_name,
+            messages=messages,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            tools=self._openai_tools_payload
+        )
+        logger.info("OpenAI response: %s", response.choices[0].message)
+        return {
+            "content": response.choices[0].message.content,
+            "tool_calls": response.choices[0].message.tool_calls if hasattr(response.choices[0].message, 'tool_calls') else None
+        }
+    
+    def _call_anthropic(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Call an Anthropic messages model."""
+        message_content = []
+        for msg in messages:
+            if msg["role"] == "system":
+                continue  # System messages handled differently in Anthropic
+            elif msg["role"] == "user":
+                message_content.append({"type": "text", "text": msg["content"]})
+            elif msg["role"] == "assistant":
+                message_content.append({"type": "text", "text": msg["content"]})
+        
+        response = self.client.messages.create(
+            model=self.model_name,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+            system=self.system_prompt,
+            messages=message_content
+        )
+        
+        return {
+            "content": response.content[0].text,
+            "tool_calls": None  # Anthropic doesn't support tool calls in the same way
+        }
+    
+    def _call_huggingface(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Call a Hugging Face text generation model."""
+        # Convert messages to a format HF can understand
+        prompt = ""
+        for msg in messages:
+            if msg["role"] == "system":
+                prompt += f"<|system|>\n{msg['content']}\n"
+            elif msg["role"] == "user":
+                prompt += f"<|user|>\n{msg['content']}\n"
+            elif msg["role"] == "assistant":
+                prompt += f"<|assistant|>\n{msg['content']}\n"
+        
+        prompt += "<|assistant|>\n"
+        
+        response = self.client.text_generation(
+            prompt,
+            model=self.model_name,
+            max_new_tokens=self.max_tokens,
+            temperature=self.temperature
+        )
+        
+        return {
+            "content": response,
+            "tool_calls": None  # HF doesn't support tool calls in the same way
+        }
+    
+    def _build_bedrock_claude_body(self, messages: List[Dict[str, Any]]) -> bytes:
+        """Build the request body for a Claude text completion model on Bedrock."""
+        prompt = "\n\nHuman: "
+        for msg in messages:
+            if msg["role"] == "system":
+                prompt = f"{msg['content']}\n\nHuman: "
+            elif msg["role"] == "user":
+                prompt += f"{msg['content']}\n\n"
+            elif msg["role"] == "assistant":
+                prompt += f"Assistant: {msg['content']}\n\nHuman: "
+        
+        prompt += "\n\nAssistant:"
+        
+        return _dumps_body({
+            "prompt": prompt,
+            "max_tokens_to_sample": self.max_tokens,
+            "temperature": self.temperature
+        })
+    
+    def _call_bedrock_claude(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Call a Claude text completion model on Bedrock."""
+        response = self.client.invoke_model(
+            modelId=self.model_name,
+            body=self._build_bedrock_claude_body(messages)
+        )
+        
+        response_body = _loads_body(response['body'].read())
+        return {
+            "content": response_body.get("completion", ""),
+            "tool_calls": None
+        }
+    
+    def _build_bedrock_nova_body(self, messages: List[Dict[str, Any]]) -> bytes:
+        """Build the request body for an Amazon Nova model on Bedrock."""
+        # Nova requires a specific message format and doesn't support system messages
+        
+        # Format messages for Nova - only include user and assistant roles
+        formatted_messages = []
+        for msg in messages:
+            if msg["role"] == "user":
+                formatted_messages.append({
+                    "role": "user",
+                    "content": [{"text": msg["content"]}]
+                })
+            elif msg["role"] == "assistant":
+                if msg.get("content") is not None:
+                    formatted_messages.append({
+                        "role": "assistant",
+                        "content": [{"text": msg["content"]}]
+                    })
+        
+        # Make sure we have at least one message
+        if not formatted_messages:
+            formatted_messages = [{
+                "role": "user", 
+                "content": [{"type": "text", "text": "Hello"}]
+            }]
+        
+        # Prepare the request body
+        request_body = {
+            "messages": formatted_messages
+        }
+        
+        # Add tools if available
+        if self._nova_tool_config:
+            request_body["toolConfig"] = self._nova_tool_config
+        
+        body = _dumps_body(request_body)
+        
+        # Log the request body for debugging
+        logger.debug("Request body: %s", body)
+        return body
+    
+    def _call_bedrock_nova(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Call an Amazon Nova model on Bedrock."""
+        body = self._build_bedrock_nova_body(messages)
+        
+        response = self.client.invoke_model(
+            modelId=self.model_name,
+            body=body
+        )
+        
+        response_body = _loads_body(response['body'].read())
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response body: %s", json.dumps(response_body, indent=2))
+        
+        # Parse the response
+        content = None
+        tool_calls = None
+        responseContent = response_body["output"]["message"]["content"]
+        
+        # Check for text content first
+        for content_item in responseContent:
+            if content_item.get("text") is not None:
+                content = content_item.get("text", "")
+                logger.debug("Content: %s", content)
+                break
+        
+        # Check for tool use
+        tool_calls = []
+        for content_item in responseContent:
+            if content_item.get("toolUse") is not None:
+                tool_use = content_item["toolUse"]
+                tool_calls.append({
+                    "id": tool_use.get("toolUseId", "unknown"),
+                    "function": {
+                        "name": tool_use.get("name", ""),
+                        "arguments": json.dumps(tool_use.get("input", {}))
+                    }
+                })
+        logger.debug(tool_calls)   
+        return {
+            "content": content,
+            "tool_calls": tool_calls
+        }
+    
+    def _stream_bedrock(self, body: bytes, extract_text: Callable[[Dict[str, Any]], str]) -> Iterator[str]:
+        """
+        Invoke a Bedrock model with response streaming.
+        
+        Args:
+            body: Serialized request body
+            extract_text: Function returning the text delta of a decoded chunk, if any
+            
+        Yields:
+            Text deltas as they arrive
+        """
+        response = self.client.invoke_model_with_response_stream(
+            modelId=self.model_name,
+            body=body
+        )
+        for event in response['body']:
+            chunk = event.get("chunk")
+            if not chunk:
+                continue
+            text = extract_text(_loads_body(chunk["bytes"]))
+            if text:
+                yield text
+    
+    def _stream_bedrock_claude(self, messages: List[Dict[str, Any]]) -> Iterator[str]:
+        """Stream a Claude text completion from Bedrock."""
+        return self._stream_bedrock(
+            self._build_bedrock_claude_body(messages),
+            lambda payload: payload.get("completion")
+        )
+    
+    def _stream_bedrock_nova(self, messages: List[Dict[str, Any]]) -> Iterator[str]:
+        """Stream an Amazon Nova response from Bedrock."""
+        return self._stream_bedrock(
+            self._build_bedrock_nova_body(messages),
+            lambda payload: payload.get("contentBlockDelta", {}).get("delta", {}).get("text")
+        )
+    
+    def _call_bedrock_generic(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Call any other Bedrock text model using a plain prompt format."""
+        prompt = ""
+        for msg in messages:
+            if msg["role"] == "system":
+                prompt += f"System: {msg['content']}\n"
+            elif msg["role"] == "user":
+                prompt += f"User: {msg['content']}\n"
+            elif msg["role"] == "assistant":
+                prompt += f"Assistant: {msg['content']}\n"
+        
+        body = _dumps_body({
+            "prompt": prompt,
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature
+        })
+        
+        response = self.client.invoke_model(
+            modelId=self.model_name,
+            body=body
+        )
+        
+        response_body = _loads_body(response['body'].read())
+        
+        # Try to find the response in various formats
+        content = None
+        if "completion" in response_body:
+            content = response_body["completion"]
+        elif "generated_text" in response_body:
+            content = response_body["generated_text"]
+        elif "results" in response_body and len(response_body["results"]) > 0:
+            content = response_body["results"][0]["outputText"]
+        else:
+            for key, value in response_body.items():
+                if isinstance(value, str) and len(value) > 50:
+                    content = value
+                    break
+        
+        return {
+            "content": content or "No response generated",
+            "tool_calls": None
+        }
+    
     def _execute_tool(self, tool_call):
         """
         Execute a tool call.
@@ -421,6 +551,57 @@ class SimpleAgent:
             logger.error(f"Error executing tool: {str(e)}")
             return f"Error executing tool: {str(e)}"
     
+    def _prepend_system_prompt(self, nova_messages: List[Dict[str, Any]]):
+        """
+        Prepend the system prompt to the first user message for Nova models.
+        
+        The first user message is replaced with a copy so the stored history
+        is left untouched.
+        
+        Args:
+            nova_messages: Messages without the system message
+        """
+        if not self.system_prompt:
+            return
+        for i, msg in enumerate(nova_messages):
+            if msg["role"] == "user":
+                nova_messages[i] = {**msg, "content": f"<s>\n{self.system_prompt}\n</s>\n\n{msg['content']}"}
+                break
+    
+    def set_system_prompt(self, system_prompt: str):
+        """
+        Replace the agent's system prompt.
+        
+        Args:
+            system_prompt: New system prompt to guide the agent's behavior
+        """
+        self.system_prompt = system_prompt
+        self._system_msg = {"role": "system", "content": system_prompt}
+    
+    @property
+    def messages(self) -> List[Dict[str, Any]]:
+        """The system message followed by the current history window."""
+        return [self._system_msg, *self._history]
+    
+    def _append_message(self, message: Dict[str, Any]):
+        """Append a message to the history window."""
+        self._history.append(message)
+        self._history_tokens += _estimate_tokens(message)
+    
+    def _trim_history(self):
+        """
+        Evict the oldest messages once the history exceeds its size or token budget.
+        
+        The newest message is always kept, and the window never starts with an
+        orphaned assistant reply or tool result.
+        """
+        budget = self.max_context_tokens - self.max_tokens - _estimate_tokens(self._system_msg)
+        history = self._history
+        while len(history) > 1 and (len(history) > self.max_history_messages or self._history_tokens > budget):
+            self._history_tokens -= _estimate_tokens(history.popleft())
+        while len(history) > 1 and history[0]["role"] != "user":
+            self._history_tokens -= _estimate_tokens(history.popleft())
+    
     def process_message(self, user_message: str) -> str:
         """
         Process a user message and generate a response.
@@ -431,27 +612,15 @@ class SimpleAgent:
         Returns:
             Agent response
         """
-        # Add user message to history
-        self.messages.append({"role": "user", "content": user_message})
+        # Add user message to history and keep the window within budget
+        self._append_message({"role": "user", "content": user_message})
+        self._trim_history()
         
         # For Nova models, we need to handle the messages differently
-        if self.model_provider == "bedrock" and "nova" in self.model_name.lower():
-            # Create a copy of messages without system messages for Nova
-            nova_messages = []
-            system_content = None
-            
-            for msg in self.messages:
-                if msg["role"] == "system":
-                    system_content = msg["content"]
-                else:
-                    nova_messages.append(msg)
-            
-            # If there's a system message and at least one user message, prepend it to the first user message
-            if system_content:
-                for i, msg in enumerate(nova_messages):
-                    if msg["role"] == "user":
-                        nova_messages[i]["content"] = f"<s>\n{system_content}\n</s>\n\n{msg['content']}"
-                        break
+        if self._is_nova:
+            # The system message is kept apart from the history, so Nova can use it directly
+            nova_messages = list(self._history)
+            self._prepend_system_prompt(nova_messages)
             
             # Call the model with Nova-formatted messages
             response = self._call_model(nova_messages)
@@ -461,10 +630,15 @@ class SimpleAgent:
         
         # Check if the model wants to use tools
         if response["tool_calls"]:
-            # Execute each tool call
-            for tool_call in response["tool_calls"]:
-                tool_result = self._execute_tool(tool_call)
-                
+            # Execute the tool calls concurrently; most tools are I/O-bound
+            tool_calls = list(response["tool_calls"])
+            if len(tool_calls) == 1:
+                tool_results = [self._execute_tool(tool_calls[0])]
+            else:
+                tool_results = list(self._tool_pool.map(self._execute_tool, tool_calls))
+            
+            # Record each tool call and its result in the original order
+            for tool_call, tool_result in zip(tool_calls, tool_results):
                 # Get the tool call ID
                 if isinstance(tool_call, dict) and "id" in tool_call:
                     # Nova format
@@ -490,28 +664,25 @@ class SimpleAgent:
                     }
                 
                 # Add the tool call and result to the message history
-                self.messages.append({
+                self._append_message({
                     "role": "assistant",
                     "content": None,
                     "tool_calls": [tool_call_obj]
                 })
                 
-                self.messages.append({
+                self._append_message({
                     "role": "tool",
                     "tool_call_id": tool_call_id,
                     "content": json.dumps(tool_result)
                 })
             
             # Call the model again to get a final response
-            if self.model_provider == "bedrock" and "nova" in self.model_name.lower():
+            if self._is_nova:
                 # Create Nova-formatted messages again
                 nova_messages = []
-                system_content = None
                 
-                for msg in self.messages:
-                    if msg["role"] == "system":
-                        system_content = msg["content"]
-                    elif msg["role"] == "tool":
+                for msg in self._history:
+                    if msg["role"] == "tool":
                         # Format tool messages for Nova
                         nova_messages.append({
                             "role": "user",
@@ -520,24 +691,62 @@ class SimpleAgent:
                     else:
                         nova_messages.append(msg)
                 
-                # If there's a system message and at least one user message, prepend it to the first user message
-                if system_content:
-                    for i, msg in enumerate(nova_messages):
-                        if msg["role"] == "user":
-                            nova_messages[i]["content"] = f"<s>\n{system_content}\n</s>\n\n{msg['content']}"
-                            break
+                self._prepend_system_prompt(nova_messages)
                 
                 final_response = self._call_model(nova_messages)
             else:
                 final_response = self._call_model(self.messages)
             
-            self.messages.append({"role": "assistant", "content": final_response["content"]})
+            self._append_message({"role": "assistant", "content": final_response["content"]})
             return final_response["content"]
         else:
             # Add the model's response to the message history
-            self.messages.append({"role": "assistant", "content": response["content"]})
+            self._append_message({"role": "assistant", "content": response["content"]})
             return response["content"]
     
+    def stream_message(self, user_message: str) -> Iterator[str]:
+        """
+        Process a user message and yield the response as it is generated.
+        
+        Responses are streamed for Bedrock Claude and Nova models when the agent
+        has no tools, since tool calls need the complete model response. In all
+        other cases the full response is yielded as a single chunk.
+        
+        Args:
+            user_message: User message
+            
+        Yields:
+            Chunks of the agent response
+        """
+        if self._stream_impl is None or self.tools:
+            yield self.process_message(user_message)
+            return
+        
+        self._append_message({"role": "user", "content": user_message})
+        self._trim_history()
+        
+        if self._is_nova:
+            messages = list(self._history)
+            self._prepend_system_prompt(messages)
+        else:
+            messages = self.messages
+        
+        parts = []
+        try:
+            for text in self._stream_impl(messages):
+                parts.append(text)
+                yield text
+        except Exception as e:
+            logger.error(f"Error streaming model response: {str(e)}")
+            error = f"Error: {str(e)}"
+            parts.append(error)
+            yield error
+        finally:
+            # Record the reply even if the caller stops reading early, so the
+            # history never ends with two user turns in a row
+            self._append_message({"role": "assistant", "content": "".join(parts)})
+    
     def reset(self):
         """Reset the agent's message history."""
-        self.messages = [{"role": "system", "content": self.system_prompt}]
+        self._history.clear()
+        self._history_tokens = 0
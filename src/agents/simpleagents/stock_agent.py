@@ -4,14 +4,14 @@ SimpleAgent implementation for stock information.
 This module provides a Simple Language Model Agent specialized for
 retrieving and analyzing stock information.
 """
-import os
 import json
 import logging
 from typing import Dict, Any, List, Optional
-import sys
 
-# Add the project root to the path so we can import our modules
-sys.path.append(os.path.join(os.path.dirname(__file__), '../../..'))
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Import the base SimpleAgent class
 from src.agents.simpleagents.base_agent import SimpleAgent
@@ -19,10 +19,21 @@ from src.agents.simpleagents.base_agent import SimpleAgent
 # Import the Yahoo Finance client
 from src.utils.finance.yahoo_finance import yahoo_finance
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+# Set up logging; handlers are configured by the application entry point
 logger = logging.getLogger(__name__)
 
+
+def _dump(obj: Any) -> str:
+    """Pretty-print obj as JSON for logging, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY,
+            default=str
+        ).decode()
+    return json.dumps(obj, indent=2, default=str)
+
+
 class StockSimpleAgent(SimpleAgent):
     """
     SimpleAgent specialized for stock information.
@@ -31,6 +42,128 @@ class StockSimpleAgent(SimpleAgent):
     and provide analysis using a smaller, more efficient language model.
     """
     
+    # Tool schema shared by all instances (the base class does not mutate it)
+    _TOOLS_SCHEMA = (
+        {
+            "type": "function",
+            "function": {
+                "name": "get_stock_quote",
+                "description": "Get the current quote for a stock",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "ticker": {
+                            "type": "string",
+                            "description": "Stock ticker symbol (e.g., AAPL for Apple)"
+                        }
+                    },
+                    "required": ["ticker"]
+                }
+            }
+        },
+        {
+            "type": "function",
+            "function": {
+                "name": "get_stock_history",
+                "description": "Get historical price data for a stock",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "ticker": {
+                            "type": "string",
+                            "description": "Stock ticker symbol (e.g., AAPL for Apple)"
+                        },
+                        "period": {
+                            "type": "string",
+                            "description": "Time period (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)",
+                            "default": "1mo"
+                        },
+                        "interval": {
+                            "type": "string",
+                            "description": "Data interval (1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo)",
+                            "default": "1d"
+                        }
+                    },
+                    "required": ["ticker"]
+                }
+            }
+        },
+        {
+            "type": "function",
+            "function": {
+                "name": "get_company_news",
+                "description": "Get recent news articles about a company",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "ticker": {
+                            "type": "string",
+                            "description": "Stock ticker symbol (e.g., AAPL for Apple)"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Maximum number of news items to return",
+                            "default": 5
+                        }
+                    },
+                    "required": ["ticker"]
+                }
+            }
+        },
+        {
+            "type": "function",
+            "function": {
+                "name": "compare_stocks",
+                "description": "Compare multiple stocks",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "tickers": {
+                            "type": "array",
+                            "items": {
+                                "type": "string"
+                            },
+                            "description": "List of stock ticker symbols to compare"
+                        }
+                    },
+                    "required": ["tickers"]
+                }
+            }
+        },
+        {
+            "type": "function",
+            "function": {
+                "name": "get_market_summary",
+                "description": "Get a summary of major market indices",
+                "parameters": {
+                    "type": "object",
+                    "properties": {}
+                }
+            }
+        }
+    )
+    
+    # System prompt shared by all instances
+    _SYSTEM_PROMPT = """
+    You are StockSimpleAgent, a specialized agent for retrieving and analyzing stock information.
+    You can provide stock quotes, historical data, company news, and market summaries.
+    
+    When asked about stocks or the market, use the appropriate tools to fetch the most up-to-date information.
+    Provide concise, accurate responses focused on the most relevant information.
+    
+    For stock analysis:
+    1. Focus on key metrics like price, market cap, P/E ratio, and recent performance
+    2. Highlight significant news that might impact the stock
+    3. Provide brief context about the company and its industry
+    
+    For market analysis:
+    1. Focus on major indices and their recent performance
+    2. Highlight significant market trends
+    3. Provide brief context about market conditions
+    
+    Always be factual and avoid speculation. If you don't have enough information, say so and suggest what additional information would be helpful.
+    """
+    
     def __init__(
         self,
         model_provider: str = "bedrock",
@@ -47,128 +180,6 @@ class StockSimpleAgent(SimpleAgent):
             temperature: Temperature parameter for generation
             max_tokens: Maximum number of tokens to generate
         """
-        # Define the tools this agent can use
-        tools = [
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_stock_quote",
-                    "description": "Get the current quote for a stock",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "ticker": {
-                                "type": "string",
-                                "description": "Stock ticker symbol (e.g., AAPL for Apple)"
-                            }
-                        },
-                        "required": ["ticker"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_stock_history",
-                    "description": "Get historical price data for a stock",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "ticker": {
-                                "type": "string",
-                                "description": "Stock ticker symbol (e.g., AAPL for Apple)"
-                            },
-                            "period": {
-                                "type": "string",
-                                "description": "Time period (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)",
-                                "default": "1mo"
-                            },
-                            "interval": {
-                                "type": "string",
-                                "description": "Data interval (1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo)",
-                                "default": "1d"
-                            }
-                        },
-                        "required": ["ticker"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_company_news",
-                    "description": "Get recent news articles about a company",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "ticker": {
-                                "type": "string",
-                                "description": "Stock ticker symbol (e.g., AAPL for Apple)"
-                            },
-                            "limit": {
-                                "type": "integer",
-                                "description": "Maximum number of news items to return",
-                                "default": 5
-                            }
-                        },
-                        "required": ["ticker"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "compare_stocks",
-                    "description": "Compare multiple stocks",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "tickers": {
-                                "type": "array",
-                                "items": {
-                                    "type": "string"
-                                },
-                                "description": "List of stock ticker symbols to compare"
-                            }
-                        },
-                        "required": ["tickers"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_market_summary",
-                    "description": "Get a summary of major market indices",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {}
-                    }
-                }
-            }
-        ]
-        
-        # Define the system prompt
-        system_prompt = """
-        You are StockSimpleAgent, a specialized agent for retrieving and analyzing stock information.
-        You can provide stock quotes, historical data, company news, and market summaries.
-        
-        When asked about stocks or the market, use the appropriate tools to fetch the most up-to-date information.
-        Provide concise, accurate responses focused on the most relevant information.
-        
-        For stock analysis:
-        1. Focus on key metrics like price, market cap, P/E ratio, and recent performance
-        2. Highlight significant news that might impact the stock
-        3. Provide brief context about the company and its industry
-        
-        For market analysis:
-        1. Focus on major indices and their recent performance
-        2. Highlight significant market trends
-        3. Provide brief context about market conditions
-        
-        Always be factual and avoid speculation. If you don't have enough information, say so and suggest what additional information would be helpful.
-        """
-        
         # Initialize the base SimpleAgent
         super().__init__(
             name="StockSimpleAgent",
@@ -177,8 +188,8 @@ class StockSimpleAgent(SimpleAgent):
             model_name=model_name,
             temperature=temperature,
             max_tokens=max_tokens,
-            tools=tools,
-            system_prompt=system_prompt
+            tools=list(self._TOOLS_SCHEMA),
+            system_prompt=self._SYSTEM_PROMPT
         )
         
         # Register tool implementations
@@ -222,9 +233,10 @@ class StockSimpleAgent(SimpleAgent):
             
             # Simplify the data for smaller models
             if "data" in historical_data:
-                # Limit the number of data points to reduce token usage
-                historical_data["data"] = historical_data["data"][-10:]
-            logger.debug(f"Historical data for {ticker}: {json.dumps(historical_data, indent=2)}")
+                # Limit the number of data points to reduce token usage, leaving the cached copy intact
+                historical_data = {**historical_data, "data": historical_data["data"][-10:]}
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Historical data for %s: %s", ticker, _dump(historical_data))
             return historical_data
         except Exception as e:
             logger.error(f"Error getting stock history for {ticker}: {str(e)}")
@@ -261,10 +273,8 @@ class StockSimpleAgent(SimpleAgent):
         try:
             quotes = yahoo_finance.get_multiple_quotes(tickers)
             
-            # Get basic info for each ticker
-            stock_infos = {}
-            for ticker in tickers:
-                stock_infos[ticker] = yahoo_finance.get_stock_info(ticker)
+            # Get basic info for all tickers concurrently
+            stock_infos = yahoo_finance.get_multiple_stock_infos(tickers)
             
             return {
                 "quotes": quotes,
@@ -0,0 +1,52 @@
+"""
+Interactive command-line loop shared by the Strands agent modules.
+
+The loop runs on asyncio: input is read with prompt_toolkit when it is
+installed (otherwise input() in a worker thread), and agent replies are
+streamed, so the event loop stays free while the model is answering.
+"""
+import asyncio
+
+try:
+    from prompt_toolkit import PromptSession
+except ImportError:
+    PromptSession = None
+
+
+async def run_repl(respond, prompt="\nYou: "):
+    """
+    Read user messages until 'exit' and pass each one to respond.
+
+    Args:
+        respond: Coroutine function called with each user message
+        prompt: Prompt shown before each message
+    """
+    session = PromptSession() if PromptSession is not None else None
+
+    while True:
+        if session is not None:
+            user_input = await session.prompt_async(prompt)
+        else:
+            user_input = await asyncio.to_thread(input, prompt)
+        if user_input.lower() == "exit":
+            break
+
+        await respond(user_input)
+
+
+async def stream_reply(agent, user_input):
+    """
+    Stream an agent's reply to the terminal.
+
+    The agent's callback handler renders the text as it arrives (Strands'
+    default handler prints each chunk), so the reply is not printed again
+    once complete.
+
+    Args:
+        agent: Strands agent to ask
+        user_input: The user's message
+    """
+    print("\nAssistant: ", end="", flush=True)
+    async for _ in agent.stream_async(user_input):
+        pass
+    print()
@@ -0,0 +1,35 @@
+"""
+Configuration shared by the Strands agent modules.
+
+The environment is loaded and resolved once per process, however many agent
+modules are imported.
+"""
+import functools
+import os
+
+from src.config.env import load_env
+
+DEFAULT_BEDROCK_MODEL = 'amazon.nova-pro-v1:0'
+DEFAULT_BEDROCK_REGION = 'us-east-1'
+DEFAULT_ANTHROPIC_MODEL = 'claude-3-7-sonnet-20250219'
+
+
+@functools.lru_cache(maxsize=1)
+def load_config() -> dict:
+    """
+    Load config/.env and resolve the settings used by the agents.
+
+    Returns:
+        dict: Settings with keys:
+            - region: AWS region for Bedrock (BEDROCK_REGION)
+            - model: Bedrock model ID (BEDROCK_MODEL)
+            - anthropic_model: Anthropic model ID (ANTHROPIC_MODEL)
+            - debug: Whether DEBUG is set, enabling diagnostic output
+    """
+    load_env()
+    return {
+        "region": os.environ.get('BEDROCK_REGION', DEFAULT_BEDROCK_REGION),
+        "model": os.environ.get('BEDROCK_MODEL', DEFAULT_BEDROCK_MODEL),
+        "anthropic_model": os.environ.get('ANTHROPIC_MODEL', DEFAULT_ANTHROPIC_MODEL),
+        "debug": bool(os.environ.get('DEBUG')),
+    }
@@ -0,0 +1,125 @@
+"""
+Shared model providers for the Strands agents.
+
+Agents that use the same model configuration get the same model instance,
+so they also share its SDK client and HTTP connection pool. Each provider
+SDK is imported the first time a model of that kind is requested, so an
+agent only loads the SDK it uses.
+
+With cache_prompt=True the system prompt (and the tool definitions before it)
+is marked as a prompt cache breakpoint, so repeated calls within the cache
+lifetime (5 minutes) read that prefix from the cache instead of paying for it
+again. Prefixes shorter than the model's minimum (about 1024 tokens) are not
+cached by the service.
+"""
+import functools
+import os
+from typing import TYPE_CHECKING
+
+from src.agents.strands._config import load_config
+
+if TYPE_CHECKING:
+    from strands.models import BedrockModel
+    from strands.models.anthropic import AnthropicModel
+
+# Bedrock client settings: enough pooled connections for concurrent agent calls,
+# and retries that back off when the service throttles
+BEDROCK_MAX_POOL_CONNECTIONS = 50
+BEDROCK_RETRIES = {"mode": "adaptive"}
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_system_prompt_anthropic_model():
+    """Create the AnthropicModel subclass used for cache_prompt=True."""
+    from strands.models.anthropic import AnthropicModel
+    from strands.types.content import Messages
+    from strands.types.tools import ToolSpec
+
+    class CachedSystemPromptAnthropicModel(AnthropicModel):
+        """AnthropicModel that marks the system prompt as an ephemeral prompt cache breakpoint."""
+
+        def format_request(
+            self, messages: Messages, tool_specs: list[ToolSpec] = None, system_prompt: str = None
+        ) -> dict:
+            request = super().format_request(messages, tool_specs, system_prompt)
+            if isinstance(request.get("system"), str):
+                request["system"] = [{
+                    "type": "text",
+                    "text": request["system"],
+                    "cache_control": {"type": "ephemeral"},
+                }]
+            return request
+
+    return CachedSystemPromptAnthropicModel
+
+
+def get_bedrock_model(
+    model_id: str = None, region: str = None, temperature: float = 0.3, cache_prompt: bool = False
+) -> "BedrockModel":
+    """
+    Get the shared BedrockModel for a model configuration.
+
+    Args:
+        model_id: Bedrock model ID, defaults to the BEDROCK_MODEL environment variable
+        region: AWS region, defaults to the BEDROCK_REGION environment variable
+        temperature: Sampling temperature
+        cache_prompt: Whether to add a prompt cache point after the system prompt
+
+    Returns:
+        BedrockModel: Cached model instance for this configuration
+    """
+    config = load_config()
+    return _get_bedrock_model(
+        model_id or config["model"],
+        region or config["region"],
+        temperature,
+        cache_prompt
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def _get_bedrock_model(model_id: str, region: str, temperature: float, cache_prompt: bool) -> "BedrockModel":
+    """Create the BedrockModel for a fully resolved configuration."""
+    from botocore.config import Config
+    from strands.models import BedrockModel
+
+    config = {"cache_prompt": "default"} if cache_prompt else {}
+    return BedrockModel(
+        model_id=model_id,
+        region_name=region,
+        temperature=temperature,
+        boto_client_config=Config(max_pool_connections=BEDROCK_MAX_POOL_CONNECTIONS, retries=BEDROCK_RETRIES),
+        **config
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_anthropic_model(
+    model_id: str, max_tokens: int, temperature: float, cache_prompt: bool = False
+) -> "AnthropicModel":
+    """
+    Get the shared AnthropicModel for a model configuration.
+
+    Args:
+        model_id: Anthropic model ID
+        max_tokens: Maximum number of tokens to generate
+        temperature: Sampling temperature
+        cache_prompt: Whether to send the system prompt as an ephemeral cache breakpoint
+
+    Returns:
+        AnthropicModel: Cached model instance for this configuration
+    """
+    if cache_prompt:
+        model_class = _cached_system_prompt_anthropic_model()
+    else:
+        from strands.models.anthropic import AnthropicModel as model_class
+    return model_class(
+        client_args={
+            "api_key": os.getenv('ANTHROPIC_API_KEY'),
+        },
+        max_tokens=max_tokens,
+        model_id=model_id,
+        params={
+            "temperature": temperature,
+        }
+    )
@@ -0,0 +1,122 @@
+"""
+Process-wide limit on concurrent model calls for the Strands agents.
+
+Unbounded fan-out trips Bedrock throttling, and the retry storm that follows
+lowers throughput. Every agent call made through run_limited shares one
+limiter that caps both the calls in flight and the call rate. When the
+service throttles, the concurrency cap is halved for a cool-down period and
+then restored.
+
+Agent calls run in worker threads (asyncio.to_thread) and the synchronous
+wrappers start a new event loop per call, so the limiter is built on
+threading primitives rather than an asyncio.Semaphore bound to one loop.
+"""
+import asyncio
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Model calls in flight at once, and calls started per second, across the process
+MODEL_CONCURRENCY = int(os.environ.get("BEDROCK_CONCURRENCY", "4"))
+MODEL_CALLS_PER_SECOND = float(os.environ.get("BEDROCK_CALLS_PER_SECOND", "5"))
+# How long (seconds) the concurrency cap stays halved after a throttling error
+THROTTLE_COOLDOWN = 30.0
+
+_THROTTLING_ERRORS = frozenset({
+    "ModelThrottledException", "ThrottlingException", "TooManyRequestsException", "RateLimitError"
+})
+
+
+class AdaptiveLimiter:
+    """Concurrency cap plus token-bucket rate limit that backs off on throttling."""
+
+    def __init__(self, concurrency: int, calls_per_second: float):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if calls_per_second <= 0:
+            raise ValueError("calls_per_second must be greater than 0")
+        self.concurrency = concurrency
+        self.calls_per_second = calls_per_second
+        # The bucket holds at least one token, so rates below one call per second still admit calls
+        self.burst = max(1.0, calls_per_second)
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._limit = concurrency
+        self._restore_at = 0.0
+        self._tokens = self.burst
+        self._refilled_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        """Add the rate tokens accrued since the last refill and end an expired back-off."""
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.calls_per_second)
+        self._refilled_at = now
+        if self._limit < self.concurrency and now >= self._restore_at:
+            self._limit = self.concurrency
+            self._condition.notify_all()
+
+    def acquire(self) -> None:
+        """Block until a call may start."""
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self._in_flight >= self._limit:
+                    # Wait for a release(), or for a reduced cap to be restored
+                    timeout = self._restore_at - now if self._limit < self.concurrency else None
+                    self._condition.wait(timeout)
+                elif self._tokens < 1:
+                    # Wait until the next token is due
+                    self._condition.wait((1 - self._tokens) / self.calls_per_second)
+                else:
+                    self._tokens -= 1
+                    self._in_flight += 1
+                    return
+
+    def release(self) -> None:
+        """Mark a call as finished."""
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify()
+
+    def throttled(self) -> None:
+        """Halve the concurrency cap for THROTTLE_COOLDOWN seconds."""
+        with self._condition:
+            self._limit = max(1, self._limit // 2)
+            self._restore_at = time.monotonic() + THROTTLE_COOLDOWN
+
+    @contextmanager
+    def slot(self):
+        """Hold a call slot for the duration of the block, backing off if it is throttled."""
+        self.acquire()
+        try:
+            yield
+        except Exception as e:
+            if _is_throttling_error(e):
+                self.throttled()
+            raise
+        finally:
+            self.release()
+
+
+def _is_throttling_error(error: Exception) -> bool:
+    """Check whether an exception reports service throttling."""
+    if type(error).__name__ in _THROTTLING_ERRORS:
+        return True
+    # botocore ClientError carries the error code in its parsed response
+    response = getattr(error, "response", None)
+    return isinstance(response, dict) and response.get("Error", {}).get("Code") in _THROTTLING_ERRORS
+
+
+model_limiter = AdaptiveLimiter(MODEL_CONCURRENCY, MODEL_CALLS_PER_SECOND)
+
+
+def call_limited(func, *args):
+    """Call func(*args) within the process-wide model call limits."""
+    with model_limiter.slot():
+        return func(*args)
+
+
+async def run_limited(func, *args):
+    """Run a blocking model call in a worker thread within the process-wide limits."""
+    return await asyncio.to_thread(call_limited, func, *args)
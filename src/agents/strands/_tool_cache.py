@@ -0,0 +1,94 @@
+"""
+Persistent cache for deterministic tool results.
+
+Agent sessions often repeat the same knowledge base searches and document
+extractions. Tools wrapped with cached_tool keep their results in a disk
+cache shared across processes and sessions, keyed by the tool name and its
+arguments, so a repeated call is a single disk read. Tools that read a file
+also key on its modification time and size, so an edited file is re-read.
+
+The cache needs the optional diskcache package; without it cached_tool
+leaves the tool unchanged.
+"""
+import functools
+import hashlib
+import inspect
+import json
+import os
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+TOOL_CACHE_DIR = os.path.expanduser(os.environ.get("AGENT_TOOL_CACHE_DIR", "~/.cache/agents"))
+TOOL_CACHE_SIZE_LIMIT = 2 ** 30
+# How long (seconds) a cached tool result stays valid
+TOOL_CACHE_TTL = 3600
+
+
+@functools.lru_cache(maxsize=1)
+def get_tool_cache():
+    """Open the disk cache shared by the cached tools."""
+    return diskcache.Cache(TOOL_CACHE_DIR, size_limit=TOOL_CACHE_SIZE_LIMIT)
+
+
+def _cache_key(name: str, args: tuple, kwargs: dict) -> tuple:
+    """Build a cache key from a tool name and a digest of its arguments."""
+    if orjson is not None:
+        payload = orjson.dumps([args, kwargs], option=orjson.OPT_SORT_KEYS, default=str)
+    else:
+        payload = json.dumps([args, kwargs], sort_keys=True, default=str).encode()
+    return name, hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def _file_version(path) -> tuple:
+    """Identify a file's current version by its modification time and size, or None if it cannot be read."""
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def cached_tool(func=None, *, path_args: tuple = ()):
+    """
+    Cache a tool's results on disk for TOOL_CACHE_TTL seconds.
+
+    Apply it below @tool so the tool specification still comes from the
+    wrapped function. Results that report an error are not cached.
+
+    Args:
+        func: The tool function, when used as a bare decorator
+        path_args: Names of arguments holding file paths; the modification
+            time and size of each file are added to the cache key
+    """
+    if func is None:
+        return functools.partial(cached_tool, path_args=path_args)
+    if diskcache is None:
+        return func
+
+    signature = inspect.signature(func) if path_args else None
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        cache = get_tool_cache()
+        key_args = args
+        if signature is not None:
+            bound = signature.bind(*args, **kwargs).arguments
+            key_args = args + tuple(_file_version(bound.get(name)) for name in path_args)
+        key = _cache_key(func.__qualname__, key_args, kwargs)
+        result = cache.get(key)
+        if result is not None:
+            return result
+        result = func(*args, **kwargs)
+        if not (isinstance(result, dict) and "error" in result):
+            cache.set(key, result, expire=TOOL_CACHE_TTL)
+        return result
+
+    return wrapper
@@ -1,39 +1,53 @@
 from strands import Agent, tool
 from strands_tools import calculator, current_time, python_repl
-from strands.models import BedrockModel
-from strands.models.anthropic import AnthropicModel
+import asyncio
+import functools
 import json
 import os
-from dotenv import load_dotenv
-
-
-# Add the project root to the path so we can import our modules
-config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../../config/.env')
-load_dotenv(config_path)
-region = os.environ.get('BEDROCK_REGION', 'us-east-1')        
-# Get model ID from environment variables or use default
-model= os.environ.get('BEDROCK_MODEL', 'amazon.nova-pro-v1:0')
-print('model:%s',model)
-
-# Create a BedrockModel
-bedrock_model = BedrockModel(
-    model_id=model,
-    region_name=region,
-    temperature=0.3,
-)
-
-key = os.getenv('ANTHROPIC_API_KEY')
-anthropic_model = AnthropicModel(
-    client_args={
-        "api_key": key,
-    },
-    # **model_config
-    max_tokens=1028,
-    model_id="claude-3-7-sonnet-20250219",
-    params={
-        "temperature": 0.7,
-    }
-)
+import re
+import secrets
+import string
+import sys
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
+sys.path.append(project_root)
+
+from src.agents.strands._config import load_config
+from src.agents.strands._model_providers import get_anthropic_model, get_bedrock_model
+from src.agents.strands._rate_limit import run_limited
+
+
+# Load the shared configuration
+config = load_config()
+region, model = config["region"], config["model"]
+if config["debug"]:
+    print('model:%s',model)
+
+# Models and agents are built on first use so importing this module stays cheap
+def _get_anthropic_model():
+    """Get the AnthropicModel shared with the other Strands agents."""
+    return get_anthropic_model("claude-3-7-sonnet-20250219", 1028, 0.7)
+
+# Keywords that route a request to the regulator agent, matched in a single pass over the input
+COMPLIANCE_KEYWORDS = ("compliance", "regulation", "aml", "kyc", "risk", "verify")
+_COMPLIANCE_PATTERN = re.compile("|".join(map(re.escape, COMPLIANCE_KEYWORDS)), re.IGNORECASE)
+
+# Customer IDs are 10 characters drawn from this alphabet
+CUSTOMER_ID_LENGTH = 10
+_CUSTOMER_ID_ALPHABET = string.ascii_uppercase + string.digits
+# Accepted customer ID format: exactly 10 ASCII letters or digits
+_CUSTOMER_ID_PATTERN = re.compile(rf"[A-Za-z0-9]{{{CUSTOMER_ID_LENGTH}}}")
+
+# Required compliance documents by (customer type, risk level)
+_COMPLIANCE_REQUIREMENTS = {
+    ("individual", "low"): ("government_id", "proof_of_address"),
+    ("individual", "medium"): ("government_id", "proof_of_address", "source_of_funds"),
+    ("individual", "high"): ("government_id", "proof_of_address", "source_of_funds", "enhanced_due_diligence"),
+    ("business", "low"): ("business_registration", "tax_id", "ownership_structure"),
+    ("business", "medium"): ("business_registration", "tax_id", "ownership_structure", "financial_statements"),
+    ("business", "high"): ("business_registration", "tax_id", "ownership_structure", "financial_statements", "enhanced_due_diligence"),
+}
+_CUSTOMER_TYPES = frozenset(customer_type for customer_type, _ in _COMPLIANCE_REQUIREMENTS)
 
 # Define custom tools for banking onboarding
 @tool
@@ -48,7 +62,7 @@ def validate_customer_id(customer_id: str) -> dict:
         dict: Validation result with status and message
     """
     # In a real implementation, this would check against a database
-    if len(customer_id) != 10 or not customer_id.isalnum():
+    if not _CUSTOMER_ID_PATTERN.fullmatch(customer_id):
         return {"valid": False, "message": "Invalid customer ID format. Must be 10 alphanumeric characters."}
     
     # Mock validation - in production would check against actual database
@@ -66,27 +80,14 @@ def check_compliance_requirements(customer_type: str, risk_level: str) -> dict:
     Returns:
         dict: Required compliance documents and checks
     """
-    requirements = {
-        "individual": {
-            "low": ["government_id", "proof_of_address"],
-            "medium": ["government_id", "proof_of_address", "source_of_funds"],
-            "high": ["government_id", "proof_of_address", "source_of_funds", "enhanced_due_diligence"]
-        },
-        "business": {
-            "low": ["business_registration", "tax_id", "ownership_structure"],
-            "medium": ["business_registration", "tax_id", "ownership_structure", "financial_statements"],
-            "high": ["business_registration", "tax_id", "ownership_structure", "financial_statements", "enhanced_due_diligence"]
-        }
-    }
-    
-    if customer_type not in requirements:
-        return {"error": f"Unknown customer type: {customer_type}"}
-    
-    if risk_level not in requirements[customer_type]:
+    documents = _COMPLIANCE_REQUIREMENTS.get((customer_type, risk_level))
+    if documents is None:
+        if customer_type not in _CUSTOMER_TYPES:
+            return {"error": f"Unknown customer type: {customer_type}"}
         return {"error": f"Unknown risk level: {risk_level}"}
     
     return {
-        "required_documents": requirements[customer_type][risk_level],
+        "required_documents": list(documents),
         "customer_type": customer_type,
         "risk_level": risk_level
     }
@@ -115,9 +116,7 @@ def save_customer_information(customer_data: dict) -> dict:
         }
     
     # Generate a mock customer ID
-    import random
-    import string
-    customer_id = ''.join(random.choices(string.ascii_uppercase + string.digits, k=10))
+    customer_id = ''.join(secrets.choice(_CUSTOMER_ID_ALPHABET) for _ in range(CUSTOMER_ID_LENGTH))
     
     return {
         "success": True,
@@ -125,11 +124,7 @@ def save_customer_information(customer_data: dict) -> dict:
         "message": "Customer information saved successfully"
     }
 
-# Create the relationship manager agent
-relationship_agent = Agent(
-    model=bedrock_model,
-    tools=[validate_customer_id, check_compliance_requirements, save_customer_information, current_time],
-    system_prompt="""
+RELATIONSHIP_SYSTEM_PROMPT = """
     You are a helpful banking relationship manager assistant. Your role is to help customers open new bank accounts
     and guide them through the onboarding process. You should:
     
@@ -142,13 +137,8 @@ relationship_agent = Agent(
     Be professional, courteous, and thorough. Protect customer privacy and follow all banking regulations.
     Use your tools to validate information and check compliance requirements.
     """
-)
 
-# Create the regulator agent
-regulator_agent = Agent(
-    model= bedrock_model,
-    tools=[check_compliance_requirements],
-    system_prompt="""
+REGULATOR_SYSTEM_PROMPT = """
     You are a banking compliance officer responsible for ensuring all customer onboarding processes
     follow regulatory requirements. Your role is to:
     
@@ -160,13 +150,48 @@ regulator_agent = Agent(
     Be thorough and strict in your compliance checks. Your primary concern is regulatory compliance,
     not customer satisfaction.
     """
-)
+
+# Create the relationship manager agent
+@functools.lru_cache(maxsize=1)
+def get_relationship_agent():
+    """Create the relationship manager agent."""
+    return Agent(
+        model=get_bedrock_model(),
+        tools=[validate_customer_id, check_compliance_requirements, save_customer_information, current_time],
+        system_prompt=RELATIONSHIP_SYSTEM_PROMPT
+    )
+
+# Create the regulator agent
+@functools.lru_cache(maxsize=1)
+def get_regulator_agent():
+    """Create the regulator agent."""
+    return Agent(
+        model=get_bedrock_model(),
+        tools=[check_compliance_requirements],
+        system_prompt=REGULATOR_SYSTEM_PROMPT
+    )
+
+_LAZY_ATTRIBUTES = {
+    "bedrock_model": get_bedrock_model,
+    "anthropic_model": _get_anthropic_model,
+    "relationship_agent": get_relationship_agent,
+    "regulator_agent": get_regulator_agent,
+}
+
+def __getattr__(name):
+    """Build the module-level models and agents on first access (PEP 562)."""
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Create a simple orchestrator function
-def orchestrate_onboarding(user_input, user_id, session_id, chat_history=None):
+async def orchestrate_onboarding(user_input, user_id, session_id, chat_history=None):
     """
     Orchestrate the banking onboarding process between agents.
     
+    The agent call runs in a worker thread, within the process-wide model
+    call limits, so one event loop can serve several users at once.
+    
     Args:
         user_input: The user's message
         user_id: Unique identifier for the user
@@ -178,25 +203,37 @@ def orchestrate_onboarding(user_input, user_id, session_id, chat_history=None):
     """
     chat_history = chat_history or []
     
-    # Simple keyword-based routing
-    compliance_keywords = ["compliance", "regulation", "aml", "kyc", "risk", "verify"]
-    
-    # Check if any compliance keywords are in the user input
-    if any(keyword in user_input.lower() for keyword in compliance_keywords):
+    # Simple keyword-based routing: check if any compliance keywords are in the user input
+    if _COMPLIANCE_PATTERN.search(user_input):
         # Route to regulator agent
-        response = regulator_agent(user_input)
+        response = await run_limited(get_regulator_agent(), user_input)
         return {
             "agent": "regulator",
             "response": response.message
         }
     else:
         # Default to relationship manager
-        response = relationship_agent(user_input)
+        response = await run_limited(get_relationship_agent(), user_input)
         return {
             "agent": "relationship_manager",
             "response": response.message
         }
 
+def orchestrate_onboarding_sync(user_input, user_id, session_id, chat_history=None):
+    """
+    Synchronous wrapper around orchestrate_onboarding for callers without an event loop.
+    
+    Args:
+        user_input: The user's message
+        user_id: Unique identifier for the user
+        session_id: Unique identifier for the session
+        chat_history: List of previous interactions
+        
+    Returns:
+        dict: Response from the appropriate agent
+    """
+    return asyncio.run(orchestrate_onboarding(user_input, user_id, session_id, chat_history))
+
 # Example usage
 if __name__ == "__main__":
     # Simulate a conversation
@@ -213,7 +250,7 @@ if __name__ == "__main__":
         if user_input.lower() == "exit":
             break
             
-        response = orchestrate_onboarding(user_input, user_id, session_id, chat_history)
+        response = orchestrate_onboarding_sync(user_input, user_id, session_id, chat_history)
         #print(f"\n[{response['agent']}]: {response['response']}")
         
         # Add to chat history
@@ -1,63 +1,36 @@
 from strands import Agent
-from strands.models.bedrock import BedrockModel
-from strands.models.anthropic import AnthropicModel
-import os, sys
-from dotenv import load_dotenv
+import functools
+import os
+import sys
 
 # Add the project root to the path so we can import our modules
-sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
+sys.path.append(project_root)
 
 # Import the data catalog tools
-from tools.data_catalog_tool import (
+from src.tools.data_catalog_tool import (
     search_data_catalog,
     get_data_product_attributes,
     list_data_products,
     get_data_product_location
 )
-from tools.excel_tools_strands import read_csv_file,analyze_with_excel_agent
+from src.tools.excel_tools_strands import read_csv_file,analyze_with_excel_agent
+from src.agents.strands._model_providers import get_anthropic_model, get_bedrock_model
+from src.agents.strands._config import load_config
 
-# Load environment variables
-config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../../config/.env')
-load_dotenv(config_path)
+# Load the shared configuration
+config = load_config()
+region, bedrock_model_id, anthropic_model_id = config["region"], config["model"], config["anthropic_model"]
+if config["debug"]:
+    print('model: %s', anthropic_model_id)
 
-region = os.environ.get('BEDROCK_REGION', 'us-east-1')        
-# Get model ID from environment variables or use default
-bedrock_model_id = os.environ.get('BEDROCK_MODEL', 'amazon.nova-pro-v1:0')
-anthropic_model_id = os.environ.get('ANTHROPIC_MODEL', 'claude-3-7-sonnet-20250219')
-print('model: %s', anthropic_model_id)
+# in case you have access to the Claude API, build the agent with the shared
+# Anthropic model instead of the Bedrock one:
+# get_anthropic_model(anthropic_model_id, 1028, 0.7)
+# The BedrockModel comes from get_bedrock_model, built on first use and shared
+# with the other Strands agents
 
-# inb case you have access to the Claude API
-# key = os.getenv('ANTHROPIC_API_KEY')
-# anthropic_model = AnthropicModel(
-#     client_args={
-#         "api_key": key,
-#     },
-#     # **model_config
-#     max_tokens=1028,
-#     model_id=anthropic_model_id,
-#     params={
-#         "temperature": 0.7,
-#     }
-# )
-# model=anthropic_model
-# Create a BedrockModel
-bedrock_model = BedrockModel(
-    model_id=bedrock_model_id,
-    region_name=region,
-    temperature=0.3,
-)
-model=bedrock_model
-# Create the Data Catalog agent
-data_catalog_agent = Agent(
-    model=model,
-    tools=[
-        search_data_catalog,
-        get_data_product_attributes,
-        list_data_products,
-        get_data_product_location,
-        analyze_with_excel_agent
-    ],
-    system_prompt="""
+DATA_CATALOG_SYSTEM_PROMPT = """
     You are a Data Catalog Assistant specialized in helping users discover, understand, and access data products.
     Your role is to:
     
@@ -83,7 +56,34 @@ data_catalog_agent = Agent(
     Always provide accurate, helpful guidance and be transparent about data availability and limitations.
     When users ask about data products, use the appropriate tools to retrieve the most current and detailed information.
     """
-)
+
+# Create the Data Catalog agent
+@functools.lru_cache(maxsize=1)
+def get_data_catalog_agent():
+    """Create the Data Catalog agent."""
+    return Agent(
+        model=get_bedrock_model(),
+        tools=[
+            search_data_catalog,
+            get_data_product_attributes,
+            list_data_products,
+            get_data_product_location,
+            analyze_with_excel_agent
+        ],
+        system_prompt=DATA_CATALOG_SYSTEM_PROMPT
+    )
+
+_LAZY_ATTRIBUTES = {
+    "bedrock_model": get_bedrock_model,
+    "model": get_bedrock_model,
+    "data_catalog_agent": get_data_catalog_agent,
+}
+
+def __getattr__(name):
+    """Build the module-level model and agent on first access (PEP 562)."""
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def orchestrate_data_catalog_query(user_query: str) -> str:
     """
@@ -96,7 +96,7 @@ def orchestrate_data_catalog_query(user_query: str) -> str:
         String response from the data catalog agent
     """
     try:
-        response = data_catalog_agent(user_query)
+        response = get_data_catalog_agent()(user_query)
         return response.message
     except Exception as e:
         return f"Error processing query: {str(e)}"
@@ -118,5 +118,5 @@ if __name__ == "__main__":
         if user_input.lower() == "exit":
             break
             
-        response = data_catalog_agent(user_input)
+        response = get_data_catalog_agent()(user_input)
 #        print(f"\nData Catalog Assistant: {response.message}")
@@ -1,38 +1,103 @@
 from strands import Agent, tool
 from strands_tools import file_read, image_reader
-from strands.models import BedrockModel
-from strands.models.anthropic import AnthropicModel
+import asyncio
+import functools
 import os
-from dotenv import load_dotenv
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
 
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
+sys.path.append(project_root)
 
-# Add the project root to the path so we can import our modules
-config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../../config/.env')
-load_dotenv(config_path)
-region = os.environ.get('BEDROCK_REGION', 'us-east-1')        
-# Get model ID from environment variables or use default
-model= os.environ.get('BEDROCK_MODEL', 'amazon.nova-pro-v1:0')
-print('model:%s',model)
+from src.agents.strands._cli import run_repl, stream_reply
+from src.agents.strands._model_providers import get_bedrock_model
+from src.agents.strands._config import load_config
+from src.agents.strands._tool_cache import cached_tool
 
-# Create a BedrockModel
-bedrock_model = BedrockModel(
-    model_id=model,
-    region_name=region,
-    temperature=0.3,
-)
+# Load the shared configuration
+config = load_config()
+region, model = config["region"], config["model"]
+if config["debug"]:
+    print('model:%s',model)
 
+# Fields a passport record must contain to be validated
+_REQUIRED_PASSPORT_FIELDS = frozenset({"passport_number", "date_of_expiry", "surname", "given_names"})
 
-@tool
-def extract_passport_info(image_path: str) -> dict:
+# Mock extraction results, built once. They are shared between calls, so callers must not mutate them.
+_MOCK_PASSPORT = {
+    "document_type": "passport",
+    "issuing_country": "United States",
+    "passport_number": "123456789",
+    "surname": "SMITH",
+    "given_names": "JOHN JAMES",
+    "nationality": "USA",
+    "date_of_birth": "1990-01-01",
+    "gender": "M",
+    "date_of_issue": "2018-01-01",
+    "date_of_expiry": "2028-01-01",
+    "mrz_line1": "P<USASMITH<<JOHN<JAMES<<<<<<<<<<<<<<<<<<<<<",
+    "mrz_line2": "1234567897USA9001014M2801011<<<<<<<<<<<<<<06"
+}
+
+_MOCK_BANK_STATEMENT = {
+    "document_type": "bank_statement",
+    "bank_name": "Example Bank",
+    "account_holder": "John Smith",
+    "account_number": "XXXX-XXXX-1234",
+    "statement_period": "01/04/2025 - 30/04/2025",
+    "opening_balance": 5000.00,
+    "closing_balance": 5432.10,
+    "total_deposits": 2500.00,
+    "total_withdrawals": 2067.90,
+    "transactions": [
+        {"date": "2025-04-02", "description": "SALARY", "amount": 2500.00, "type": "credit"},
+        {"date": "2025-04-05", "description": "GROCERY STORE", "amount": -120.50, "type": "debit"},
+        {"date": "2025-04-12", "description": "RESTAURANT", "amount": -85.40, "type": "debit"},
+        {"date": "2025-04-18", "description": "UTILITY BILL", "amount": -150.00, "type": "debit"},
+        {"date": "2025-04-25", "description": "ONLINE SHOPPING", "amount": -212.00, "type": "debit"}
+    ]
+}
+
+# Worker processes used by the batch extraction tools
+MAX_EXTRACTION_WORKERS = os.cpu_count() or 1
+# Files handed to a worker at a time
+EXTRACTION_CHUNKSIZE = 4
+
+
+@functools.lru_cache(maxsize=1)
+def _get_extraction_pool():
+    """Create the process pool shared by the batch extraction tools."""
+    return ProcessPoolExecutor(max_workers=MAX_EXTRACTION_WORKERS)
+
+
+def _extract_batch(extract, paths):
     """
-    Extract information from a passport image from a pdf file
+    Run a single-file extractor over several files, in parallel worker processes.
+    
+    Missing files are reported without being sent to a worker.
     
     Args:
-        image_path: Path to the passport image file
+        extract: Module-level extraction function taking one path
+        paths: Paths of the files to process
         
     Returns:
-        dict: Extracted passport information
+        list: One result per path, in the same order
     """
+    exists = [os.path.exists(path) for path in paths]
+    found = [path for path, present in zip(paths, exists) if present]
+    
+    if len(found) > 1:
+        extracted = iter(_get_extraction_pool().map(extract, found, chunksize=EXTRACTION_CHUNKSIZE))
+    else:
+        extracted = map(extract, found)
+    
+    return [next(extracted) if present else {"error": f"File not found: {path}"}
+            for path, present in zip(paths, exists)]
+
+
+def _extract_passport(image_path: str) -> dict:
+    """Extract passport information from one file; see extract_passport_info."""
     # In a real implementation, this would use OCR and image processing
     # For this example, we'll return mock data
     
@@ -40,20 +105,34 @@ def extract_passport_info(image_path: str) -> dict:
         return {"error": f"File not found: {image_path}"}
     
     # Mock passport data extraction
-    return {
-        "document_type": "passport",
-        "issuing_country": "United States",
-        "passport_number": "123456789",
-        "surname": "SMITH",
-        "given_names": "JOHN JAMES",
-        "nationality": "USA",
-        "date_of_birth": "1990-01-01",
-        "gender": "M",
-        "date_of_issue": "2018-01-01",
-        "date_of_expiry": "2028-01-01",
-        "mrz_line1": "P<USASMITH<<JOHN<JAMES<<<<<<<<<<<<<<<<<<<<<",
-        "mrz_line2": "1234567897USA9001014M2801011<<<<<<<<<<<<<<06"
-    }
+    return _MOCK_PASSPORT
+
+@tool
+@cached_tool(path_args=("image_path",))
+def extract_passport_info(image_path: str) -> dict:
+    """
+    Extract information from a passport image from a pdf file
+    
+    Args:
+        image_path: Path to the passport image file
+        
+    Returns:
+        dict: Extracted passport information
+    """
+    return _extract_passport(image_path)
+
+@tool
+def extract_passport_info_batch(image_paths: list) -> list:
+    """
+    Extract information from several passport files at once, processing them in parallel.
+    
+    Args:
+        image_paths: Paths to the passport image files
+        
+    Returns:
+        list: Extracted passport information for each file, in the same order
+    """
+    return _extract_batch(_extract_passport, image_paths)
 
 @tool
 def validate_passport(passport_data: dict) -> dict:
@@ -67,22 +146,19 @@ def validate_passport(passport_data: dict) -> dict:
         dict: Validation results
     """
     # Check for required fields
-    required_fields = ["passport_number", "date_of_expiry", "surname", "given_names"]
-    missing_fields = [field for field in required_fields if field not in passport_data]
+    missing_fields = _REQUIRED_PASSPORT_FIELDS.difference(passport_data)
     
     if missing_fields:
         return {
             "is_valid": False,
-            "reason": f"Missing required fields: {', '.join(missing_fields)}"
+            "reason": f"Missing required fields: {', '.join(sorted(missing_fields))}"
         }
     
-    # Check expiration date
-    from datetime import datetime
+    # Check expiration date (YYYY-MM-DD); a passport is no longer valid on its expiry date
     try:
-        expiry_date = datetime.strptime(passport_data["date_of_expiry"], "%Y-%m-%d")
-        today = datetime.now()
+        expiry_date = date.fromisoformat(passport_data["date_of_expiry"])
         
-        if expiry_date < today:
+        if expiry_date <= date.today():
             return {
                 "is_valid": False,
                 "reason": "Passport has expired",
@@ -104,7 +180,19 @@ def validate_passport(passport_data: dict) -> dict:
         "expiry_date": passport_data["date_of_expiry"]
     }
 
+def _extract_bank_statement(pdf_path: str) -> dict:
+    """Extract bank statement information from one file; see extract_bank_statement_info."""
+    # In a real implementation, this would use PDF parsing
+    # For this example, we'll return mock data
+    
+    if not os.path.exists(pdf_path):
+        return {"error": f"File not found: {pdf_path}"}
+    
+    # Mock bank statement data extraction
+    return _MOCK_BANK_STATEMENT
+
 @tool
+@cached_tool(path_args=("pdf_path",))
 def extract_bank_statement_info(pdf_path: str) -> dict:
     """
     Extract information from a bank statement PDF.
@@ -115,37 +203,22 @@ def extract_bank_statement_info(pdf_path: str) -> dict:
     Returns:
         dict: Extracted bank statement information
     """
-    # In a real implementation, this would use PDF parsing
-    # For this example, we'll return mock data
-    
-    if not os.path.exists(pdf_path):
-        return {"error": f"File not found: {pdf_path}"}
+    return _extract_bank_statement(pdf_path)
+
+@tool
+def extract_bank_statement_info_batch(pdf_paths: list) -> list:
+    """
+    Extract information from several bank statement PDFs at once, processing them in parallel.
     
-    # Mock bank statement data extraction
-    return {
-        "document_type": "bank_statement",
-        "bank_name": "Example Bank",
-        "account_holder": "John Smith",
-        "account_number": "XXXX-XXXX-1234",
-        "statement_period": "01/04/2025 - 30/04/2025",
-        "opening_balance": 5000.00,
-        "closing_balance": 5432.10,
-        "total_deposits": 2500.00,
-        "total_withdrawals": 2067.90,
-        "transactions": [
-            {"date": "2025-04-02", "description": "SALARY", "amount": 2500.00, "type": "credit"},
-            {"date": "2025-04-05", "description": "GROCERY STORE", "amount": -120.50, "type": "debit"},
-            {"date": "2025-04-12", "description": "RESTAURANT", "amount": -85.40, "type": "debit"},
-            {"date": "2025-04-18", "description": "UTILITY BILL", "amount": -150.00, "type": "debit"},
-            {"date": "2025-04-25", "description": "ONLINE SHOPPING", "amount": -212.00, "type": "debit"}
-        ]
-    }
+    Args:
+        pdf_paths: Paths to the bank statement PDF files
+        
+    Returns:
+        list: Extracted bank statement information for each file, in the same order
+    """
+    return _extract_batch(_extract_bank_statement, pdf_paths)
 
-# Create the document processing agent
-document_agent = Agent(
-    model=bedrock_model,
-    tools=[extract_passport_info, validate_passport, extract_bank_statement_info, file_read, image_reader],
-    system_prompt="""
+DOCUMENT_AGENT_SYSTEM_PROMPT = """
     You are a document processing assistant specialized in banking and identity documents.
     Your role is to:
     
@@ -157,7 +230,37 @@ document_agent = Agent(
     Use your tools to process documents and provide clear, structured information to users.
     Be thorough and accurate in your document analysis.
     """
-)
+
+# Create the document processing agent
+@functools.lru_cache(maxsize=1)
+def get_document_agent():
+    """
+    Create the document processing agent on first use.
+    
+    The extraction pool's worker processes import this module to reach the
+    extractors, so the model and agent are only built when the agent is needed.
+    
+    Returns:
+        Agent: The shared document processing agent
+    """
+    # Get the BedrockModel shared with the other Strands agents
+    return Agent(
+        model=get_bedrock_model(model, region, cache_prompt=True),
+        tools=[extract_passport_info, extract_passport_info_batch, validate_passport,
+               extract_bank_statement_info, extract_bank_statement_info_batch, file_read, image_reader],
+        system_prompt=DOCUMENT_AGENT_SYSTEM_PROMPT
+    )
+
+_LAZY_ATTRIBUTES = {
+    "bedrock_model": lambda: get_bedrock_model(model, region, cache_prompt=True),
+    "document_agent": get_document_agent,
+}
+
+def __getattr__(name):
+    """Build the module-level model and agent on first access (PEP 562)."""
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Example usage
 if __name__ == "__main__":
@@ -165,10 +268,4 @@ if __name__ == "__main__":
     print("------------------------")
     print("Type 'exit' to quit")
     
-    while True:
-        user_input = input("\nYou: ")
-        if user_input.lower() == "exit":
-            break
-            
-        response = document_agent(user_input)
-        print(f"\nAssistant: {response.message['content'][0]['text']}")
+    asyncio.run(run_repl(functools.partial(stream_reply, get_document_agent())))
@@ -1,45 +1,30 @@
 from strands import Agent
-from strands.models.bedrock import BedrockModel
-from strands.models.anthropic import AnthropicModel
+import asyncio
+import functools
 import os,sys
-from dotenv import load_dotenv
 
 # Add the project root to the path so we can import our modules
-sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
+sys.path.append(project_root)
 
 # Import the Stock SimpleAgent
 from src.tools.excel_tools_strands import read_csv_file
+from src.agents.strands._cli import run_repl, stream_reply
+from src.agents.strands._model_providers import get_anthropic_model
+from src.agents.strands._config import load_config
 
-# Add the project root to the path so we can import our modules
-config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../../config/.env')
-load_dotenv(config_path)
-
-region = os.environ.get('BEDROCK_REGION', 'us-east-1')        
-# Get model ID from environment variables or use default
-bedroc_model_id= os.environ.get('BEDROCK_MODEL', 'amazon.nova-pro-v1:0')
-anthropic_model_id = os.environ.get('ANTHROPIC_MODEL', 'claude-3-7-sonnet-20250219')
+# Load the shared configuration
+config = load_config()
+region, bedroc_model_id, anthropic_model_id = config["region"], config["model"], config["anthropic_model"]
 
 # in case you have access to the Claude API
-key = os.getenv('ANTHROPIC_API_KEY')
-anthropic_model = AnthropicModel(
-    client_args={
-        "api_key": key,
-    },
-    # **model_config
-    max_tokens=1028,
-    model_id=anthropic_model_id,
-    params={
-        "temperature": 0.7,
-    }
-)
+anthropic_model = get_anthropic_model(anthropic_model_id, 1028, 0.7, cache_prompt=True)
 model=anthropic_model
-print('model:%s',anthropic_model_id)
-# Create a BedrockModel
-#bedrock_model = BedrockModel(
-#    model_id=model,
-#    region_name=region,
-#    temperature=0.3,
-#)
+if config["debug"]:
+    print('model:%s',anthropic_model_id)
+# Otherwise use the BedrockModel shared with the other Strands agents
+# (get_bedrock_model from _model_providers):
+#model = get_bedrock_model(bedroc_model_id, region, cache_prompt=True)
 
 
 
@@ -77,10 +62,4 @@ if __name__ == "__main__":
     print("------------------------")
     print("Type 'exit' to quit")
     
-    while True:
-        user_input = input("\nYou: ")
-        if user_input.lower() == "exit":
-            break
-            
-        response = excel_agent(user_input)
-        print(f"\nAssistant: {response.message['content'][0]['text']}")
\ No newline at end of file
+    asyncio.run(run_repl(functools.partial(stream_reply, excel_agent)))
\ No newline at end of file
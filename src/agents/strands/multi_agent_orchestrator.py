@@ -1,32 +1,89 @@
 from strands import Agent, tool
-from strands_tools import agent_graph, workflow, think
-from strands.models import BedrockModel
-from strands.models.anthropic import AnthropicModel
-import json
+import asyncio
+import functools
+import importlib
 import os
+import re
 import sys
+import threading
+import weakref
+from collections import Counter
 from pathlib import Path
 
+from cachetools import TTLCache
+
 # Add the project root to the path to import our modules
 sys.path.append(str(Path(__file__).parent.parent.parent.parent))
 
-# Import our specialized agents
-try:
-    from src.agents.strands.banking_onboarding_agent import relationship_agent, regulator_agent
-    from src.agents.strands.document_processing_agent import document_agent
-    from src.agents.strands.stock_info_agent import stock_agent
-    from src.agents.strands.rag_agent import rag_agent
-    from src.agents.strands.data_catalog_agent import data_catalog_agent
-except ImportError:
-    print("Warning: Some agent modules could not be imported. Make sure all required files exist.")
-    # Create placeholder agents if imports fail
-    from strands import Agent
-    relationship_agent = Agent(system_prompt="Banking relationship manager placeholder")
-    regulator_agent = Agent(system_prompt="Banking regulator placeholder")
-    document_agent = Agent(system_prompt="Document processing placeholder")
-    stock_agent = Agent(system_prompt="Stock information placeholder")
-    rag_agent = Agent(system_prompt="Knowledge base placeholder")
-    data_catalog_agent = Agent(system_prompt="Data catalog placeholder")
+from src.agents.strands._cli import run_repl
+from src.agents.strands._model_providers import get_bedrock_model
+from src.agents.strands._rate_limit import run_limited
+
+# Our specialized agents: the module defining each one and the placeholder prompt used if it cannot be imported
+_AGENT_MODULES = {
+    "relationship_agent": ("src.agents.strands.banking_onboarding_agent", "Banking relationship manager placeholder"),
+    "regulator_agent": ("src.agents.strands.banking_onboarding_agent", "Banking regulator placeholder"),
+    "document_agent": ("src.agents.strands.document_processing_agent", "Document processing placeholder"),
+    "stock_agent": ("src.agents.strands.stock_info_agent", "Stock information placeholder"),
+    "rag_agent": ("src.agents.strands.rag_agent", "Knowledge base placeholder"),
+    "data_catalog_agent": ("src.agents.strands.data_catalog_agent", "Data catalog placeholder"),
+}
+
+# Agent modules are imported on first use, so a query only loads the agents it is routed to
+@functools.lru_cache(maxsize=None)
+def get_agent(name):
+    """
+    Import a specialized agent on first use.
+    
+    Args:
+        name: Name of the agent, a key of _AGENT_MODULES
+        
+    Returns:
+        Agent: The specialized agent, or a placeholder agent if its module cannot be imported
+    """
+    module_name, placeholder_prompt = _AGENT_MODULES[name]
+    try:
+        return getattr(importlib.import_module(module_name), name)
+    except ImportError:
+        print(f"Warning: {module_name} could not be imported. Make sure all required files exist.")
+        # Create a placeholder agent if the import fails
+        return Agent(system_prompt=placeholder_prompt)
+
+# Keywords that route a query to each specialized agent; order breaks score ties
+ROUTING_KEYWORDS = {
+    "banking": ("account", "bank", "onboarding", "kyc", "customer", "deposit", "withdraw"),
+    "document": ("document", "passport", "statement", "extract", "validate", "pdf", "image"),
+    "stock": ("stock", "price", "market", "invest", "share", "dividend", "chart"),
+    "data_catalog": ("data", "dataset", "catalog", "metadata", "attributes", "power plants", "population", "swiss", "data product"),
+}
+# Other word forms that count as a keyword; plurals ending in "s" are handled generically
+KEYWORD_VARIANTS = {
+    "invest": ("investing", "investment", "investor"),
+    "extract": ("extraction", "extracting"),
+    "validate": ("validation", "validating"),
+    "withdraw": ("withdrawal", "withdrawing"),
+    "price": ("pricing",),
+    "attributes": ("attribute",),
+    "power plants": ("power plant",),
+}
+_KEYWORD_AGENTS = {keyword: agent for agent, keywords in ROUTING_KEYWORDS.items() for keyword in keywords}
+# Query term (word or two-word phrase) -> the keyword it counts as
+_TERM_KEYWORDS = {keyword: keyword for keyword in _KEYWORD_AGENTS}
+_TERM_KEYWORDS.update(
+    (variant, keyword) for keyword, variants in KEYWORD_VARIANTS.items() for variant in variants
+)
+_ROUTING_TERMS = frozenset(_TERM_KEYWORDS)
+_WORD_PATTERN = re.compile(r"[a-z]+")
+# Queries shorter than the shortest keyword cannot match any keyword
+_MIN_KEYWORD_LENGTH = min(map(len, _KEYWORD_AGENTS))
+
+def _query_terms(query):
+    """Return the words and two-word phrases of a query, plus their singular forms."""
+    words = _WORD_PATTERN.findall(query.lower())
+    terms = set(words)
+    terms.update(map(" ".join, zip(words, words[1:])))
+    terms.update([term[:-1] for term in terms if term.endswith("s")])
+    return terms
 
 @tool
 def route_to_agent(query: str) -> dict:
@@ -39,25 +96,15 @@ def route_to_agent(query: str) -> dict:
     Returns:
         dict: The routing decision with agent name and confidence
     """
-    # Simple keyword-based routing
-    banking_keywords = ["account", "bank", "onboarding", "kyc", "customer", "deposit", "withdraw"]
-    document_keywords = ["document", "passport", "statement", "extract", "validate", "pdf", "image"]
-    stock_keywords = ["stock", "price", "market", "invest", "share", "dividend", "chart"]
-    data_catalog_keywords = ["data", "dataset", "catalog", "metadata", "attributes", "power plants", "population", "swiss", "data product"]
+    # Simple keyword-based routing: match whole words, so "stockade" does not count as "stock"
+    found = set()
+    if len(query) >= _MIN_KEYWORD_LENGTH:
+        found = {_TERM_KEYWORDS[term] for term in _query_terms(query) & _ROUTING_TERMS}
     
     # Count keyword matches for each agent type
-    banking_score = sum(1 for keyword in banking_keywords if keyword in query.lower())
-    document_score = sum(1 for keyword in document_keywords if keyword in query.lower())
-    stock_score = sum(1 for keyword in stock_keywords if keyword in query.lower())
-    data_catalog_score = sum(1 for keyword in data_catalog_keywords if keyword in query.lower())
-    
-    # Find the agent with the highest score
-    scores = {
-        "banking": banking_score,
-        "document": document_score,
-        "stock": stock_score,
-        "data_catalog": data_catalog_score
-    }
+    scores = dict.fromkeys(ROUTING_KEYWORDS, 0)
+    for keyword in found:
+        scores[_KEYWORD_AGENTS[keyword]] += 1
     
     max_score = max(scores.values())
     if max_score == 0:
@@ -78,11 +125,7 @@ def route_to_agent(query: str) -> dict:
         "reason": f"Query contains keywords related to {selected_agent}"
     }
 
-# Create the orchestrator agent
-orchestrator = Agent(
-    model="us.anthropic.claude-3-7-sonnet-20250219-v1:0",
-    tools=[route_to_agent, agent_graph, workflow, think],
-    system_prompt="""
+ORCHESTRATOR_SYSTEM_PROMPT = """
     You are an orchestrator agent responsible for coordinating between specialized agents.
     Your role is to:
     
@@ -100,65 +143,180 @@ orchestrator = Agent(
     
     Use your tools to route queries and coordinate workflows between these agents.
     """
-)
+
+# Create the orchestrator agent
+@functools.lru_cache(maxsize=1)
+def get_orchestrator():
+    """Create the orchestrator agent, loading its workflow tools on first use."""
+    from strands_tools import agent_graph, workflow, think
+    return Agent(
+        model=get_bedrock_model("us.anthropic.claude-3-7-sonnet-20250219-v1:0", cache_prompt=True),
+        tools=[route_to_agent, agent_graph, workflow, think],
+        system_prompt=ORCHESTRATOR_SYSTEM_PROMPT
+    )
+
+_LAZY_ATTRIBUTES = {
+    "orchestrator": get_orchestrator,
+    **{name: functools.partial(get_agent, name) for name in _AGENT_MODULES},
+}
+
+def __getattr__(name):
+    """Build the orchestrator and import the specialized agents on first access (PEP 562)."""
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Upper bound on specialized agent calls in flight at once
+AGENT_CONCURRENCY = int(os.environ.get("AGENT_CONCURRENCY", "4"))
+
+# asyncio semaphores belong to one event loop, so keep one per running loop
+_semaphores = weakref.WeakKeyDictionary()
+
+def _get_semaphore():
+    """Return the agent concurrency semaphore for the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(AGENT_CONCURRENCY)
+    return semaphore
+
+def _call_agent(name, query):
+    """Call an agent by name, importing it first if needed."""
+    agent = get_orchestrator() if name == "orchestrator" else get_agent(name)
+    return agent(query)
+
+async def _run_agent(name, query):
+    """Run a blocking agent call in a worker thread, bounded by the concurrency and model call limits."""
+    async with _get_semaphore():
+        return await run_limited(_call_agent, name, query)
+
+# Agent name and display name for each routing decision
+_AGENT_ROUTES = {
+    "banking": ("relationship_agent", "Banking Agent"),
+    "document": ("document_agent", "Document Agent"),
+    "stock": ("stock_agent", "Stock Agent"),
+    "data_catalog": ("data_catalog_agent", "Data Catalog Agent"),
+}
+
+def _select_agent(agent_type):
+    """Map a routing decision to the name of the agent that handles it and its display name."""
+    # Default to orchestrator for general queries
+    return _AGENT_ROUTES.get(agent_type, ("orchestrator", "General Assistant"))
+
+# Routing decisions are reused for this long (seconds) for the same normalized query
+ROUTE_CACHE_TTL = 300
+_route_cache = TTLCache(maxsize=1024, ttl=ROUTE_CACHE_TTL)
+# TTLCache is not thread-safe and sessions may be served concurrently
+_route_cache_lock = threading.Lock()
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Keyword routing at or above this confidence is used without asking the orchestrator.
+# Ties score at most 0.5, so they always go to the orchestrator.
+LOCAL_ROUTING_CONFIDENCE = 0.6
+
+# How queries were routed: "local" (keywords), "cache" (recent decision) or "orchestrator"
+routing_stats = Counter()
+
+def _record_routing(source):
+    """Count a routing decision by where it came from."""
+    with _route_cache_lock:
+        routing_stats[source] += 1
+
+def _normalize_query(query):
+    """Normalize a query for use as a routing cache key."""
+    return _WHITESPACE_PATTERN.sub(" ", query.strip().lower())
 
 # Function to handle multi-agent orchestration
-def process_with_orchestration(user_input, session_id=None):
+async def process_with_orchestration(user_input, session_id=None):
     """
     Process a user query through the orchestrator and route to specialized agents.
     
+    Queries with a clear keyword match are routed locally with route_to_agent.
+    Only ambiguous ones go to the orchestrator, whose routing decisions are
+    cached for ROUTE_CACHE_TTL seconds per normalized query, so a repeated
+    query skips the orchestrator round trip. When the
+    query is routed to several agents, they run concurrently (at most
+    AGENT_CONCURRENCY at a time) and their answers are combined.
+    
     Args:
         user_input: The user's query
         session_id: Optional session identifier for maintaining context
         
     Returns:
-        dict: Response from the appropriate agent
+        dict: Response from the appropriate agent, or the combined response
+              with one entry per agent under "responses"
     """
-    # First, use the orchestrator to determine which agent should handle the query
-    orchestrator_response = orchestrator(f"Route this query to the appropriate agent: {user_input}")
-    
-    # Extract the routing decision from the orchestrator's response
-    routing_info = None
-    for tool_use in orchestrator_response.metadata.get("tool_uses", []):
-        if tool_use.get("name") == "route_to_agent":
-            routing_info = tool_use.get("output", {})
-            break
-    
-    if not routing_info:
-        # If no routing info, use the orchestrator's response directly
-        return {
-            "agent": "orchestrator",
-            "response": orchestrator_response.message,
-            "metadata": orchestrator_response.metadata
-        }
-    
-    # Route to the appropriate agent based on the orchestrator's decision
-    agent_type = routing_info.get("agent")
-    
-    if agent_type == "banking":
-        response = relationship_agent(user_input)
-        agent_name = "Banking Agent"
-    elif agent_type == "document":
-        response = document_agent(user_input)
-        agent_name = "Document Agent"
-    elif agent_type == "stock":
-        response = stock_agent(user_input)
-        agent_name = "Stock Agent"
-    elif agent_type == "data_catalog":
-        response = data_catalog_agent(user_input)
-        agent_name = "Data Catalog Agent"
+    # Route clearly keyworded queries locally, without an orchestrator round trip
+    routing_info = route_to_agent(user_input)
+    if routing_info["agent"] != "general" and routing_info["confidence"] >= LOCAL_ROUTING_CONFIDENCE:
+        routes = {routing_info["agent"]: routing_info}
+        _record_routing("local")
     else:
-        # Default to orchestrator for general queries
-        response = orchestrator(user_input)
-        agent_name = "General Assistant"
+        # Otherwise reuse a recent routing decision for the same query
+        cache_key = _normalize_query(user_input)
+        with _route_cache_lock:
+            routes = _route_cache.get(cache_key)
+        if routes is not None:
+            _record_routing("cache")
     
-    return {
+    if routes is None:
+        # Ask the orchestrator which agents should handle the query
+        orchestrator_response = await run_limited(
+            _call_agent, "orchestrator", f"Route this query to the appropriate agent: {user_input}"
+        )
+        
+        # Extract the routing decisions from the orchestrator's response, one per agent
+        routes = {}
+        for tool_use in orchestrator_response.metadata.get("tool_uses", []):
+            if tool_use.get("name") == "route_to_agent":
+                routing_info = tool_use.get("output", {})
+                routes.setdefault(routing_info.get("agent"), routing_info)
+        
+        if not routes:
+            # If no routing info, use the orchestrator's response directly
+            return {
+                "agent": "orchestrator",
+                "response": orchestrator_response.message,
+                "metadata": orchestrator_response.metadata
+            }
+        
+        with _route_cache_lock:
+            _route_cache[cache_key] = routes
+        _record_routing("orchestrator")
+    
+    # Route to the selected agents concurrently
+    selected = [_select_agent(agent_type) for agent_type in routes]
+    responses = await asyncio.gather(*(_run_agent(name, user_input) for name, _ in selected))
+    
+    results = [{
         "agent": agent_name,
         "response": response.message,
         "confidence": routing_info.get("confidence", 1.0),
         "metadata": response.metadata
+    } for (_, agent_name), routing_info, response in zip(selected, routes.values(), responses)]
+    
+    if len(results) == 1:
+        return results[0]
+    
+    return {
+        "agent": ", ".join(result["agent"] for result in results),
+        "response": "\n\n".join(f"[{result['agent']}]\n{response}" for result, response in zip(results, responses)),
+        "responses": results
     }
 
+def process_with_orchestration_sync(user_input, session_id=None):
+    """
+    Synchronous wrapper around process_with_orchestration for callers without an event loop.
+    
+    Args:
+        user_input: The user's query
+        session_id: Optional session identifier for maintaining context
+        
+    Returns:
+        dict: Response from the appropriate agent
+    """
+    return asyncio.run(process_with_orchestration(user_input, session_id))
+
 # Example usage
 if __name__ == "__main__":
     print("Multi-Agent Orchestration System")
@@ -167,10 +325,8 @@ if __name__ == "__main__":
     
     session_id = f"session_{os.urandom(4).hex()}"
     
-    while True:
-        user_input = input("\nYou: ")
-        if user_input.lower() == "exit":
-            break
-            
-        response = process_with_orchestration(user_input, session_id)
+    async def respond(user_input):
+        response = await process_with_orchestration(user_input, session_id)
         print(f"\n[{response['agent']}]: {response['response']}")
+    
+    asyncio.run(run_repl(respond))
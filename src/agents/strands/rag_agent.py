@@ -1,45 +1,89 @@
 from strands import Agent, tool
 from strands_tools import retrieve, file_read
-from strands.models import BedrockModel
-from strands.models.anthropic import AnthropicModel
+import asyncio
+import functools
 import os
 import json
+import mmap
+import re
+import sys
 
-# Mock knowledge base for demonstration purposes
-KNOWLEDGE_BASE = {
-    "banking_policies": [
-        {
-            "title": "Account Opening Requirements",
-            "content": "To open a new account, customers must provide valid identification, proof of address, and complete the KYC process. For business accounts, additional documentation including business registration and ownership structure is required."
-        },
-        {
-            "title": "Fee Structure",
-            "content": "Standard checking accounts have a $5 monthly maintenance fee, which can be waived with a minimum balance of $1,500 or direct deposits totaling $500 per month. Savings accounts have no monthly fee with a minimum balance of $300."
-        }
-    ],
-    "investment_guides": [
-        {
-            "title": "Beginner's Guide to Stock Investing",
-            "content": "Stock investing involves purchasing shares of publicly traded companies. Before investing, consider your financial goals, risk tolerance, and investment timeline. Diversification across different sectors and asset classes can help manage risk."
-        },
-        {
-            "title": "Understanding Market Indicators",
-            "content": "Key market indicators include the P/E ratio, dividend yield, and market capitalization. The P/E ratio compares a company's share price to its earnings per share. A high P/E may indicate investors expect high growth, while a low P/E might suggest undervaluation or concerns about future performance."
-        }
-    ],
-    "compliance_regulations": [
-        {
-            "title": "Anti-Money Laundering (AML) Requirements",
-            "content": "Financial institutions must implement AML programs that include customer identification, transaction monitoring, and suspicious activity reporting. Enhanced due diligence is required for high-risk customers and politically exposed persons."
-        },
-        {
-            "title": "Know Your Customer (KYC) Guidelines",
-            "content": "KYC procedures require verification of customer identity, assessment of risk factors, and ongoing monitoring of customer relationships. Documentation must be periodically updated, with more frequent reviews for high-risk customers."
-        }
-    ]
-}
+import numpy as np
+from rank_bm25 import BM25Okapi
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
+sys.path.append(project_root)
+
+from src.agents.strands._cli import run_repl, stream_reply
+from src.agents.strands._model_providers import get_bedrock_model
+from src.agents.strands._tool_cache import cached_tool
+from src.config.env import PROJECT_ROOT
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+# Mock knowledge base for demonstration purposes, one JSON document per line
+KNOWLEDGE_BASE_PATH = os.path.join(PROJECT_ROOT, "data", "kb.jsonl")
+
+def _load_knowledge_base(path):
+    """
+    Load the knowledge base from a JSON-lines file.
+    
+    The file is memory-mapped, so processes loading it share the page cache
+    instead of each reading their own copy.
+    
+    Args:
+        path: Path of the JSON-lines file
+        
+    Returns:
+        list: The documents, each with category, title and content
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return [_loads(line) for line in iter(mm.readline, b"") if line.strip()]
+
+_KB_DOCUMENTS = _load_knowledge_base(KNOWLEDGE_BASE_PATH)
+
+# Documents grouped by category
+KNOWLEDGE_BASE = {}
+for _document in _KB_DOCUMENTS:
+    KNOWLEDGE_BASE.setdefault(_document["category"], []).append(
+        {"title": _document["title"], "content": _document["content"]}
+    )
+
+# Maximum number of documents returned by a search
+SEARCH_TOP_K = 5
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+def _tokenize(text):
+    """Split text into lowercase word tokens for BM25 scoring."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+# Flat list of (category, title, content), in knowledge base order
+_KB_FLAT = [(document["category"], document["title"], document["content"]) for document in _KB_DOCUMENTS]
+# Positions in _KB_FLAT for each category
+_KB_BY_CAT = {}
+for _index, _entry in enumerate(_KB_FLAT):
+    _KB_BY_CAT.setdefault(_entry[0], []).append(_index)
+_KB_BY_CAT = {cat: np.array(indices) for cat, indices in _KB_BY_CAT.items()}
+
+# BM25 index and inverted index (token -> positions of the documents containing it)
+# over titles and contents, built once at import time
+_KB_TOKENS = [_tokenize(f"{title} {content}") for _, title, content in _KB_FLAT]
+_BM25 = BM25Okapi(_KB_TOKENS)
+_POSTINGS = {}
+for _index, _tokens in enumerate(_KB_TOKENS):
+    for _token in set(_tokens):
+        _POSTINGS.setdefault(_token, []).append(_index)
+_POSTINGS = {token: np.array(indices) for token, indices in _POSTINGS.items()}
+_NO_DOCUMENTS = np.array([], dtype=int)
 
 @tool
+@cached_tool
 def search_knowledge_base(query: str, category: str = None) -> list:
     """
     Search the knowledge base for information related to a query.
@@ -51,32 +95,38 @@ def search_knowledge_base(query: str, category: str = None) -> list:
     Returns:
         list: Relevant documents from the knowledge base
     """
-    query = query.lower()
-    results = []
+    query_tokens = _tokenize(query)
     
-    # Determine which categories to search
-    categories = [category] if category and category in KNOWLEDGE_BASE else KNOWLEDGE_BASE.keys()
+    # Candidates are the documents sharing at least one token with the query
+    indices = _NO_DOCUMENTS
+    for token in set(query_tokens):
+        indices = np.union1d(indices, _POSTINGS.get(token, _NO_DOCUMENTS))
+    if category in _KB_BY_CAT:
+        indices = np.intersect1d(indices, _KB_BY_CAT[category])
+    if not len(indices):
+        return []
     
-    # Search through the knowledge base
-    for cat in categories:
-        for document in KNOWLEDGE_BASE[cat]:
-            # Simple keyword matching (in a real implementation, use vector search)
-            if query in document["title"].lower() or query in document["content"].lower():
-                results.append({
-                    "category": cat,
-                    "title": document["title"],
-                    "content": document["content"],
-                    "relevance": 0.85  # Mock relevance score
-                })
+    # Score the candidates and keep the best ones, highest score first
+    scores = _BM25.get_scores(query_tokens)[indices]
+    top_k = min(SEARCH_TOP_K, len(indices))
+    top = np.argpartition(-scores, top_k - 1)[:top_k]
+    top = top[np.argsort(-scores[top], kind="stable")]
     
-    # Sort by relevance
-    results.sort(key=lambda x: x["relevance"], reverse=True)
+    results = []
+    for position in top:
+        cat, title, content = _KB_FLAT[indices[position]]
+        results.append({
+            "category": cat,
+            "title": title,
+            "content": content,
+            "relevance": round(float(scores[position]), 4)  # BM25 score
+        })
     
     return results
 
 # Create the RAG-enhanced agent
 rag_agent = Agent(
-    model="us.anthropic.claude-3-7-sonnet-20250219-v1:0",
+    model=get_bedrock_model("us.anthropic.claude-3-7-sonnet-20250219-v1:0", cache_prompt=True),
     tools=[search_knowledge_base, retrieve, file_read],
     system_prompt="""
     You are a knowledge-enhanced assistant with access to a banking and finance knowledge base.
@@ -98,10 +148,4 @@ if __name__ == "__main__":
     print("--------------------------------")
     print("Type 'exit' to quit")
     
-    while True:
-        user_input = input("\nYou: ")
-        if user_input.lower() == "exit":
-            break
-            
-        response = rag_agent(user_input)
-        print(f"\nAssistant: {response.message}")
+    asyncio.run(run_repl(functools.partial(stream_reply, rag_agent)))
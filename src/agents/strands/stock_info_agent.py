@@ -3,22 +3,15 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..
 sys.path.append(project_root)
 
 from strands import Agent, tool
-from strands.models import BedrockModel
-from strands.models.anthropic import AnthropicModel
-from dotenv import load_dotenv
+from src.agents.strands._model_providers import get_anthropic_model
+from src.agents.strands._rate_limit import run_limited
+from src.agents.strands._config import load_config
+import functools
 import logging
+import numpy as np
 from typing import Dict, Any, List,Callable
 import asyncio
 
-# Add the project root to the path so we can import our modules
-config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../../config/.env')
-load_dotenv(config_path)
-
-region = os.environ.get('BEDROCK_REGION', 'us-east-1')        
-# Get model ID from environment variables or use default
-model= os.environ.get('BEDROCK_MODEL', 'us.amazon.nova-pro-v1:0')
-ant_model=os.environ.get('ANTHROPIC_MODEL', 'claude-3-7-sonnet-20250219')           
-
 # Import the Yahoo Finance client
 from src.utils.finance.yahoo_finance import yahoo_finance
 
@@ -26,26 +19,24 @@ from src.utils.finance.yahoo_finance import yahoo_finance
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-key = os.getenv('ANTHROPIC_API_KEY')
-anthropic_model = AnthropicModel(
-    client_args={
-        "api_key": key,
-    },
-    # **model_config
-    max_tokens=1028,
-    model_id=ant_model,
-    params={
-        "temperature": 0.7,
-    }
-)
-bedrock_model=BedrockModel(
-    region_name=region,
-    max_tokens=1028,
-    model_id=model,
-    params={
-        "temperature": 0.7,
-    }
-)
+# Stock information fields returned by get_stock_data, with their defaults
+_STOCK_DATA_DEFAULTS = {
+    "name": 'Unknown',
+    "current_price": 'N/A',
+    "market_cap": 'N/A',
+    "market_cap_formatted": 'N/A',
+    "pe_ratio": 'N/A',
+    "dividend_yield": 'N/A',
+    "dividend_yield_formatted": 'N/A',
+    "fifty_two_week_high": 'N/A',
+    "fifty_two_week_low": 'N/A',
+    "sector": 'N/A',
+    "industry": 'N/A',
+    "currency": 'USD',
+    "exchange": 'N/A',
+    "business_summary": 'N/A'
+}
+
 @tool
 def get_stock_data(symbol: str) -> Dict[str, Any]:
     """
@@ -58,38 +49,24 @@ def get_stock_data(symbol: str) -> Dict[str, Any]:
         dict: Stock data including current price and historical data
     """
     try:
-        # Fetch basic stock information
-        stock_info = yahoo_finance.get_stock_info(symbol)
+        # Fetch basic information, the past month of prices and recent news in parallel
+        overview = yahoo_finance.get_stock_overview(symbol, period='1mo', interval='1d', news_limit=3)
+        stock_info = overview['stock_info']
+        historical_data = overview['historical_data']
+        news = overview['news']
         
         # Check if there was an error
         if 'error' in stock_info:
             return {"error": f"Error fetching stock data: {stock_info['error']}"}
         
-        # Fetch historical data for the past week
-        historical_data = yahoo_finance.get_historical_data(symbol, period='1mo', interval='1d')
-        
-        # Fetch recent news about the company
-        news = yahoo_finance.get_company_news(symbol, limit=3)
-        
-        # Combine all the information
+        # Combine all the information, with defaults for the fields Yahoo did not return
+        stats = historical_data.get('stats') or {}
         result = {
             "symbol": symbol,
-            "name": stock_info.get('name', 'Unknown'),
-            "current_price": stock_info.get('current_price', 'N/A'),
-            "change": historical_data.get('stats', {}).get('change', 'N/A'),
-            "change_percent": historical_data.get('stats', {}).get('percent_change', 'N/A'),
-            "market_cap": stock_info.get('market_cap', 'N/A'),
-            "market_cap_formatted": stock_info.get('market_cap_formatted', 'N/A'),
-            "pe_ratio": stock_info.get('pe_ratio', 'N/A'),
-            "dividend_yield": stock_info.get('dividend_yield', 'N/A'),
-            "dividend_yield_formatted": stock_info.get('dividend_yield_formatted', 'N/A'),
-            "fifty_two_week_high": stock_info.get('fifty_two_week_high', 'N/A'),
-            "fifty_two_week_low": stock_info.get('fifty_two_week_low', 'N/A'),
-            "sector": stock_info.get('sector', 'N/A'),
-            "industry": stock_info.get('industry', 'N/A'),
-            "currency": stock_info.get('currency', 'USD'),
-            "exchange": stock_info.get('exchange', 'N/A'),
-            "business_summary": stock_info.get('business_summary', 'N/A'),
+            **_STOCK_DATA_DEFAULTS,
+            **{key: stock_info[key] for key in _STOCK_DATA_DEFAULTS.keys() & stock_info.keys()},
+            "change": stats.get('change', 'N/A'),
+            "change_percent": stats.get('percent_change', 'N/A'),
             "historical_data": historical_data.get('data', []),
             "news": news
         }
@@ -99,6 +76,24 @@ def get_stock_data(symbol: str) -> Dict[str, Any]:
         logger.error(f"Error in get_stock_data for {symbol}: {str(e)}")
         return {"error": f"Failed to retrieve stock data: {str(e)}"}
 
+# Metrics reported by compare_stocks, in the order _comparison_row returns them
+COMPARISON_COLUMNS = (
+    "current_prices", "daily_changes", "market_caps", "pe_ratios",
+    "dividend_yields", "sectors", "industries"
+)
+
+def _comparison_row(info: Dict[str, Any], quote: Dict[str, Any]) -> tuple:
+    """Extract the COMPARISON_COLUMNS metrics for one stock."""
+    return (
+        info.get('current_price', 'N/A'),
+        quote.get('change_percent', 'N/A'),
+        info.get('market_cap_formatted', info.get('market_cap', 'N/A')),
+        info.get('pe_ratio', 'N/A'),
+        info.get('dividend_yield_formatted', info.get('dividend_yield', 'N/A')),
+        info.get('sector', 'N/A'),
+        info.get('industry', 'N/A')
+    )
+
 @tool
 def compare_stocks(symbols: list) -> Dict[str, Any]:
     """
@@ -114,32 +109,19 @@ def compare_stocks(symbols: list) -> Dict[str, Any]:
         # Fetch quotes for all symbols
         quotes = yahoo_finance.get_multiple_quotes(symbols)
         
-        # Fetch basic info for all symbols
-        stock_infos = {}
-        for symbol in symbols:
-            stock_infos[symbol] = yahoo_finance.get_stock_info(symbol)
+        # Fetch basic info for all symbols concurrently
+        stock_infos = yahoo_finance.get_multiple_stock_infos(symbols)
         
-        # Create comparison metrics
+        # One row of metrics per stock that was found, then one column per metric
+        rows = {
+            symbol: _comparison_row(info, quotes.get(symbol, {}))
+            for symbol, info in stock_infos.items() if 'error' not in info
+        }
         comparison = {
-            "current_prices": {},
-            "daily_changes": {},
-            "market_caps": {},
-            "pe_ratios": {},
-            "dividend_yields": {},
-            "sectors": {},
-            "industries": {}
+            column: {symbol: row[i] for symbol, row in rows.items()}
+            for i, column in enumerate(COMPARISON_COLUMNS)
         }
         
-        for symbol, info in stock_infos.items():
-            if 'error' not in info:
-                comparison["current_prices"][symbol] = info.get('current_price', 'N/A')
-                comparison["daily_changes"][symbol] = quotes.get(symbol, {}).get('change_percent', 'N/A')
-                comparison["market_caps"][symbol] = info.get('market_cap_formatted', info.get('market_cap', 'N/A'))
-                comparison["pe_ratios"][symbol] = info.get('pe_ratio', 'N/A')
-                comparison["dividend_yields"][symbol] = info.get('dividend_yield_formatted', info.get('dividend_yield', 'N/A'))
-                comparison["sectors"][symbol] = info.get('sector', 'N/A')
-                comparison["industries"][symbol] = info.get('industry', 'N/A')
-        
         return {
             "stocks": stock_infos,
             "quotes": quotes,
@@ -159,7 +141,7 @@ def get_market_overview() -> Dict[str, Any]:
     try:
         # Fetch market summary
         market_summary = yahoo_finance.get_market_summary()
-        print(market_summary)
+        logger.debug("Market summary: %s", market_summary)
         
         if 'error' in market_summary:
             return {"error": f"Error fetching market data: {market_summary['error']}"}
@@ -168,76 +150,52 @@ def get_market_overview() -> Dict[str, Any]:
         logger.error(f"Error in get_market_overview: {str(e)}")
         return {"error": f"Failed to retrieve market overview: {str(e)}"}
 
+# Shortest Yahoo Finance period covering a number of trading days
+_CHART_PERIODS = ((5, '5d'), (21, '1mo'), (63, '3mo'), (126, '6mo'), (252, '1y'), (504, '2y'))
+
 @tool
-def generate_stock_chart_code(symbol: str, days: int = 7) -> str:
+def get_stock_chart_data(symbol: str, days: int = 7) -> Dict[str, Any]:
     """
-    Generate Python code to create a stock price chart.
+    Get the data for a stock price chart.
     
     Args:
         symbol: Stock ticker symbol
-        days: Number of days of historical data to include
+        days: Number of trading days of closing prices to include
         
     Returns:
-        str: Python code to generate the chart
+        dict: Chart title, currency, dates (labels), closing prices (values),
+              and the highest and lowest closing prices with their dates
     """
-    code = f"""
-import matplotlib.pyplot as plt
-import pandas as pd
-from datetime import datetime, timedelta
-
-# Get stock data
-stock_data = get_stock_data("{symbol}")
-
-# Extract historical data
-if "error" in stock_data or not stock_data.get("historical_data"):
-    print(f"Error: Could not retrieve historical data for {symbol}")
-    return "Failed to generate chart due to missing data"
-
-# Get the last {days} days of data
-historical_data = stock_data["historical_data"][-{days}:]
-
-# Extract dates and prices
-dates = [item["date"] for item in historical_data]
-prices = [item["close"] for item in historical_data]
-
-# Create the chart
-plt.figure(figsize=(10, 6))
-plt.plot(dates, prices, marker='o', linestyle='-', color='blue')
-plt.title(f"{{stock_data['name']}} ({symbol}) - {days} Day Price History")
-plt.xlabel("Date")
-plt.ylabel(f"Price ({{stock_data['currency']}})")
-plt.grid(True)
-plt.xticks(rotation=45)
-plt.tight_layout()
-
-# Add annotations for highest and lowest points
-if prices:
-    max_price = max(prices)
-    min_price = min(prices)
-    max_idx = prices.index(max_price)
-    min_idx = prices.index(min_price)
-    
-    plt.annotate(f"High: {{max_price}}", 
-                xy=(dates[max_idx], max_price),
-                xytext=(0, 10),
-                textcoords="offset points",
-                ha='center',
-                arrowprops=dict(arrowstyle="->"))
-                
-    plt.annotate(f"Low: {{min_price}}", 
-                xy=(dates[min_idx], min_price),
-                xytext=(0, -15),
-                textcoords="offset points",
-                ha='center',
-                arrowprops=dict(arrowstyle="->"))
-
-# Show the chart
-plt.show()
-
-# Return a description of the chart
-return f"Generated price chart for {{stock_data['name']}} ({symbol}) showing the last {days} days of price data."
-"""
-    return code
+    try:
+        period = next((period for limit, period in _CHART_PERIODS if days <= limit), '5y')
+        historical_data = yahoo_finance.get_historical_data(symbol, period=period, interval='1d')
+        if 'error' in historical_data or not historical_data.get('data'):
+            return {"error": f"Could not retrieve historical data for {symbol}"}
+        stock_info = yahoo_finance.get_stock_info(symbol)
+        
+        # Get the last days of data that have a closing price
+        points = [item for item in historical_data['data'] if item['close'] is not None][-days:]
+        if not points:
+            return {"error": f"No closing prices available for {symbol}"}
+        labels = [item['date'] for item in points]
+        values = [item['close'] for item in points]
+        closes = np.asarray(values)
+        high = int(closes.argmax())
+        low = int(closes.argmin())
+        
+        name = stock_info.get('name', symbol)
+        return {
+            "symbol": symbol,
+            "title": f"{name} ({symbol}) - {days} Day Price History",
+            "currency": stock_info.get('currency', 'USD'),
+            "labels": labels,
+            "values": values,
+            "high": {"date": labels[high], "price": values[high]},
+            "low": {"date": labels[low], "price": values[low]}
+        }
+    except Exception as e:
+        logger.error(f"Error in get_stock_chart_data for {symbol}: {str(e)}")
+        return {"error": f"Failed to retrieve chart data: {str(e)}"}
 
 @tool
 def search_stocks(query: str, limit: int = 5) -> List[Dict[str, Any]]:
@@ -258,21 +216,17 @@ def search_stocks(query: str, limit: int = 5) -> List[Dict[str, Any]]:
         logger.error(f"Error in search_stocks for {query}: {str(e)}")
         return [{"error": f"Failed to search stocks: {str(e)}"}]
 
-# Create the stock information agent
-stock_agent = Agent(
-    model=anthropic_model,
-    tools=[get_stock_data, compare_stocks, get_market_overview, generate_stock_chart_code, search_stocks,],
-    system_prompt="""
+STOCK_AGENT_SYSTEM_PROMPT = """
     You are a stock information assistant specialized in financial analysis and visualization.
     Your role is to:
     
     1. Provide current stock information and historical data using real-time data from Yahoo Finance
     2. Compare multiple stocks based on key metrics like price, market cap, P/E ratio, and dividend yield
-    3. Generate visualizations of stock performance
+    3. Provide chart data (dates and closing prices) to visualize stock performance
     4. Offer market overviews and insights on market trends
     5. Provide basic analysis and insights on stock trends
     
-    Use your tools to retrieve stock data, perform calculations, and create visualizations.
+    Use your tools to retrieve stock data, perform calculations, and prepare chart data.
     Present information in a clear, organized manner and explain financial concepts when needed.
     
     When analyzing stocks:
@@ -283,7 +237,48 @@ stock_agent = Agent(
     
     Always provide accurate, up-to-date information and be transparent about any limitations in the data.
     """
-)
+
+def create_stock_agent():
+    """
+    Create a new stock information agent.
+    
+    An agent keeps its conversation in agent.messages, so callers serving
+    independent requests concurrently each need their own; the model client
+    is shared between them.
+    
+    Returns:
+        Agent: A stock information agent with an empty conversation
+    """
+    # Get model ID from the shared configuration
+    ant_model = load_config()["anthropic_model"]
+    
+    # Get the AnthropicModel shared with the other Strands agents; to run on Bedrock
+    # instead, use get_bedrock_model() from _model_providers
+    anthropic_model = get_anthropic_model(ant_model, 1028, 0.7)
+    return Agent(
+        model=anthropic_model,
+        tools=[get_stock_data, compare_stocks, get_market_overview, get_stock_chart_data, search_stocks,],
+        system_prompt=STOCK_AGENT_SYSTEM_PROMPT
+    )
+
+@functools.lru_cache(maxsize=1)
+def get_stock_agent():
+    """
+    Create the shared stock information agent on first use.
+    
+    The model client is only set up when the agent is needed, so importing
+    this module for its tools stays cheap.
+    
+    Returns:
+        Agent: The shared stock information agent
+    """
+    return create_stock_agent()
+
+def __getattr__(name):
+    """Create stock_agent on first access (PEP 562)."""
+    if name == "stock_agent":
+        return get_stock_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 async def stock_agent_streaming(query: str, callback: Callable = None):
     """
@@ -297,9 +292,10 @@ async def stock_agent_streaming(query: str, callback: Callable = None):
         The final response from the agent
     """
     try:
-        # First try with streaming
+        # First try with streaming; the agent call blocks, so run it in a worker
+        # thread within the shared model call limits to keep the event loop free
         logger.info(f"Calling stock agent with streaming for query: {query}")
-        stock_agent(query, stream=True, callback=callback)
+        return await run_limited(functools.partial(get_stock_agent(), query, stream=True, callback=callback))
            
     except Exception as e:
         logger.error(f"Error in stock_agent_streaming: {str(e)}")
@@ -0,0 +1,3 @@
+"""
+Configuration helpers for multi-agent systems.
+"""
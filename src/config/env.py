@@ -0,0 +1,23 @@
+"""
+Environment loading shared by the agent modules.
+
+The project's config/.env file is parsed at most once per process, however
+many agent modules are imported.
+"""
+import functools
+import os
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+ENV_PATH = os.path.join(PROJECT_ROOT, 'config', '.env')
+
+
+@functools.lru_cache(maxsize=1)
+def load_env() -> bool:
+    """
+    Load config/.env into os.environ on the first call.
+
+    Returns:
+        bool: True if the file was found and loaded
+    """
+    from dotenv import load_dotenv
+    return load_dotenv(ENV_PATH)
@@ -3,10 +3,20 @@ MCP Server for Excel Tools
 
 This module provides an MCP server that exposes Excel file reading functionality.
 """
+import asyncio
+import functools
+import hashlib
+import json
 import os
 import sys
 import logging
-from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Add the project root to the path so we can import our modules
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
@@ -16,15 +26,150 @@ from mcp.server.fastmcp import FastMCP
 # Initialize FastMCP server
 mcp = FastMCP("excel")
 # Import the Excel tools
-from src.tools.excel_tools_strands import read_excel_file, read_csv_file
+from src.tools.excel_tools_strands import list_excel_sheets, read_excel_file, read_csv_file
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Parsed files kept in memory, so repeated tool calls on a file skip the parser
+PARSE_CACHE_SIZE = 32
+
+# Results larger than this (serialized, in bytes) are replaced by a handle and a
+# preview, so a sheet with long text cells does not flood the model's context
+MAX_RESULT_BYTES = 64 * 1024
+# Number of full results kept for fetch_excel_payload, and preview rows per column
+PAYLOAD_CACHE_SIZE = 64
+PREVIEW_ROWS = 5
+
+# Full results behind the handles returned for large results, oldest first.
+# Only the event loop thread touches it, so it needs no lock.
+_payloads: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+
+def _file_version(file_path: str) -> tuple:
+    """Return the modification time and size of a file, which change whenever it is rewritten."""
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class _ToolError(Exception):
+    """
+    Carries an error result of an underlying tool out of a cached function.
+    
+    lru_cache does not store exceptions, so raising keeps a transient failure,
+    such as a file read while it is being written, from being replayed.
+    """
+    def __init__(self, result: Dict[str, Any]):
+        super().__init__(result.get('error'))
+        self.result = result
+
+
+def _checked(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a tool result, raising _ToolError if it reports an error."""
+    if 'error' in result:
+        raise _ToolError(result)
+    return result
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _cached_read_excel(file_path: str, version: tuple, sheet_name: Optional[str],
+                       max_rows: int) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Build the read_excel response once per file version (see _build_response); it must not be modified."""
+    return _build_response(_checked(read_excel_file(file_path, sheet_name, max_rows)), max_rows)
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _cached_read_csv(file_path: str, version: tuple, delimiter: str, encoding: str,
+                     max_rows: int) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Build the read_csv response once per file version (see _build_response); it must not be modified."""
+    return _build_response(_checked(read_csv_file(file_path, delimiter, encoding, max_rows)), max_rows)
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _cached_read_column(file_path: str, version: tuple, sheet_name: Optional[str], column_name: str) -> Dict[str, Any]:
+    """
+    Parse a single column of an Excel or CSV file once per file version.
+    
+    Only the requested column is converted, so memory and time do not grow with
+    the number of other columns. If the column does not exist, the result has no
+    columns. The result must not be modified.
+    """
+    if file_path.lower().endswith('.csv'):
+        return _checked(read_csv_file(file_path, columns=[column_name]))
+    return _checked(read_excel_file(file_path, sheet_name, columns=[column_name]))
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _cached_sheet_names(file_path: str, version: tuple) -> List[str]:
+    """Read the sheet names of an Excel file from its workbook metadata, without parsing the sheets."""
+    return list_excel_sheets(file_path)
+
+
+def _add_sample_note(result: Dict[str, Any], max_rows: int) -> None:
+    """Trim the data sample to max_rows and note when it, or the whole read, is partial."""
+    if 'data_sample' not in result:
+        return
+    result['data_sample'] = {column: values[:max_rows] for column, values in result['data_sample'].items()}
+    sample_rows = len(next(iter(result['data_sample'].values()), []))
+    total_rows = result['total_rows']
+    if total_rows is None or total_rows > max_rows:
+        # Only max_rows rows were parsed
+        result['note'] = (f"Data sample, column information and statistics limited to the first {max_rows} rows. "
+                          f"Total rows: {total_rows if total_rows is not None else 'unknown'}")
+    elif sample_rows < total_rows:
+        result['note'] = f"Data sample limited to {sample_rows} rows. Total rows: {total_rows}"
+
+
+def _serialize(result: Dict[str, Any]) -> bytes:
+    """Serialize a result as JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(result, default=str)
+    return json.dumps(result, default=str).encode()
+
+
+def _build_response(result: Dict[str, Any], max_rows: int) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """
+    Build a read_excel or read_csv response from the result of the underlying tool.
+    
+    The data sample is trimmed to max_rows. A result larger than MAX_RESULT_BYTES
+    is replaced by a handle and a preview; the full result is then returned as
+    well, to be kept for fetch_excel_payload. Otherwise the second item is None.
+    """
+    result = dict(result)
+    _add_sample_note(result, max_rows)
+    if 'data_sample' not in result:
+        return result, None
+    payload = _serialize(result)
+    if len(payload) <= MAX_RESULT_BYTES:
+        return result, None
+    
+    handle = f"excel://{hashlib.blake2b(payload, digest_size=8).hexdigest()}"
+    return {
+        "handle": handle,
+        "file_path": result["file_path"],
+        "total_rows": result["total_rows"],
+        "total_columns": result["total_columns"],
+        "column_names": result["column_names"],
+        "preview": {column: values[:PREVIEW_ROWS] for column, values in result["data_sample"].items()},
+        "note": " ".join(filter(None, (
+            f"The full result is larger than {MAX_RESULT_BYTES // 1024} KB, so only the first {PREVIEW_ROWS} rows "
+            f"are shown. Call fetch_excel_payload with the handle to get the full result.",
+            result.get("note")
+        )))
+    }, result
+
+
+def _keep_payload(handle: str, result: Dict[str, Any]) -> None:
+    """Keep a full result for fetch_excel_payload, evicting the oldest beyond PAYLOAD_CACHE_SIZE."""
+    _payloads[handle] = result
+    _payloads.move_to_end(handle)
+    while len(_payloads) > PAYLOAD_CACHE_SIZE:
+        _payloads.popitem(last=False)
+
 
 @mcp.tool()
-def read_excel(file_path: str, sheet_name: Optional[str] = None, max_rows: int = 100) -> Dict[str, Any]:
+async def read_excel(file_path: str, sheet_name: Optional[str] = None, max_rows: int = 100) -> Dict[str, Any]:
     """
     Read an Excel file and return its contents.
     
@@ -34,27 +179,30 @@ def read_excel(file_path: str, sheet_name: Optional[str] = None, max_rows: int =
         max_rows: Maximum number of rows to return in the data sample (default: 100)
         
     Returns:
-        dict: Dictionary containing the Excel data and metadata
+        dict: Dictionary containing the Excel data and metadata. data_sample maps
+              each column name to its values in the first max_rows rows.
     """
-    logger.info(f"Reading Excel file: {file_path}")
+    logger.info("Reading Excel file: %s", file_path)
     
     try:
-        # Call the underlying tool
-        result = read_excel_file(file_path, sheet_name)
-        
-        # Limit the number of rows in the data sample if needed
-        if 'data_sample' in result and len(result['data_sample']) > max_rows:
-            result['data_sample'] = result['data_sample'][:max_rows]
-            result['note'] = f"Data sample limited to {max_rows} rows. Total rows: {result['total_rows']}"
+        # Call the underlying tool in a worker thread, or reuse its response for an unchanged file
+        # Only max_rows rows are parsed; the total comes from the workbook metadata
+        response, full_result = await asyncio.to_thread(
+            _cached_read_excel, file_path, _file_version(file_path), sheet_name, max_rows
+        )
+        if full_result is not None:
+            _keep_payload(response['handle'], full_result)
         
-        return result
+        return dict(response)
+    except _ToolError as e:
+        return dict(e.result)
     except Exception as e:
         error_msg = f"Failed to read Excel file: {str(e)}"
         logger.error(error_msg)
         return {"error": error_msg}
 
 @mcp.tool()
-def read_csv(file_path: str, delimiter: str = ',', encoding: str = 'utf-8', max_rows: int = 100) -> Dict[str, Any]:
+async def read_csv(file_path: str, delimiter: str = ',', encoding: str = 'utf-8', max_rows: int = 100) -> Dict[str, Any]:
     """
     Read a CSV file and return its contents.
     
@@ -65,27 +213,49 @@ def read_csv(file_path: str, delimiter: str = ',', encoding: str = 'utf-8', max_
         max_rows: Maximum number of rows to return in the data sample (default: 100)
         
     Returns:
-        dict: Dictionary containing the CSV data and metadata
+        dict: Dictionary containing the CSV data and metadata. data_sample maps
+              each column name to its values in the first max_rows rows.
     """
-    logger.info(f"Reading CSV file: {file_path}")
+    logger.info("Reading CSV file: %s", file_path)
     
     try:
-        # Call the underlying tool
-        result = read_csv_file(file_path, delimiter, encoding)
+        # Call the underlying tool in a worker thread, or reuse its response for an unchanged file
+        # Only max_rows rows are parsed; the total comes from counting lines
+        response, full_result = await asyncio.to_thread(
+            _cached_read_csv, file_path, _file_version(file_path), delimiter, encoding, max_rows
+        )
+        if full_result is not None:
+            _keep_payload(response['handle'], full_result)
         
-        # Limit the number of rows in the data sample if needed
-        if 'data_sample' in result and len(result['data_sample']) > max_rows:
-            result['data_sample'] = result['data_sample'][:max_rows]
-            result['note'] = f"Data sample limited to {max_rows} rows. Total rows: {result['total_rows']}"
-        
-        return result
+        return dict(response)
+    except _ToolError as e:
+        return dict(e.result)
     except Exception as e:
         error_msg = f"Failed to read CSV file: {str(e)}"
         logger.error(error_msg)
         return {"error": error_msg}
 
 @mcp.tool()
-def list_sheets(file_path: str) -> Dict[str, Any]:
+async def fetch_excel_payload(handle: str) -> Dict[str, Any]:
+    """
+    Fetch the full result of a read_excel or read_csv call that returned a handle.
+    
+    Args:
+        handle: The handle returned in place of the full result
+        
+    Returns:
+        dict: The full result, including column information, statistics and the data sample
+    """
+    logger.info("Fetching payload: %s", handle)
+    
+    result = _payloads.get(handle)
+    if result is None:
+        return {"error": f"Unknown or expired handle: {handle}. Read the file again to get a new one."}
+    return result
+
+
+@mcp.tool()
+async def list_sheets(file_path: str) -> Dict[str, Any]:
     """
     List all sheets in an Excel file.
     
@@ -95,15 +265,12 @@ def list_sheets(file_path: str) -> Dict[str, Any]:
     Returns:
         dict: Dictionary containing the list of sheet names
     """
-    logger.info(f"Listing sheets in Excel file: {file_path}")
+    logger.info("Listing sheets in Excel file: %s", file_path)
     
     try:
-        # Call the underlying tool to get all sheets
-        result = read_excel_file(file_path)
-        
         return {
             "file_path": file_path,
-            "sheet_names": result.get('all_sheets', [])
+            "sheet_names": list(await asyncio.to_thread(_cached_sheet_names, file_path, _file_version(file_path)))
         }
     except Exception as e:
         error_msg = f"Failed to list sheets in Excel file: {str(e)}"
@@ -111,7 +278,7 @@ def list_sheets(file_path: str) -> Dict[str, Any]:
         return {"error": error_msg}
 
 @mcp.tool()
-def get_column_stats(file_path: str, column_name: str, sheet_name: Optional[str] = None) -> Dict[str, Any]:
+async def get_column_stats(file_path: str, column_name: str, sheet_name: Optional[str] = None) -> Dict[str, Any]:
     """
     Get statistics for a specific column in an Excel or CSV file.
     
@@ -123,14 +290,13 @@ def get_column_stats(file_path: str, column_name: str, sheet_name: Optional[str]
     Returns:
         dict: Dictionary containing column statistics
     """
-    logger.info(f"Getting stats for column '{column_name}' in file: {file_path}")
+    logger.info("Getting stats for column '%s' in file: %s", column_name, file_path)
     
     try:
-        # Determine file type and call appropriate function
-        if file_path.lower().endswith('.csv'):
-            result = read_csv_file(file_path)
-        else:
-            result = read_excel_file(file_path, sheet_name)
+        # Only the requested column is needed, so only that column is parsed
+        result = await asyncio.to_thread(
+            _cached_read_column, file_path, _file_version(file_path), sheet_name, column_name
+        )
         
         # Check if column exists
         if column_name not in result.get('column_names', []):
@@ -143,8 +309,8 @@ def get_column_stats(file_path: str, column_name: str, sheet_name: Optional[str]
                 column_info = col
                 break
         
-        # Get column data from sample
-        column_data = [row.get(column_name) for row in result.get('data_sample', [])]
+        # The sample is stored by column, so the column's values are a single lookup
+        column_data = result.get('data_sample', {}).get(column_name, [])
         
         return {
             "file_path": file_path,
@@ -153,6 +319,8 @@ def get_column_stats(file_path: str, column_name: str, sheet_name: Optional[str]
             "data_sample": column_data[:10],  # First 10 values
             "statistics": result.get('statistics', {}).get(column_name, {})
         }
+    except _ToolError as e:
+        return dict(e.result)
     except Exception as e:
         error_msg = f"Failed to get column stats: {str(e)}"
         logger.error(error_msg)
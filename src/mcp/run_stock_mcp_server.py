@@ -13,14 +13,35 @@ import uvicorn
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
 sys.path.append(project_root)
 
+# ASGI app factories of the MCP server, by transport
+TRANSPORT_APPS = {
+    "sse": "src.mcp.stock_agent_mcp_server:mcp.sse_app",
+    "streamable-http": "src.mcp.stock_agent_mcp_server:mcp.streamable_http_app",
+}
+
+# Default worker count for streamable-http: half of the CPU cores
+DEFAULT_WORKERS = max(1, (os.cpu_count() or 1) // 2)
+
+
 def main():
     """Run the Stock Agent MCP Server"""
     parser = argparse.ArgumentParser(description="Run the Stock Agent MCP Server")
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
     parser.add_argument("--host", default="127.0.0.1", help="Host to bind to")
     parser.add_argument("--port", type=int, default=8000, help="Port to bind to")
+    parser.add_argument("--transport", choices=TRANSPORT_APPS, default="sse",
+                        help="MCP transport; streamable-http serves at /mcp and can run several workers")
+    parser.add_argument("--workers", type=int,
+                        help=f"Worker processes (default: 1 for sse, {DEFAULT_WORKERS} for streamable-http)")
     args = parser.parse_args()
     
+    # SSE sessions live in the worker process that opened them, so a second
+    # worker could receive the messages of a session it does not know
+    if args.workers is None:
+        args.workers = DEFAULT_WORKERS if args.transport == "streamable-http" else 1
+    elif args.workers > 1 and args.transport != "streamable-http":
+        parser.error("--workers greater than 1 requires --transport streamable-http")
+    
     # Configure logging
     log_level = logging.DEBUG if args.debug else logging.INFO
     logging.basicConfig(
@@ -29,9 +50,16 @@ def main():
     )
     
     
-    # Start the server
-    print(f"Starting Stock Agent MCP Server on {args.host}:{args.port}...")
-    uvicorn.run("src.mcp.stock_agent_mcp_server:mcp", host=args.host, port=args.port, reload=False)
+    # Start the server; each worker builds the app from the import string
+    print(f"Starting Stock Agent MCP Server on {args.host}:{args.port} ({args.transport}, {args.workers} worker(s))...")
+    uvicorn.run(
+        TRANSPORT_APPS[args.transport],
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        reload=False
+    )
 
 if __name__ == "__main__":
     main()
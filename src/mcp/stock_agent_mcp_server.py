@@ -4,34 +4,55 @@ MCP Server for Strands Stock Agent
 This server exposes the Strands stock agent functionality through MCP.
 """
 
+import asyncio
+import functools
 import os
 import sys
 import logging
-from typing import Dict, Any, Callable
+from typing import Dict, Any
 
 
 # Add the project root to the path so we can import our modules
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
 sys.path.append(project_root)
-# Import the Yahoo Finance client
-from src.utils.finance.yahoo_finance import yahoo_finance
 
 from mcp.server.fastmcp import FastMCP
 
-from src.agents.strands.stock_info_agent import stock_agent, stock_agent_streaming
+from src.agents.strands._rate_limit import run_limited
+from src.agents.strands.stock_info_agent import create_stock_agent
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create MCP server
-mcp = FastMCP('stock_agent')
+# Create MCP server. Streamable HTTP requests are handled statelessly, so any
+# worker process can serve any request.
+mcp = FastMCP('stock_agent', stateless_http=True)
 mcp.logger = logger
 
+# Agent calls in progress, by query. Identical questions asked while one is being
+# answered share that answer instead of making another model call.
+_in_flight: Dict[str, "asyncio.Future"] = {}
+
+
+async def _ask_shared(query: str):
+    """Ask the stock agent a query, joining the call already in progress for the same query."""
+    key = query.strip()
+    task = _in_flight.get(key)
+    if task is None:
+        # Run the blocking agent call in a worker thread, so the event loop keeps
+        # serving other requests while the model responds. Calls run concurrently,
+        # so each gets its own agent rather than sharing one conversation.
+        task = asyncio.ensure_future(run_limited(functools.partial(create_stock_agent(), query, streaming=False)))
+        _in_flight[key] = task
+        task.add_done_callback(lambda _: _in_flight.pop(key, None))
+    # A cancelled request must not cancel the call the other requests are waiting for
+    return await asyncio.shield(task)
+
 
 #only for sync queries
 @mcp.tool(description= "Ask the stock agent a question about stocks, markets, or financial analysis.")
-def ask_stock_agent(query: str) -> Dict[str, Any]:
+async def ask_stock_agent(query: str) -> Dict[str, Any]:
     """
     Ask the stock agent a question about stocks, markets, or financial analysis.
     
@@ -41,11 +62,11 @@ def ask_stock_agent(query: str) -> Dict[str, Any]:
     Returns:
         dict: Response from the stock agent
     """
-    mcp.logger.info(f"Asking stock agent: {query}")
+    mcp.logger.info("Asking stock agent: %s", query)
     
     # Call the stock agent with the query
     try:
-        response = stock_agent(query,streaming=False)
+        response = await _ask_shared(query)
             
         # Return the response in a structured format
         if hasattr(response, 'message') and isinstance(response.message, str):
@@ -64,7 +85,7 @@ def ask_stock_agent(query: str) -> Dict[str, Any]:
                 }
             }
     except Exception as e:
-        logger.error(f"Error in ask_stock_agent: {str(e)}")
+        logger.error("Error in ask_stock_agent: %s", e)
         return {
             "error": str(e),
             "metadata": {
@@ -1,42 +1,21 @@
-from mcp import stdio_client, StdioServerParameters
 from mcp.client.sse import sse_client
 from strands import Agent
 from strands.tools.mcp import MCPClient
-from strands.models import BedrockModel
-from strands.models.anthropic import AnthropicModel
-import os, dotenv
+import os, sys
 # Add the project root to the path so we can import our modules
-config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../../config/.env')
-dotenv.load_dotenv(config_path)
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.append(project_root)
+
+from src.agents.strands._config import load_config
+from src.agents.strands._model_providers import get_anthropic_model
 
-region = os.environ.get('BEDROCK_REGION', 'us-east-1')        
-# Get model ID from environment variables or use default
-model= os.environ.get('BEDROCK_MODEL', 'us.amazon.nova-pro-v1:0')
-ant_model=os.environ.get('ANTHROPIC_MODEL', 'claude-3-7-sonnet-20250219')                      
-print('model:%s',model)
-print('ant_model:%s', ant_model)
-bedrock_model=BedrockModel(
-    region_name=region,
-    max_tokens=1028,
-    model_id=model,
-    params={
-        "temperature": 0.7,
-    }
-)
-key = os.getenv('ANTHROPIC_API_KEY')
-anthropic_model = AnthropicModel(
-    client_args={
-        "api_key": key,
-    },
-    # **model_config
-    max_tokens=1028,
-    model_id=ant_model,
-    params={
-        "temperature": 0.7,
-    }
-)
 # Use both servers together
 def main():
+    config = load_config()
+    if config["debug"]:
+        print('ant_model:%s', config["anthropic_model"])
+    anthropic_model = get_anthropic_model(config["anthropic_model"], 1028, 0.7)
+
     # Connect to multiple MCP servers
     sse_mcp_client = MCPClient(lambda: sse_client("http://127.0.0.1:8000/sse"))
     with sse_mcp_client:
@@ -50,4 +29,4 @@ def main():
         agent('can you give me a stock market overview ?',streaming=False)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -8,12 +8,16 @@ attributes, location, format, and descriptions.
 Updated to match actual CSV files in the docs folder.
 """
 
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from types import MappingProxyType
 from typing import Dict, List, Optional, Any
 from strands import tool
 
 
 # Data catalog with metadata for data products based on actual CSV files in docs folder
-DATA_CATALOG = {
+_DATA_CATALOG = {
     "swiss_power_plants": {
         "name": "Swiss Renewable Power Plants Registry",
         "description": "Comprehensive list of renewable power generation facilities in Switzerland, including detailed information about capacity, location, technology, and operational details",
@@ -74,6 +78,154 @@ DATA_CATALOG = {
     }
 }
 
+# Read-only view of the catalog; the catalog is static, so everything derived
+# from it below is computed once at import
+DATA_CATALOG = MappingProxyType(_DATA_CATALOG)
+
+_PRODUCT_IDS = tuple(DATA_CATALOG)
+
+# Lowercased text matched by search_data_catalog queries, per data product
+_SEARCH_CORPUS = {
+    product_id: "\n".join((metadata["name"], metadata["description"], product_id)).lower()
+    for product_id, metadata in DATA_CATALOG.items()
+}
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def _tokenize(text: str) -> List[str]:
+    """Split lowercased text into alphanumeric search tokens."""
+    return _TOKEN_PATTERN.findall(text)
+
+
+def _build_token_index() -> Dict[str, set]:
+    """Map each search token to the data products whose search text contains it."""
+    index = defaultdict(set)
+    for product_id, text in _SEARCH_CORPUS.items():
+        for token in _tokenize(text):
+            index[token].add(product_id)
+    return dict(index)
+
+
+_TOKEN_INDEX = _build_token_index()
+
+# Indexed tokens in sorted order, so all tokens sharing a prefix are adjacent
+_SORTED_TOKENS = tuple(sorted(_TOKEN_INDEX))
+
+# Shorter queries match too much by prefix and use the substring match instead
+_MIN_PREFIX_QUERY = 2
+
+
+def _products_with_prefix(prefix: str) -> set:
+    """Find the data products containing a token that starts with prefix."""
+    products = set()
+    for position in range(bisect_left(_SORTED_TOKENS, prefix), len(_SORTED_TOKENS)):
+        token = _SORTED_TOKENS[position]
+        if not token.startswith(prefix):
+            break
+        products |= _TOKEN_INDEX[token]
+    return products
+
+
+def _match_products(query_lower: str) -> List[str]:
+    """
+    Find the data products matching a lowercased query.
+    
+    Each word of the query matches the products containing a word that starts
+    with it, and a product must match every word. Queries with a word that
+    starts no indexed word (such as a fragment from the middle of a word), and
+    very short queries, fall back to a substring match on the name,
+    description and ID.
+    """
+    tokens = _tokenize(query_lower)
+    if tokens and len(query_lower.strip()) >= _MIN_PREFIX_QUERY:
+        candidates = [_products_with_prefix(token) for token in tokens]
+        if all(candidates):
+            matches = set.intersection(*candidates)
+            return [product_id for product_id in _PRODUCT_IDS if product_id in matches]
+    return [product_id for product_id, text in _SEARCH_CORPUS.items() if query_lower in text]
+
+
+def _build_metadata_response(data_product_id: str) -> Dict[str, Any]:
+    """Build the search_data_catalog response for a data product ID."""
+    return {
+        "status": "success",
+        "data_product_id": data_product_id,
+        "metadata": DATA_CATALOG[data_product_id],
+        "message": f"Retrieved metadata for data product: {data_product_id}"
+    }
+
+
+def _build_all_products_response() -> Dict[str, Any]:
+    """Build the search_data_catalog response for a call without query or ID."""
+    return {
+        "status": "success",
+        "all_products": dict(DATA_CATALOG),
+        "total_products": len(DATA_CATALOG),
+        "message": "Retrieved all available data products from catalog"
+    }
+
+
+def _build_products_list_response() -> Dict[str, Any]:
+    """Build the list_data_products response."""
+    products_summary = {
+        product_id: {
+            "name": metadata["name"],
+            "description": metadata["description"][:100] + "..." if len(metadata["description"]) > 100 else metadata["description"],
+            "format": metadata["format"],
+            "record_count": metadata["record_count"],
+            "last_updated": metadata["last_updated"]
+        }
+        for product_id, metadata in DATA_CATALOG.items()
+    }
+    return {
+        "status": "success",
+        "products": products_summary,
+        "total_products": len(products_summary),
+        "message": f"Listed {len(products_summary)} available data products"
+    }
+
+
+def _build_attributes_response(data_product_id: str) -> Dict[str, Any]:
+    """Build the get_data_product_attributes response for a data product."""
+    metadata = DATA_CATALOG[data_product_id]
+    return {
+        "status": "success",
+        "data_product_id": data_product_id,
+        "data_product_name": metadata["name"],
+        "attributes": metadata["attributes"],
+        "attribute_count": len(metadata["attributes"]),
+        "format": metadata["format"],
+        "location": metadata["location"],
+        "message": f"Retrieved {len(metadata['attributes'])} attributes for {metadata['name']}"
+    }
+
+
+def _build_location_response(data_product_id: str) -> Dict[str, Any]:
+    """Build the get_data_product_location response for a data product."""
+    metadata = DATA_CATALOG[data_product_id]
+    return {
+        "status": "success",
+        "data_product_id": data_product_id,
+        "data_product_name": metadata["name"],
+        "location": metadata["location"],
+        "format": metadata["format"],
+        "data_owner": metadata["data_owner"],
+        "last_updated": metadata["last_updated"],
+        "update_frequency": metadata["update_frequency"],
+        "record_count": metadata["record_count"],
+        "message": f"Retrieved location information for {metadata['name']}"
+    }
+
+
+# Responses of the tools that only describe the static catalog, built once and
+# returned as is on every call; they must not be modified
+_ALL_PRODUCTS_RESPONSE = _build_all_products_response()
+_METADATA_RESPONSES = {product_id: _build_metadata_response(product_id) for product_id in _PRODUCT_IDS}
+_PRODUCTS_LIST_RESPONSE = _build_products_list_response()
+_ATTRIBUTES_RESPONSES = {product_id: _build_attributes_response(product_id) for product_id in _PRODUCT_IDS}
+_LOCATION_RESPONSES = {product_id: _build_location_response(product_id) for product_id in _PRODUCT_IDS}
+
 
 @tool
 def search_data_catalog(query: Optional[str] = None, data_product_id: Optional[str] = None) -> Dict[str, Any]:
@@ -90,30 +242,21 @@ def search_data_catalog(query: Optional[str] = None, data_product_id: Optional[s
     if data_product_id:
         # Return specific data product if it exists
         if data_product_id in DATA_CATALOG:
-            return {
-                "status": "success",
-                "data_product_id": data_product_id,
-                "metadata": DATA_CATALOG[data_product_id],
-                "message": f"Retrieved metadata for data product: {data_product_id}"
-            }
+            return _METADATA_RESPONSES[data_product_id]
         else:
             return {
                 "status": "error",
                 "message": f"Data product '{data_product_id}' not found in catalog",
-                "available_products": list(DATA_CATALOG.keys())
+                "available_products": list(_PRODUCT_IDS)
             }
     
     # Search functionality
     if query:
-        query_lower = query.lower()
-        matching_products = {}
-        
-        for product_id, metadata in DATA_CATALOG.items():
-            # Search in name and description
-            if (query_lower in metadata["name"].lower() or 
-                query_lower in metadata["description"].lower() or
-                query_lower in product_id.lower()):
-                matching_products[product_id] = metadata
+        # Search in name, description and ID
+        matching_products = {
+            product_id: DATA_CATALOG[product_id]
+            for product_id in _match_products(query.lower())
+        }
         
         return {
             "status": "success",
@@ -124,12 +267,7 @@ def search_data_catalog(query: Optional[str] = None, data_product_id: Optional[s
         }
     
     # Return all products if no specific query
-    return {
-        "status": "success",
-        "all_products": DATA_CATALOG,
-        "total_products": len(DATA_CATALOG),
-        "message": "Retrieved all available data products from catalog"
-    }
+    return _ALL_PRODUCTS_RESPONSE
 
 
 @tool
@@ -147,21 +285,10 @@ def get_data_product_attributes(data_product_id: str) -> Dict[str, Any]:
         return {
             "status": "error",
             "message": f"Data product '{data_product_id}' not found in catalog",
-            "available_products": list(DATA_CATALOG.keys())
+            "available_products": list(_PRODUCT_IDS)
         }
     
-    metadata = DATA_CATALOG[data_product_id]
-    
-    return {
-        "status": "success",
-        "data_product_id": data_product_id,
-        "data_product_name": metadata["name"],
-        "attributes": metadata["attributes"],
-        "attribute_count": len(metadata["attributes"]),
-        "format": metadata["format"],
-        "location": metadata["location"],
-        "message": f"Retrieved {len(metadata['attributes'])} attributes for {metadata['name']}"
-    }
+    return _ATTRIBUTES_RESPONSES[data_product_id]
 
 
 @tool
@@ -172,23 +299,7 @@ def list_data_products() -> Dict[str, Any]:
         Dictionary containing summary of all data products
     """
     
-    products_summary = {}
-    
-    for product_id, metadata in DATA_CATALOG.items():
-        products_summary[product_id] = {
-            "name": metadata["name"],
-            "description": metadata["description"][:100] + "..." if len(metadata["description"]) > 100 else metadata["description"],
-            "format": metadata["format"],
-            "record_count": metadata["record_count"],
-            "last_updated": metadata["last_updated"]
-        }
-    
-    return {
-        "status": "success",
-        "products": products_summary,
-        "total_products": len(products_summary),
-        "message": f"Listed {len(products_summary)} available data products"
-    }
+    return _PRODUCTS_LIST_RESPONSE
 
 
 @tool
@@ -206,20 +317,7 @@ def get_data_product_location(data_product_id: str) -> Dict[str, Any]:
         return {
             "status": "error",
             "message": f"Data product '{data_product_id}' not found in catalog",
-            "available_products": list(DATA_CATALOG.keys())
+            "available_products": list(_PRODUCT_IDS)
         }
     
-    metadata = DATA_CATALOG[data_product_id]
-    
-    return {
-        "status": "success",
-        "data_product_id": data_product_id,
-        "data_product_name": metadata["name"],
-        "location": metadata["location"],
-        "format": metadata["format"],
-        "data_owner": metadata["data_owner"],
-        "last_updated": metadata["last_updated"],
-        "update_frequency": metadata["update_frequency"],
-        "record_count": metadata["record_count"],
-        "message": f"Retrieved location information for {metadata['name']}"
-    }
+    return _LOCATION_RESPONSES[data_product_id]
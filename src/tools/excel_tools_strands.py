@@ -1,13 +1,230 @@
 from strands import tool
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
+import hashlib
+import json
 import os
 import sys
 
+try:
+    import pyarrow  # noqa: F401
+except ImportError:
+    pyarrow = None
+
 # Add the project root to the path so we can import our agents
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
+
+def _excel_engine() -> Optional[str]:
+    """Pick the fastest available Excel reader: calamine if installed, else pandas' default."""
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return None
+    # pandas supports the calamine engine from 2.2
+    major, minor = (int(part) for part in pd.__version__.split('.')[:2])
+    return "calamine" if (major, minor) >= (2, 2) else None
+
+
+# Engine used to read Excel files; calamine parses .xlsx and .xls in Rust, much faster
+# than openpyxl/xlrd. None lets pandas choose by file extension.
+EXCEL_ENGINE = _excel_engine()
+
+# Parser for full CSV reads. Set CSV_ENGINE=pyarrow to use Arrow's multithreaded
+# parser (requires pyarrow); reads limited to max_rows always use pandas' C parser,
+# since the pyarrow engine cannot stop early.
+CSV_ENGINE = os.environ.get("CSV_ENGINE", "c")
+
+# Directory for Parquet copies of fully read Excel sheets. Reading the copy is much
+# faster than parsing the workbook again; it needs pyarrow and is keyed by the
+# workbook's path, modification time and size, so a changed workbook is re-read.
+EXCEL_CACHE_DIR = os.path.expanduser(os.environ.get("EXCEL_CACHE_DIR", "~/.cache/excel_mcp"))
+
+# How read_excel_file and read_csv_file read a file: "metadata" parses only the
+# header (column names and row count), "sample" parses at most SAMPLE_ROWS rows
+# unless max_rows says otherwise, and "full" parses every row
+READ_MODES = ("metadata", "sample", "full")
+SAMPLE_ROWS = 100
+
+# Buffer size for counting the lines of a CSV file
+_LINE_COUNT_BUFFER = 1 << 20
+
+
+def _count_sheet_rows(excel_file: pd.ExcelFile, sheet_name: str) -> Optional[int]:
+    """
+    Count the data rows of an Excel sheet from the workbook's dimension record.
+    
+    The cells are not parsed, so this is cheap even for large sheets. The
+    workbook pandas already opened is used when its reader exposes the sheet
+    size (openpyxl, xlrd). Returns None when the count is not available (not
+    an .xlsx file, openpyxl missing, or no dimension record).
+    """
+    book = excel_file.book
+    if hasattr(book, 'sheet_by_name'):
+        # xlrd, for .xls files
+        max_row = book.sheet_by_name(sheet_name).nrows
+    elif hasattr(book, 'sheetnames'):
+        # openpyxl, opened by pandas in read-only mode
+        max_row = book[sheet_name].max_row
+    else:
+        # Other readers (calamine) do not expose the dimension record
+        file_path = excel_file.io
+        if not isinstance(file_path, str) or not file_path.lower().endswith(('.xlsx', '.xlsm')):
+            return None
+        try:
+            import openpyxl
+        except ImportError:
+            return None
+        workbook = openpyxl.load_workbook(file_path, read_only=True)
+        try:
+            max_row = workbook[sheet_name].max_row
+        finally:
+            workbook.close()
+    # The first row holds the column headers
+    return max_row - 1 if max_row else None
+
+
+def list_excel_sheets(file_path: str) -> List[str]:
+    """
+    List the sheet names of an Excel file from the workbook metadata.
+    
+    No cells are parsed: the names are read with calamine when it is installed,
+    with openpyxl in read-only mode for .xlsx files, and through pandas otherwise.
+    """
+    if EXCEL_ENGINE == "calamine":
+        from python_calamine import CalamineWorkbook
+        return CalamineWorkbook.from_path(file_path).sheet_names
+    if file_path.lower().endswith(('.xlsx', '.xlsm')):
+        from openpyxl import load_workbook
+        workbook = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+        try:
+            return workbook.sheetnames
+        finally:
+            workbook.close()
+    with pd.ExcelFile(file_path) as excel_file:
+        return excel_file.sheet_names
+
+
+def _rows_to_read(mode: str, max_rows: Optional[int]) -> Optional[int]:
+    """Return how many rows to parse for a read mode, or None for all rows."""
+    if mode not in READ_MODES:
+        raise ValueError(f"Unknown mode '{mode}', expected one of: {', '.join(READ_MODES)}")
+    if mode == "metadata":
+        return 0
+    if mode == "sample" and max_rows is None:
+        return SAMPLE_ROWS
+    return max_rows
+
+
+def _column_filter(columns: Optional[List[str]]):
+    """
+    Build a pandas usecols filter for the given column names, or None for all columns.
+    
+    A callable is used rather than the list, so names that do not exist are
+    skipped instead of failing the read.
+    """
+    if columns is None:
+        return None
+    wanted = frozenset(columns)
+    return lambda column: column in wanted
+
+
+def _sheet_cache_path(file_path: str, sheet_name: Optional[str]) -> Optional[str]:
+    """Return the cache path (without extension) for a sheet of this version of a workbook, or None without pyarrow."""
+    if pyarrow is None:
+        return None
+    stat = os.stat(file_path)
+    key = f"{os.path.abspath(file_path)}\0{stat.st_mtime_ns}\0{stat.st_size}\0{sheet_name or ''}"
+    return os.path.join(EXCEL_CACHE_DIR, hashlib.blake2b(key.encode(), digest_size=16).hexdigest())
+
+
+def _read_sheet_cache(cache_path: Optional[str], max_rows: Optional[int],
+                      columns: Optional[List[str]] = None) -> Optional[Tuple[pd.DataFrame, Dict[str, Any]]]:
+    """
+    Read a sheet from its Parquet copy.
+    
+    Returns the sheet data (limited to max_rows and to the given columns that
+    exist) and the sidecar holding the sheet name, all sheet names and the total
+    row count, or None if there is no copy.
+    """
+    # The sidecar is written last, so it only exists once the copy is complete
+    if cache_path is None or not os.path.exists(cache_path + ".json"):
+        return None
+    with open(cache_path + ".json", encoding="utf-8") as f:
+        sidecar = json.load(f)
+    if columns is not None:
+        # Parquet is columnar, so only the requested columns are read
+        import pyarrow.parquet
+        columns = [name for name in pyarrow.parquet.read_schema(cache_path + ".parquet").names if name in columns]
+    df = pd.read_parquet(cache_path + ".parquet", columns=columns)
+    if max_rows is not None:
+        df = df.head(max_rows)
+    return df, sidecar
+
+
+def _write_sheet_cache(cache_path: Optional[str], df: pd.DataFrame, sheet_name: str, all_sheets: List[str]) -> None:
+    """Save a fully read sheet as Parquet, with a JSON sidecar for its metadata."""
+    if cache_path is None:
+        return
+    # Write to temporary files and rename them, so readers never see a partial copy
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(EXCEL_CACHE_DIR, exist_ok=True)
+        df.to_parquet(temp_path, compression="zstd")
+        os.replace(temp_path, cache_path + ".parquet")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"sheet_name": sheet_name, "all_sheets": all_sheets, "total_rows": len(df)}, f)
+        os.replace(temp_path, cache_path + ".json")
+    except Exception as e:
+        # Columns that Parquet cannot store (e.g. mixed types) just skip the cache
+        print(f"Warning: Could not cache sheet '{sheet_name}' of {os.path.basename(cache_path)}: {e}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _count_csv_rows(file_path: str) -> int:
+    """Count the data rows of a CSV file from its line breaks, without parsing it."""
+    lines = 0
+    last = b"\n"
+    with open(file_path, "rb") as f:
+        while chunk := f.read(_LINE_COUNT_BUFFER):
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    # A last line without a line break still counts; the first line holds the headers
+    if last != b"\n":
+        lines += 1
+    return max(lines - 1, 0)
+
+def describe_columns(df: pd.DataFrame) -> tuple:
+    """
+    Describe the columns of a DataFrame.
+    
+    Args:
+        df: The data to describe
+        
+    Returns:
+        tuple: (columns_info, statistics) where columns_info lists the name, type,
+               unique and missing value counts of each column, and statistics maps
+               each numeric column to its describe() summary
+    """
+    # Get basic statistics
+    numeric_columns = df.select_dtypes(include=[np.number]).columns.tolist()
+    stats = {}
+    if numeric_columns:
+        stats = df[numeric_columns].describe().to_dict()
+    
+    # Get column information, counting unique and missing values for all columns at once
+    unique_values = df.nunique().tolist()
+    missing_values = df.isna().sum().tolist()
+    columns_info = [{
+        "name": col,
+        "type": str(dtype),
+        "unique_values": int(unique),
+        "missing_values": int(missing)
+    } for col, dtype, unique, missing in zip(df.columns, df.dtypes, unique_values, missing_values)]
+    return columns_info, stats
+
 # Import the excel agent (lazy import to avoid circular dependencies)
 def get_excel_agent():
     """Lazy import of excel agent to avoid circular dependencies."""
@@ -20,63 +237,81 @@ def get_excel_agent():
 
 
 @tool
-def read_excel_file(file_path: str, sheet_name: Optional[str] = None) -> Dict[str, Any]:
+def read_excel_file(file_path: str, sheet_name: Optional[str] = None, max_rows: Optional[int] = None,
+                    columns: Optional[List[str]] = None, mode: str = "full") -> Dict[str, Any]:
     """
     Read an Excel file and return its contents as a dictionary.
     
     Args:
         file_path: Path to the Excel file
         sheet_name: Optional name of the sheet to read. If None, reads the first sheet.
+        max_rows: Optional maximum number of rows to read. Column information and
+            statistics then describe only the rows read.
+        columns: Optional names of the columns to read. Other columns are skipped,
+            and names that do not exist are ignored.
+        mode: "full" (default) reads every row, "sample" reads the first 100 rows
+            unless max_rows is given, and "metadata" reads only the sheet names,
+            column names and row count, without statistics or data sample.
         
     Returns:
-        dict: Dictionary containing the Excel data and metadata
+        dict: Dictionary containing the Excel data and metadata. data_sample maps
+              each column name to its values in the first 100 rows.
     """
     try:
-        # Read the Excel file
-        if sheet_name:
-            df = pd.read_excel(file_path, sheet_name=sheet_name)
+        max_rows = _rows_to_read(mode, max_rows)
+        
+        # Use the Parquet copy of the sheet if it was read in full before
+        cache_path = _sheet_cache_path(file_path, sheet_name)
+        cached = _read_sheet_cache(cache_path, max_rows, columns)
+        if cached is not None:
+            df, sidecar = cached
+            sheet_name, all_sheets, total_rows = sidecar["sheet_name"], sidecar["all_sheets"], sidecar["total_rows"]
         else:
-            # Get all sheets
-            excel_file = pd.ExcelFile(file_path)
-            sheet_names = excel_file.sheet_names
-            
-            if not sheet_names:
-                return {"error": "No sheets found in the Excel file"}
-            
-            # Read the first sheet by default
-            df = pd.read_excel(file_path, sheet_name=sheet_names[0])
+            # Open the workbook once, for the sheet names and the sheet data
+            with pd.ExcelFile(file_path, engine=EXCEL_ENGINE) as excel_file:
+                all_sheets = excel_file.sheet_names
+                
+                if not all_sheets:
+                    return {"error": "No sheets found in the Excel file"}
+                
+                # Read the first sheet by default
+                sheet_name = sheet_name if sheet_name else all_sheets[0]
+                # The openpyxl reader resets the sheet size while parsing, so for a limited
+                # read take the sheet's row count from it first
+                count_first = max_rows is not None and hasattr(excel_file.book, 'sheetnames')
+                sheet_rows = _count_sheet_rows(excel_file, sheet_name) if count_first else None
+                df = excel_file.parse(sheet_name, nrows=max_rows, usecols=_column_filter(columns))
+                
+                # When the read stopped at max_rows, count the sheet's rows without parsing them
+                total_rows = len(df)
+                truncated = max_rows is not None and total_rows >= max_rows
+                if truncated:
+                    total_rows = sheet_rows if count_first else _count_sheet_rows(excel_file, sheet_name)
             
-        # Get basic statistics
-        numeric_columns = df.select_dtypes(include=[np.number]).columns.tolist()
-        stats = {}
-        if numeric_columns:
-            stats = df[numeric_columns].describe().to_dict()
-        
-        # Get column information
-        columns_info = []
-        for col in df.columns:
-            col_type = str(df[col].dtype)
-            unique_values = df[col].nunique()
-            missing_values = df[col].isna().sum()
-            
-            columns_info.append({
-                "name": col,
-                "type": col_type,
-                "unique_values": int(unique_values),
-                "missing_values": int(missing_values)
-            })
+            if not truncated and columns is None:
+                # The whole sheet was read
+                _write_sheet_cache(cache_path, df, sheet_name, all_sheets)
         
-        # Convert DataFrame to dictionary for the first 100 rows (to avoid overwhelming the model)
-        data_sample = df.head(100).to_dict(orient='records')
+        if mode == "metadata":
+            return {
+                "file_path": file_path,
+                "sheet_name": sheet_name,
+                "all_sheets": all_sheets,
+                "total_rows": total_rows,
+                "total_columns": len(df.columns),
+                "column_names": df.columns.tolist()
+            }
+            
+        columns_info, stats = describe_columns(df)
         
-        # Get all sheet names
-        all_sheets = pd.ExcelFile(file_path).sheet_names
+        # Sample the first SAMPLE_ROWS rows (to avoid overwhelming the model), column by column
+        data_sample = df.head(SAMPLE_ROWS).to_dict(orient='list')
         
         return {
             "file_path": file_path,
-            "sheet_name": sheet_name if sheet_name else all_sheets[0],
+            "sheet_name": sheet_name,
             "all_sheets": all_sheets,
-            "total_rows": len(df),
+            "total_rows": total_rows,
             "total_columns": len(df.columns),
             "columns": columns_info,
             "statistics": stats,
@@ -88,7 +323,8 @@ def read_excel_file(file_path: str, sheet_name: Optional[str] = None) -> Dict[st
 
 
 @tool
-def read_csv_file(file_path: str, delimiter: str = ',', encoding: str = 'utf-8') -> Dict[str, Any]:
+def read_csv_file(file_path: str, delimiter: str = ',', encoding: str = 'utf-8', max_rows: Optional[int] = None,
+                  columns: Optional[List[str]] = None, mode: str = "full") -> Dict[str, Any]:
     """
     Read a CSV file and return its contents as a dictionary.
     
@@ -96,42 +332,53 @@ def read_csv_file(file_path: str, delimiter: str = ',', encoding: str = 'utf-8')
         file_path: Path to the CSV file
         delimiter: The delimiter used in the CSV file (default: ',')
         encoding: The encoding of the CSV file (default: 'utf-8')
+        max_rows: Optional maximum number of rows to read. Column information and
+            statistics then describe only the rows read.
+        columns: Optional names of the columns to read. Other columns are skipped,
+            and names that do not exist are ignored.
+        mode: "full" (default) reads every row, "sample" reads the first 100 rows
+            unless max_rows is given, and "metadata" reads only the column names
+            and row count, without statistics or data sample.
         
     Returns:
-        dict: Dictionary containing the CSV data and metadata
+        dict: Dictionary containing the CSV data and metadata. data_sample maps
+              each column name to its values in the first 100 rows.
     """
     try:
+        max_rows = _rows_to_read(mode, max_rows)
+        
         # Read the CSV file
-        df = pd.read_csv(file_path, delimiter=delimiter, encoding=encoding)
-        
-        # Get basic statistics
-        numeric_columns = df.select_dtypes(include=[np.number]).columns.tolist()
-        stats = {}
-        if numeric_columns:
-            stats = df[numeric_columns].describe().to_dict()
-        
-        # Get column information
-        columns_info = []
-        for col in df.columns:
-            col_type = str(df[col].dtype)
-            unique_values = df[col].nunique()
-            missing_values = df[col].isna().sum()
-            
-            columns_info.append({
-                "name": col,
-                "type": col_type,
-                "unique_values": int(unique_values),
-                "missing_values": int(missing_values)
-            })
+        if max_rows is None and columns is None:
+            df = pd.read_csv(file_path, delimiter=delimiter, encoding=encoding, engine=CSV_ENGINE)
+        else:
+            df = pd.read_csv(file_path, delimiter=delimiter, encoding=encoding, nrows=max_rows,
+                             usecols=_column_filter(columns))
+        
+        # When the read stopped at max_rows, count the file's rows without parsing them
+        total_rows = len(df)
+        if max_rows is not None and total_rows >= max_rows:
+            total_rows = _count_csv_rows(file_path)
+        
+        if mode == "metadata":
+            return {
+                "file_path": file_path,
+                "delimiter": delimiter,
+                "encoding": encoding,
+                "total_rows": total_rows,
+                "total_columns": len(df.columns),
+                "column_names": df.columns.tolist()
+            }
+        
+        columns_info, stats = describe_columns(df)
         
-        # Convert DataFrame to dictionary for the first 100 rows (to avoid overwhelming the model)
-        data_sample = df.head(100).to_dict(orient='records')
+        # Sample the first SAMPLE_ROWS rows (to avoid overwhelming the model), column by column
+        data_sample = df.head(SAMPLE_ROWS).to_dict(orient='list')
         
         return {
             "file_path": file_path,
             "delimiter": delimiter,
             "encoding": encoding,
-            "total_rows": len(df),
+            "total_rows": total_rows,
             "total_columns": len(df.columns),
             "columns": columns_info,
             "statistics": stats,
@@ -59,20 +59,21 @@ def display_chat_message(message, is_user=False):
         st.chat_message("assistant").write(message)
 
 def process_user_message(user_message):
-    """Process a user message and update the chat."""
+    """Process a user message and stream the agent's reply into the chat."""
     if not user_message:
         return
     
     # Add user message to chat history
     st.session_state.messages.append({"role": "user", "content": user_message})
+    display_chat_message(user_message, is_user=True)
     
     # Set processing flag
     st.session_state.processing = True
     
     try:
-        # Process the message with the agent
-        with st.spinner("Thinking..."):
-            response = st.session_state.agent.process_message(user_message)
+        # Show the reply as it is generated
+        with st.chat_message("assistant"):
+            response = st.write_stream(st.session_state.agent.stream_message(user_message))
         
         # Add agent response to chat history
         st.session_state.messages.append({"role": "assistant", "content": response})
@@ -80,6 +81,7 @@ def process_user_message(user_message):
         # Handle errors
         error_message = f"Error: {str(e)}"
         st.session_state.messages.append({"role": "assistant", "content": error_message})
+        display_chat_message(error_message)
     
     # Clear processing flag
     st.session_state.processing = False
@@ -146,19 +148,20 @@ def main():
         
         st.divider()
         
-        # Quick actions
+        # Quick actions; their messages are answered in the chat below
         st.subheader("Quick Actions")
+        quick_message = None
         
         if st.button("Get Market Summary"):
-            process_user_message("Give me a summary of the current market conditions")
+            quick_message = "Give me a summary of the current market conditions"
         
         ticker = st.text_input("Stock Ticker")
         if ticker and st.button("Get Stock Info"):
-            process_user_message(f"Tell me about {ticker} stock")
+            quick_message = f"Tell me about {ticker} stock"
         
         tickers = st.text_input("Compare Stocks (comma-separated)")
         if tickers and st.button("Compare"):
-            process_user_message(f"Compare these stocks: {tickers}")
+            quick_message = f"Compare these stocks: {tickers}"
         
         st.divider()
         
@@ -178,6 +181,10 @@ def main():
     for message in st.session_state.messages:
         display_chat_message(message["content"], message["role"] == "user")
     
+    # Answer a quick action below the existing messages
+    if quick_message:
+        process_user_message(quick_message)
+    
     # Chat input
     if st.session_state.processing:
         st.text_input("Your message", "", disabled=True)
@@ -11,10 +11,10 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 
 # Import our Strands agents
 try:
-    from src.agents.strands.banking_onboarding_agent import orchestrate_onboarding
+    from src.agents.strands.banking_onboarding_agent import orchestrate_onboarding_sync
     from src.agents.strands.document_processing_agent import document_agent
     from src.agents.strands.stock_info_agent import stock_agent
-    from src.agents.strands.multi_agent_orchestrator import process_with_orchestration
+    from src.agents.strands.multi_agent_orchestrator import process_with_orchestration_sync
     from src.agents.strands.rag_agent import rag_agent
 except ImportError:
     st.error("Failed to import agent modules. Make sure all required files exist and dependencies are installed.")
@@ -100,12 +100,12 @@ if user_input:
     with st.spinner("Thinking..."):
         try:
             if st.session_state.current_agent == "orchestrator":
-                response = process_with_orchestration(user_input, st.session_state.session_id)
+                response = process_with_orchestration_sync(user_input, st.session_state.session_id)
                 agent_name = response["agent"]
                 message = response["response"]
                 avatar = "🧠"
             elif st.session_state.current_agent == "banking":
-                response = orchestrate_onboarding(user_input, st.session_state.user_id, st.session_state.session_id, st.session_state.chat_history)
+                response = orchestrate_onboarding_sync(user_input, st.session_state.user_id, st.session_state.session_id, st.session_state.chat_history)
                 agent_name = response["agent"]
                 message = response["response"]
                 avatar = "🏦"
@@ -353,9 +353,10 @@ def get_stock_summary(ticker: str):
     with st.spinner(f"Fetching information for {ticker}..."):
         try:
             # Also get raw stock data for display first (while the AI is thinking)
-            stock_info = yahoo_finance.get_stock_info(ticker)
-            historical_data = yahoo_finance.get_historical_data(ticker, period='1mo', interval='1d')
-            news = yahoo_finance.get_company_news(ticker, limit=3)
+            overview = yahoo_finance.get_stock_overview(ticker, period='1mo', interval='1d', news_limit=3)
+            stock_info = overview['stock_info']
+            historical_data = overview['historical_data']
+            news = overview['news']
             
             # Define callback function for streaming
             def update_response(chunk):
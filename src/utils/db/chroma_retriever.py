@@ -10,13 +10,33 @@ from agent_squad.retrievers import Retriever
 from typing import Any, List, Dict, Optional, Union
 import chromadb
 from chromadb.config import Settings
+from chromadb.utils import embedding_functions
 import asyncio
+import functools
 from chromadb.api.types import QueryResult
 import logging
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+
+@functools.lru_cache(maxsize=1)
+def get_default_embedding_function():
+    """
+    Get a shared, pre-warmed instance of ChromaDB's default embedding function.
+    
+    The default function runs all-MiniLM-L6-v2 (384 dimensions) through ONNX, which
+    is the model used to build collections created without an explicit embedding
+    function. Loading it is slow, so it is done once and warmed up with a dummy
+    input to keep the cost off the first user query.
+    
+    Returns:
+        The shared embedding function
+    """
+    embedding_function = embedding_functions.DefaultEmbeddingFunction()
+    embedding_function(["warmup"])
+    return embedding_function
+
 @dataclass
 class ChromaDBRetrieverOptions:
     """
@@ -28,12 +48,15 @@ class ChromaDBRetrieverOptions:
         n_results (int, optional): Maximum number of results to return. Defaults to 5.
         similarity_threshold (float, optional): Minimum similarity score (0-1) for results. Defaults to 0.7.
         client_settings (dict, optional): Additional settings for ChromaDB client
+        embedding_function (callable, optional): Embedding function used to embed queries.
+            Defaults to the collection's embedding function.
     """
     persist_directory: str
     collection_name: str
     n_results: Optional[int] = 5
     similarity_threshold: Optional[float] = 0.7
     client_settings: Optional[Dict[str, Any]] = None
+    embedding_function: Optional[Any] = None
 
 
 class ChromaDBRetriever(Retriever):
@@ -78,7 +101,13 @@ class ChromaDBRetriever(Retriever):
             )
             
             # Get the collection
-            self.collection = self.client.get_collection(self.options.collection_name)
+            if self.options.embedding_function is not None:
+                self.collection = self.client.get_collection(
+                    self.options.collection_name,
+                    embedding_function=self.options.embedding_function
+                )
+            else:
+                self.collection = self.client.get_collection(self.options.collection_name)
             logger.info(f"Successfully connected to ChromaDB collection: {self.options.collection_name}")
         except Exception as e:
             logger.error(f"Failed to initialize ChromaDB client: {str(e)}")
@@ -0,0 +1,342 @@
+"""
+FAISS Retriever Module
+
+This module provides a retriever implementation backed by a FAISS index.
+For small collections (well under 100K vectors) an exact inner-product index
+has lower and more predictable query latency than ChromaDB's HNSW index.
+The index is built once from an existing ChromaDB collection, by default with
+8-bit scalar quantization, which stores each vector in a quarter of the memory
+of a float32 index while keeping top-5 recall essentially unchanged.
+"""
+
+from dataclasses import dataclass
+from agent_squad.retrievers import Retriever
+from typing import Any, List, Dict, Optional, Union, Tuple
+import asyncio
+import json
+import logging
+import os
+
+import faiss
+import numpy as np
+
+from src.utils.db.chroma_retriever import get_default_embedding_function
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FaissRetrieverOptions:
+    """
+    Configuration options for FAISS Retriever.
+
+    Attributes:
+        index_path (str): Path of the serialized FAISS index
+        metadata_path (str): Path of the JSON file holding the documents and their metadata
+        n_results (int, optional): Maximum number of results to return. Defaults to 5.
+        similarity_threshold (float, optional): Minimum similarity score (0-1) for results. Defaults to 0.7.
+        embedding_function (callable, optional): Embedding function used to embed queries.
+            Must match the model used to build the index. Defaults to ChromaDB's default embedder.
+    """
+    index_path: str
+    metadata_path: str
+    n_results: Optional[int] = 5
+    similarity_threshold: Optional[float] = 0.7
+    embedding_function: Optional[Any] = None
+
+
+def build_faiss_index_from_chroma(
+    persist_directory: str,
+    collection_name: str,
+    index_path: str,
+    metadata_path: str,
+    quantize: bool = True
+) -> int:
+    """
+    Export a ChromaDB collection into a FAISS index and a metadata file.
+
+    Vectors are L2-normalized so that inner product equals cosine similarity.
+    With quantize=True they are stored as int8 in an IndexScalarQuantizer,
+    otherwise as float32 in an IndexFlatIP.
+
+    Args:
+        persist_directory: Directory where ChromaDB stores its data
+        collection_name: Name of the ChromaDB collection to export
+        index_path: Where to write the FAISS index
+        metadata_path: Where to write the documents and metadata
+        quantize: Whether to store 8-bit quantized vectors
+
+    Returns:
+        int: Number of vectors written to the index
+    """
+    import chromadb
+
+    client = chromadb.PersistentClient(path=persist_directory)
+    collection = client.get_collection(collection_name)
+    data = collection.get(include=["embeddings", "documents", "metadatas"])
+
+    for path in (index_path, metadata_path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    vectors = np.asarray(data["embeddings"], dtype="float32")
+    faiss.normalize_L2(vectors)
+
+    dimension = vectors.shape[1]
+    if quantize:
+        index = faiss.IndexScalarQuantizer(dimension, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT)
+        index.train(vectors)
+    else:
+        index = faiss.IndexFlatIP(dimension)
+    index.add(vectors)
+    faiss.write_index(index, index_path)
+
+    with open(metadata_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "documents": data["documents"],
+            "metadatas": data["metadatas"]
+        }, f)
+
+    logger.info(f"Exported {index.ntotal} vectors from {collection_name} to {index_path}")
+    return index.ntotal
+
+
+class FaissRetriever(Retriever):
+    """
+    FAISS implementation of the Retriever abstract base class.
+
+    Performs cosine-similarity search over normalized embeddings (exact, or
+    over 8-bit quantized vectors) and returns results in the same format as
+    ChromaDBRetriever.
+    """
+    def __init__(self, options: FaissRetrieverOptions):
+        """
+        Initialize the FAISS retriever with configuration options.
+
+        Args:
+            options (FaissRetrieverOptions): Configuration options for the retriever
+
+        Raises:
+            ValueError: If required options are missing or invalid
+            RuntimeError: If the index cannot be read
+        """
+        super().__init__(options)
+
+        self.options = options
+
+        # Validate options
+        if not self.options.index_path:
+            raise ValueError("index_path must be provided")
+        if not self.options.metadata_path:
+            raise ValueError("metadata_path must be provided")
+        if self.options.n_results <= 0:
+            raise ValueError("n_results must be greater than 0")
+        if not (0 <= self.options.similarity_threshold <= 1):
+            raise ValueError("similarity_threshold must be between 0 and 1")
+
+        self.embedding_function = self.options.embedding_function or get_default_embedding_function()
+
+        try:
+            # Map the vectors of the uncompressed index file in place (faiss >= 1.7.3) so
+            # several workers share the same pages; older faiss reads it into memory
+            io_flags = getattr(faiss, "IO_FLAG_MMAP_IFC", 0)
+            self.index = faiss.read_index(self.options.index_path, io_flags)
+            with open(self.options.metadata_path, "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+            self.documents = metadata["documents"]
+            self.metadatas = metadata["metadatas"]
+            logger.info(f"Successfully loaded FAISS index with {self.index.ntotal} vectors: {self.options.index_path}")
+        except Exception as e:
+            logger.error(f"Failed to load FAISS index: {str(e)}")
+            raise
+
+    def embed_many(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed several texts in a single call to the embedding model.
+
+        Args:
+            texts (List[str]): The texts to embed
+
+        Returns:
+            np.ndarray: L2-normalized float32 matrix with one row per text
+        """
+        vectors = np.asarray(self.embedding_function(texts), dtype="float32")
+        faiss.normalize_L2(vectors)
+        return vectors
+
+    def _execute_queries(self, texts: List[str]) -> List[List[Tuple[float, int]]]:
+        """
+        Execute a batch of synchronous queries against the FAISS index.
+
+        All texts are embedded together and searched with one index call.
+
+        Args:
+            texts (List[str]): The query texts to search for
+
+        Returns:
+            List[List[Tuple[float, int]]]: For each text, (similarity score, document position) pairs, best first
+        """
+        logger.debug(f"Executing {len(texts)} FAISS queries")
+        scores, ids = self.index.search(self.embed_many(texts), self.options.n_results)
+        return [
+            [(float(score), int(idx)) for score, idx in zip(row_scores, row_ids) if idx != -1]
+            for row_scores, row_ids in zip(scores, ids)
+        ]
+
+    def _execute_query(self, text: str) -> List[Tuple[float, int]]:
+        """
+        Execute a synchronous query against the FAISS index.
+
+        Args:
+            text (str): The query text to search for
+
+        Returns:
+            List[Tuple[float, int]]: (similarity score, document position) pairs, best first
+        """
+        logger.debug(f"Executing FAISS query: {text[:50]}...")
+        return self._execute_queries([text])[0]
+
+    def _format_hits(self, hits: List[Tuple[float, int]]) -> List[Dict[str, Any]]:
+        """Convert index hits above the similarity threshold into result dictionaries."""
+        return [{
+            'content': self.documents[idx],
+            'metadata': self.metadatas[idx] or {},
+            'similarity_score': round(similarity_score, 4)
+        } for similarity_score, idx in hits if similarity_score >= self.options.similarity_threshold]
+
+    async def retrieve(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Retrieve documents from the FAISS index that match the query text.
+
+        Args:
+            text (str): The query text to search for
+
+        Returns:
+            List[Dict[str, Any]]: List of documents with content, metadata, and similarity scores
+                                 Returns empty list if no results or error occurs
+        """
+        if not text or not text.strip():
+            logger.warning("Empty query text provided to retrieve()")
+            return []
+
+        try:
+            # Run the synchronous query in the default executor to avoid blocking
+            hits = await asyncio.get_event_loop().run_in_executor(
+                None, self._execute_query, text
+            )
+
+            formatted_results = self._format_hits(hits)
+            logger.info(f"Retrieved {len(formatted_results)} results above threshold")
+            return formatted_results
+
+        except Exception as e:
+            logger.error(f"Error during retrieval: {str(e)}", exc_info=True)
+            return []
+
+    async def retrieve_and_combine_results(self, text: str) -> Dict[str, Any]:
+        """
+        Retrieve documents and combine them into a single result.
+
+        Args:
+            text (str): The query text to search for
+
+        Returns:
+            Dict[str, Any]: Dictionary containing:
+                - combined_content: All document contents joined together
+                - sources: List of metadata and similarity scores for each source
+                - total_sources: Number of sources retrieved
+        """
+        results = await self.retrieve(text)
+
+        if not results:
+            logger.info("No results to combine")
+            return {
+                "combined_content": "",
+                "sources": [],
+                "total_sources": 0
+            }
+
+        # FAISS already returns results best first
+        contents = [f"Document {i+1}:\n{doc['content']}" for i, doc in enumerate(results)]
+        combined_content = "\n\n---\n\n".join(contents)
+
+        sources = [{
+            "metadata": doc['metadata'],
+            "similarity_score": doc['similarity_score'],
+            "content_preview": doc['content'][:100] + "..." if len(doc['content']) > 100 else doc['content']
+        } for doc in results]
+
+        return {
+            "combined_content": combined_content,
+            "sources": sources,
+            "total_sources": len(sources)
+        }
+
+    async def retrieve_and_generate(self, text: str) -> Dict[str, Any]:
+        """
+        Retrieve documents and generate a summary.
+
+        Args:
+            text (str): The query text to search for
+
+        Returns:
+            Dict[str, Any]: Dictionary containing:
+                - generated_content: All document contents joined together
+                - summary: Excerpt from the most relevant document
+                - sources: List of metadata and similarity scores for each source
+                - total_sources: Number of sources retrieved
+        """
+        combined_results = await self.retrieve_and_combine_results(text)
+
+        if not combined_results['combined_content']:
+            logger.info("No content to generate summary from")
+            return {
+                "generated_content": "",
+                "summary": "",
+                "sources": [],
+                "total_sources": 0
+            }
+
+        summary = combined_results['sources'][0]['content_preview']
+        if len(summary) > 200:
+            summary = summary[:197] + "..."
+
+        return {
+            "generated_content": combined_results['combined_content'],
+            "summary": summary,
+            "sources": combined_results['sources'],
+            "total_sources": combined_results['total_sources']
+        }
+
+    async def health_check(self) -> Dict[str, Union[bool, str]]:
+        """
+        Check if the FAISS index is loaded.
+
+        Returns:
+            Dict[str, Union[bool, str]]: Dictionary with health status and message
+        """
+        try:
+            return {
+                "healthy": True,
+                "message": f"Loaded FAISS index '{self.options.index_path}' with {self.index.ntotal} documents"
+            }
+        except Exception as e:
+            logger.error(f"Health check failed: {str(e)}")
+            return {
+                "healthy": False,
+                "message": f"Failed to access FAISS index: {str(e)}"
+            }
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    # Write the quantized index used by the app and a float32 copy to compare recall against
+    for path, quantize in (('./faiss/ubs.index', True), ('./faiss/ubs_flat.index', False)):
+        count = build_faiss_index_from_chroma(
+            persist_directory='./chromadb',
+            collection_name='ubs-research',
+            index_path=path,
+            metadata_path='./faiss/ubs.json',
+            quantize=quantize
+        )
+        print(f"Exported {count} vectors to {path}")
@@ -8,10 +8,11 @@ from PIL import Image
 import io
 import requests
 import os
-import PyPDF2
 
 #Function to convert PDF files to a list of base64-encoded PNG images
 def pdf_to_base64_pngs(file, quality=75, max_size=(1024, 1024)):
+    # PyPDF2 is slow to import and only needed here, so load it on first use
+    import PyPDF2
     base64_encoded_pngs = []
     doc = PyPDF2.PdfReader(file)        
     for page in doc:
@@ -3,26 +3,91 @@ Passport detection and information extraction using AWS Bedrock Nova model.
 This module provides functionality to detect passports in documents and extract relevant information.
 """
 import os
+import re
 import json
 import base64
-import io
 from typing import Optional, Dict, Any, Union, BinaryIO
 import boto3
 import fitz  # PyMuPDF
-from PIL import Image
 
 # Configuration variables
 AWS_REGION = os.environ.get('AWS_REGION', 'us-east-1')
 NOVA_MODEL_ID = os.environ.get('NOVA_MODEL_ID', 'amazon.nova-lite-v1:0')
-IMAGE_DPI = 300
+IMAGE_DPI = 150
 IMAGE_QUALITY = 75
 MAX_IMAGE_SIZE = (1024, 1024)
+# Passport MRZ (TD3): two 44-character lines. The first holds the document type P,
+# issuing state and the holder's name with "<<" filler; the second the passport
+# number, nationality, dates of birth and expiry, each followed by a check digit.
+MRZ_LINE1_PATTERN = re.compile(r"^P[A-Z<][A-Z<]{3}(?=[A-Z<]*<<)[A-Z<]{39}$")
+MRZ_LINE2_PATTERN = re.compile(r"^[A-Z0-9<]{9}[0-9][A-Z<]{3}[0-9]{6}[0-9][MFX<][0-9]{6}[0-9][A-Z0-9<]{14}[0-9<][0-9]$")
 STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), 'static')
 
+def _is_pdf(file_obj: BinaryIO, file_name: Optional[str] = None) -> bool:
+    """Check whether a document is a PDF from its file name."""
+    name = file_name or getattr(file_obj, 'name', None)
+    return bool(name) and name.lower().endswith('.pdf')
+
+def _mrz_check_digit(field: str) -> str:
+    """Compute the ICAO 9303 check digit of an MRZ field."""
+    total = 0
+    for i, char in enumerate(field):
+        if char.isdigit():
+            value = int(char)
+        elif char.isalpha():
+            value = ord(char) - ord('A') + 10
+        else:
+            value = 0
+        total += value * (7, 3, 1)[i % 3]
+    return str(total % 10)
+
+def _mrz_line2_is_valid(line: str) -> bool:
+    """Check the passport number, birth date, expiry date and composite check digits."""
+    return (
+        _mrz_check_digit(line[0:9]) == line[9]
+        and _mrz_check_digit(line[13:19]) == line[19]
+        and _mrz_check_digit(line[21:27]) == line[27]
+        and _mrz_check_digit(line[0:10] + line[13:20] + line[21:43]) == line[43]
+    )
+
+def find_mrz_text(file_obj: BinaryIO, file_name: Optional[str] = None) -> Optional[str]:
+    """
+    Look for a passport machine-readable zone in the text layer of a PDF.
+    
+    Reading the text layer is much cheaper than rendering the page, so a PDF
+    that already carries its MRZ as text can be recognised without a model call.
+    
+    Args:
+        file_obj: A file-like object containing the document
+        file_name: Optional name of the file to help determine type
+        
+    Only a pair of consecutive lines that both match the MRZ layout and whose
+    check digits agree is accepted, so all-caps prose does not pass as an MRZ.
+    
+    Returns:
+        str: The two MRZ lines if found, None otherwise (including for images)
+    """
+    if not _is_pdf(file_obj, file_name):
+        return None
+    
+    file_obj.seek(0)
+    with fitz.open(stream=file_obj.read(), filetype="pdf") as pdf_document:
+        for page in pdf_document:
+            lines = [line.strip() for line in page.get_text("text").splitlines()]
+            for line1, line2 in zip(lines, lines[1:]):
+                if (MRZ_LINE1_PATTERN.match(line1) and MRZ_LINE2_PATTERN.match(line2)
+                        and _mrz_line2_is_valid(line2)):
+                    return f"{line1}\n{line2}"
+    return None
+
 def convert_document_to_image(file_obj: BinaryIO, file_name: Optional[str] = None) -> tuple:
     """
     Convert a document (PDF or image) to image bytes and determine media type.
     
+    The first page of a PDF is rendered in grayscale at the resolution that
+    fits MAX_IMAGE_SIZE and encoded to JPEG by PyMuPDF, rather than rendered
+    at full resolution and downscaled afterwards.
+    
     Args:
         file_obj: A file-like object containing the document
         file_name: Optional name of the file to help determine type
@@ -33,42 +98,23 @@ def convert_document_to_image(file_obj: BinaryIO, file_name: Optional[str] = Non
     # Reset file pointer
     file_obj.seek(0)
     
-    # Check if it's a PDF
-    is_pdf = False
-    if file_name and file_name.lower().endswith('.pdf'):
-        is_pdf = True
-    elif hasattr(file_obj, 'name') and file_obj.name.lower().endswith('.pdf'):
-        is_pdf = True
-    
-    if is_pdf:
-        # Convert PDF to image
-        pdf_bytes = file_obj.read()
-        
+    if _is_pdf(file_obj, file_name):
         # Use PyMuPDF to convert PDF to image
-        pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
-        if len(pdf_document) == 0:
-            return None, None
+        with fitz.open(stream=file_obj.read(), filetype="pdf") as pdf_document:
+            if len(pdf_document) == 0:
+                return None, None
+                
+            # Get the first page
+            page = pdf_document[0]
             
-        # Get the first page
-        page = pdf_document[0]
-        
-        # Render page to an image
-        pix = page.get_pixmap(matrix=fitz.Matrix(IMAGE_DPI/72, IMAGE_DPI/72))
-        
-        # Convert to PIL Image
-        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-        
-        # Resize if needed
-        if img.size[0] > MAX_IMAGE_SIZE[0] or img.size[1] > MAX_IMAGE_SIZE[1]:
-            img.thumbnail(MAX_IMAGE_SIZE, Image.Resampling.LANCZOS)
-        
-        # Convert to bytes
-        img_byte_arr = io.BytesIO()
-        img.save(img_byte_arr, format='JPEG', quality=IMAGE_QUALITY)
-        img_bytes = img_byte_arr.getvalue()
-        
-        # Close the PDF document
-        pdf_document.close()
+            # Render at IMAGE_DPI, or lower if that would exceed MAX_IMAGE_SIZE
+            zoom = min(
+                IMAGE_DPI / 72,
+                MAX_IMAGE_SIZE[0] / page.rect.width,
+                MAX_IMAGE_SIZE[1] / page.rect.height
+            )
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY)
+            img_bytes = pix.tobytes("jpeg", jpg_quality=IMAGE_QUALITY)
         
         return img_bytes, "image/jpeg"
     else:
@@ -116,6 +162,11 @@ def is_passport_with_nova(uploaded_file) -> bool:
         if hasattr(uploaded_file, 'name'):
             file_name = uploaded_file.name
             
+        # A PDF whose text layer has a check-digit-valid MRZ is a passport; skip rendering and the model call
+        if find_mrz_text(uploaded_file, file_name):
+            uploaded_file.seek(0)
+            return True
+            
         # Convert document to image
         img_bytes, media_type = convert_document_to_image(uploaded_file, file_name)
         if img_bytes is None:
@@ -261,7 +312,6 @@ Return ONLY the JSON with no additional text."""
             return passport_data
         except json.JSONDecodeError:
             # If the response isn't valid JSON, try to extract JSON from the text
-            import re
             json_match = re.search(r'({.*})', model_response, re.DOTALL)
             if json_match:
                 try:
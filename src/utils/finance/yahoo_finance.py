@@ -4,15 +4,195 @@ Yahoo Finance stock information fetcher.
 This module provides functionality to fetch stock information from Yahoo Finance.
 """
 import yfinance as yf
-import pandas as pd
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, Callable, List, Optional, Union
+import copy
+import functools
+import inspect
 import logging
+import os
+import threading
 import time
-from datetime import datetime, timedelta
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+
+from cachetools import TTLCache
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent Yahoo Finance requests for multi-ticker calls
+MAX_CONCURRENT_REQUESTS = int(os.environ.get("YAHOO_CONCURRENCY", "8"))
+
+# Connections kept open to Yahoo Finance; enough for the concurrent multi-ticker calls
+SESSION_POOL_SIZE = 2 * MAX_CONCURRENT_REQUESTS
+
+
+@functools.lru_cache(maxsize=1)
+def get_session():
+    """
+    Get the HTTP session shared by all Yahoo Finance requests.
+    
+    Reusing one session keeps connections to Yahoo open between calls, so
+    only the first request to a host pays for the TCP and TLS handshakes.
+    Recent yfinance releases already share their own curl_cffi session and
+    reject requests sessions; for those None is returned to keep it.
+    """
+    try:
+        import curl_cffi  # noqa: F401
+        return None
+    except ImportError:
+        pass
+    
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    session = requests.Session()
+    # Server errors are retried here; rate limiting (429) is retried by _fetch,
+    # so that every attempt waits for the client-side request limiter
+    session.mount('https://', HTTPAdapter(
+        pool_connections=SESSION_POOL_SIZE,
+        pool_maxsize=SESSION_POOL_SIZE,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504])
+    ))
+    return session
+
+
+def _ticker(symbol: str) -> yf.Ticker:
+    """Create a yfinance Ticker that uses the shared session."""
+    return yf.Ticker(symbol, session=get_session())
+
+
+# Client-side limit on Yahoo Finance requests; bursts up to REQUEST_BURST are allowed
+REQUESTS_PER_MINUTE = float(os.environ.get("YAHOO_REQUESTS_PER_MINUTE", "60"))
+REQUEST_BURST = 10
+# Attempts for a request that Yahoo rejects as rate limited, with exponential back-off
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_BACKOFF = 0.5
+
+
+class _RequestLimiter:
+    """Thread-safe token bucket that spaces out Yahoo Finance requests."""
+    
+    def __init__(self, per_minute: float, burst: int):
+        self.rate = per_minute / 60
+        self.burst = burst
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+                self._refilled_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_request_limiter = _RequestLimiter(REQUESTS_PER_MINUTE, REQUEST_BURST)
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    """Check whether an exception reports Yahoo Finance rate limiting."""
+    return 'RateLimit' in type(error).__name__ or '429' in str(error) or 'Too Many Requests' in str(error)
+
+
+def _fetch(request: Callable[[], Any]) -> Any:
+    """
+    Send a Yahoo Finance request within the client-side rate limit.
+    
+    Requests rejected as rate limited are retried with exponential back-off;
+    other errors are raised unchanged.
+    """
+    for attempt in range(RATE_LIMIT_RETRIES):
+        _request_limiter.acquire()
+        try:
+            return request()
+        except Exception as e:
+            if not _is_rate_limited(e) or attempt == RATE_LIMIT_RETRIES - 1:
+                raise
+            delay = RATE_LIMIT_BACKOFF * 2 ** attempt
+            logger.warning(f"Yahoo Finance rate limit hit, retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+
+# Cache lifetimes (seconds) for Yahoo Finance lookups; quotes change fastest
+QUOTE_CACHE_TTL = 60
+HISTORY_CACHE_TTL = 900
+NEWS_CACHE_TTL = 900
+MARKET_SUMMARY_CACHE_TTL = 900
+
+
+def _is_error(result: Any) -> bool:
+    """Check whether a Yahoo Finance result describes an error."""
+    if isinstance(result, list):
+        return bool(result) and isinstance(result[0], dict) and 'error' in result[0]
+    return isinstance(result, dict) and 'error' in result
+
+
+def _ttl_cached(ttl: int, maxsize: int = 512):
+    """
+    Cache a client method's results for ttl seconds, keyed by its arguments.
+    
+    The cache is shared by every client in the process, so agents asking for
+    the same ticker within the lifetime reuse one response. Arguments are
+    bound to the method's signature first, so positional, keyword and
+    defaulted forms of the same call share an entry. Concurrent calls with
+    the same arguments wait for the request already in flight instead of
+    sending their own. Every caller gets its own copy of the result, so
+    changing it does not affect the cached value. Error results are returned
+    but not cached, so a transient failure is retried on the next call.
+    """
+    def decorator(method):
+        cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        signature = inspect.signature(method)
+        # Requests being fetched, by key, for callers that miss the cache meanwhile
+        in_flight = {}
+        # TTLCache is not thread-safe and lookups run from worker threads
+        lock = threading.Lock()
+        
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            key = tuple(tuple(arg) if isinstance(arg, list) else arg
+                        for arg in list(bound.arguments.values())[1:])
+            with lock:
+                result = cache.get(key)
+                future = in_flight.get(key) if result is None else None
+                leader = result is None and future is None
+                if leader:
+                    future = in_flight[key] = Future()
+            if result is not None:
+                logger.debug("Cache hit for %s%s", method.__name__, key)
+                return copy.deepcopy(result)
+            if not leader:
+                logger.debug("Waiting for in-flight %s%s", method.__name__, key)
+                return copy.deepcopy(future.result())
+            
+            try:
+                result = method(self, *args, **kwargs)
+            except Exception as e:
+                with lock:
+                    del in_flight[key]
+                future.set_exception(e)
+                raise
+            with lock:
+                if not _is_error(result):
+                    cache[key] = result
+                del in_flight[key]
+            future.set_result(result)
+            return copy.deepcopy(result)
+        
+        return wrapper
+    return decorator
+
 class YahooFinanceClient:
     """
     Client for fetching stock information from Yahoo Finance.
@@ -25,6 +205,17 @@ class YahooFinanceClient:
         """Initialize the Yahoo Finance client."""
         pass
     
+    @_ttl_cached(QUOTE_CACHE_TTL)
+    def _get_info(self, ticker: str) -> Dict[str, Any]:
+        """
+        Fetch the raw Yahoo Finance info for a ticker.
+        
+        Stock information and quotes are both built from this one response,
+        so comparing stocks needs a single request per ticker.
+        """
+        return _fetch(lambda: _ticker(ticker).info)
+    
+    @_ttl_cached(QUOTE_CACHE_TTL)
     def get_stock_info(self, ticker: str) -> Dict[str, Any]:
         """
         Get basic information about a stock.
@@ -44,8 +235,7 @@ class YahooFinanceClient:
                     'status': 'error'
                 }
                 
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            info = self._get_info(ticker)
             
             # Check if we got valid info
             if not info or len(info) < 5:  # Basic check for minimal info
@@ -97,6 +287,54 @@ class YahooFinanceClient:
                 'status': 'error'
             }
     
+    def get_multiple_stock_infos(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get basic information about several stocks concurrently.
+        
+        Each ticker needs its own HTTP round trip, so the requests are issued
+        in parallel and the total latency is that of the slowest one.
+        
+        Args:
+            tickers: List of stock ticker symbols
+            
+        Returns:
+            Dict mapping ticker symbols to their stock information
+        """
+        if not tickers:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_REQUESTS, len(tickers))) as executor:
+            return dict(zip(tickers, executor.map(self.get_stock_info, tickers)))
+    
+    def get_stock_overview(self, ticker: str, period: str = '1mo', interval: str = '1d',
+                           news_limit: int = 3) -> Dict[str, Any]:
+        """
+        Get a stock's information, price history and recent news in one call.
+        
+        The three requests are independent, so they are issued in parallel
+        and the total latency is that of the slowest one.
+        
+        Args:
+            ticker: Stock ticker symbol
+            period: Time period of the historical data
+            interval: Interval of the historical data
+            news_limit: Maximum number of news items to return
+            
+        Returns:
+            Dict with 'stock_info', 'historical_data' and 'news' as returned by
+            get_stock_info, get_historical_data and get_company_news
+        """
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            stock_info = executor.submit(self.get_stock_info, ticker)
+            historical_data = executor.submit(self.get_historical_data, ticker, period, interval)
+            news = executor.submit(self.get_company_news, ticker, news_limit)
+            return {
+                'stock_info': stock_info.result(),
+                'historical_data': historical_data.result(),
+                'news': news.result()
+            }
+    
+    @_ttl_cached(HISTORY_CACHE_TTL)
     def get_historical_data(self, ticker: str, period: str = '1mo', interval: str = '1d') -> Dict[str, Any]:
         """
         Get historical price data for a stock.
@@ -120,8 +358,8 @@ class YahooFinanceClient:
                     'status': 'error'
                 }
                 
-            stock = yf.Ticker(ticker)
-            hist = stock.history(period=period, interval=interval)
+            stock = _ticker(ticker)
+            hist = _fetch(lambda: stock.history(period=period, interval=interval))
             
             # Check if we got valid data
             if hist.empty:
@@ -138,17 +376,17 @@ class YahooFinanceClient:
                     }
                 }
             
-            # Convert to records format for easier processing
-            data_records = []
-            for date, row in hist.iterrows():
-                data_records.append({
-                    'date': date.strftime('%Y-%m-%d'),
-                    'open': round(row['Open'], 2) if not pd.isna(row['Open']) else None,
-                    'high': round(row['High'], 2) if not pd.isna(row['High']) else None,
-                    'low': round(row['Low'], 2) if not pd.isna(row['Low']) else None,
-                    'close': round(row['Close'], 2) if not pd.isna(row['Close']) else None,
-                    'volume': int(row['Volume']) if not pd.isna(row['Volume']) else 0
-                })
+            # Convert to records format for easier processing, a column at a time
+            # rather than row by row; missing prices become None and missing volumes 0
+            prices = hist[['Open', 'High', 'Low', 'Close']].round(2)
+            prices = prices.astype(object).where(prices.notna(), None)
+            volumes = hist['Volume'].fillna(0).astype('int64')
+            data_records = [
+                {'date': date, 'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume}
+                for date, (open_, high, low, close), volume in zip(
+                    hist.index.strftime('%Y-%m-%d'), prices.to_numpy().tolist(), volumes.tolist()
+                )
+            ]
             
             # Calculate some basic statistics
             if data_records:
@@ -208,50 +446,55 @@ class YahooFinanceClient:
                 }
             }
     
+    @_ttl_cached(QUOTE_CACHE_TTL)
     def get_multiple_quotes(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
         """
         Get current quotes for multiple stocks.
         
+        The quotes are fetched in parallel, and share their per-ticker
+        response with get_stock_info.
+        
         Args:
             tickers: List of stock ticker symbols
             
         Returns:
             Dict mapping ticker symbols to their quote information
         """
-        results = {}
-        for ticker in tickers:
-            try:
-                stock = yf.Ticker(ticker)
-                quote = stock.info
-                
-                # Extract just the quote information
-                quote_info = {
-                    'price': quote.get('currentPrice', quote.get('regularMarketPrice', 'N/A')),
-                    'change': quote.get('regularMarketChange', 'N/A'),
-                    'change_percent': quote.get('regularMarketChangePercent', 'N/A'),
-                    'volume': quote.get('regularMarketVolume', 'N/A'),
-                    'market_cap': quote.get('marketCap', 'N/A'),
-                    'name': quote.get('shortName', 'N/A')
-                }
-                
-                # Format the percent change
-                if isinstance(quote_info['change_percent'], (int, float)):
-                    quote_info['change_percent_formatted'] = f"{quote_info['change_percent']:.2f}%"
-                
-                results[ticker] = quote_info
-                
-                # Add a small delay to avoid rate limiting
-                time.sleep(0.1)
-                
-            except Exception as e:
-                logger.error(f"Error fetching quote for {ticker}: {str(e)}")
-                results[ticker] = {
-                    'error': str(e),
-                    'status': 'error'
-                }
+        if not tickers:
+            return {}
         
-        return results
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_REQUESTS, len(tickers))) as executor:
+            return dict(zip(tickers, executor.map(self._get_quote, tickers)))
     
+    def _get_quote(self, ticker: str) -> Dict[str, Any]:
+        """Get the current quote for one stock; see get_multiple_quotes."""
+        try:
+            quote = self._get_info(ticker)
+            
+            # Extract just the quote information
+            quote_info = {
+                'price': quote.get('currentPrice', quote.get('regularMarketPrice', 'N/A')),
+                'change': quote.get('regularMarketChange', 'N/A'),
+                'change_percent': quote.get('regularMarketChangePercent', 'N/A'),
+                'volume': quote.get('regularMarketVolume', 'N/A'),
+                'market_cap': quote.get('marketCap', 'N/A'),
+                'name': quote.get('shortName', 'N/A')
+            }
+            
+            # Format the percent change
+            if isinstance(quote_info['change_percent'], (int, float)):
+                quote_info['change_percent_formatted'] = f"{quote_info['change_percent']:.2f}%"
+            
+            return quote_info
+            
+        except Exception as e:
+            logger.error(f"Error fetching quote for {ticker}: {str(e)}")
+            return {
+                'error': str(e),
+                'status': 'error'
+            }
+    
+    @_ttl_cached(NEWS_CACHE_TTL)
     def get_company_news(self, ticker: str, limit: int = 5) -> List[Dict[str, Any]]:
         """
         Get recent news articles about a company.
@@ -264,8 +507,8 @@ class YahooFinanceClient:
             List of news article information
         """
         try:
-            stock = yf.Ticker(ticker)
-            news = stock.news
+            stock = _ticker(ticker)
+            news = _fetch(lambda: stock.news)
             
             # Limit the number of news items and extract relevant information
             limited_news = []
@@ -306,12 +549,11 @@ class YahooFinanceClient:
         try:
             # This is a simple implementation since yfinance doesn't have a direct search function
             # For a production system, you might want to use a more robust solution
-            tickers = yf.Tickers(query)
             results = []
             
             # Try to get info for the exact ticker match
             try:
-                info = tickers.tickers[query].info
+                info = self._get_info(query)
                 results.append({
                     'symbol': query,
                     'name': info.get('shortName', 'N/A'),
@@ -333,6 +575,7 @@ class YahooFinanceClient:
                 'status': 'error'
             }]
     
+    @_ttl_cached(MARKET_SUMMARY_CACHE_TTL)
     def get_market_summary(self) -> Dict[str, Any]:
         """
         Get a summary of major market indices.
@@ -346,8 +589,7 @@ class YahooFinanceClient:
             results = {}
             for index in indices:
                 try:
-                    idx = yf.Ticker(index)
-                    info = idx.info
+                    info = self._get_info(index)
                     
                     results[index] = {
                         'name': info.get('shortName', 'N/A'),
@@ -361,9 +603,6 @@ class YahooFinanceClient:
                     if isinstance(results[index]['change_percent'], (int, float)):
                         results[index]['change_percent_formatted'] = f"{results[index]['change_percent']:.2f}%"
                     
-                    # Add a small delay to avoid rate limiting
-                    time.sleep(0.1)
-                    
                 except Exception as e:
                     logger.error(f"Error fetching data for index {index}: {str(e)}")
                     results[index] = {
@@ -0,0 +1,45 @@
+from src.tools.data_catalog_tool import _match_products, _products_with_prefix, search_data_catalog
+import unittest
+
+
+class TestMatchProducts(unittest.TestCase):
+
+    def test_prefix_matches_word_starts(self):
+        self.assertEqual(_products_with_prefix("renew"), {"swiss_power_plants"})
+        self.assertEqual(_products_with_prefix("popul"), {"swiss_population"})
+        self.assertEqual(_products_with_prefix("swis"), {"swiss_power_plants", "swiss_population"})
+        self.assertEqual(_products_with_prefix("zzz"), set())
+
+    def test_every_query_word_must_match(self):
+        self.assertEqual(_match_products("swiss power"), ["swiss_power_plants"])
+        self.assertEqual(_match_products("swiss"), ["swiss_power_plants", "swiss_population"])
+        self.assertEqual(_match_products("power population"), [])
+
+    def test_results_follow_catalog_order(self):
+        self.assertEqual(_match_products("switzerland"), ["swiss_power_plants", "swiss_population"])
+
+    def test_word_fragment_falls_back_to_substring(self):
+        # "newable" starts no indexed word but occurs inside "renewable"
+        self.assertEqual(_match_products("newable"), ["swiss_power_plants"])
+
+    def test_short_query_uses_substring_match(self):
+        self.assertEqual(_match_products("z"), ["swiss_power_plants", "swiss_population"])
+        self.assertEqual(_match_products("q"), [])
+
+
+class TestSearchDataCatalog(unittest.TestCase):
+
+    def test_query_is_case_insensitive(self):
+        result = search_data_catalog(query="Population")
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(list(result["matching_products"]), ["swiss_population"])
+        self.assertEqual(result["total_matches"], 1)
+
+    def test_unknown_product_id(self):
+        result = search_data_catalog(data_product_id="missing")
+        self.assertEqual(result["status"], "error")
+        self.assertIn("swiss_population", result["available_products"])
+
+
+if __name__ == "__main__":
+    unittest.main()
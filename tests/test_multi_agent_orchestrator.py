@@ -0,0 +1,64 @@
+from src.agents.strands.multi_agent_orchestrator import _query_terms, route_to_agent
+import unittest
+
+
+class TestQueryTerms(unittest.TestCase):
+
+    def test_words_phrases_and_singulars(self):
+        terms = _query_terms("Swiss Power Plants?")
+        self.assertIn("swiss", terms)
+        self.assertIn("power plants", terms)
+        self.assertIn("power plant", terms)
+        self.assertIn("plant", terms)
+
+
+class TestRouteToAgent(unittest.TestCase):
+
+    def test_routes_by_keyword(self):
+        cases = {
+            "I want to open a bank account": "banking",
+            "Please extract the data from my passport": "document",
+            "What is the current price of AAPL stock?": "stock",
+            "Which dataset has the population metadata?": "data_catalog",
+        }
+        for query, agent in cases.items():
+            with self.subTest(query=query):
+                self.assertEqual(route_to_agent(query)["agent"], agent)
+
+    def test_no_keywords_routes_to_general(self):
+        result = route_to_agent("Tell me a joke")
+        self.assertEqual(result["agent"], "general")
+        self.assertEqual(result["confidence"], 1.0)
+
+    def test_short_query_routes_to_general(self):
+        self.assertEqual(route_to_agent("hi")["agent"], "general")
+
+    def test_matches_whole_words_only(self):
+        """A keyword inside a longer word does not count."""
+        self.assertEqual(route_to_agent("The stockade was built in 1700")["agent"], "general")
+
+    def test_matches_plurals_and_variants(self):
+        self.assertEqual(route_to_agent("Latest dividends and investment ideas")["agent"], "stock")
+        self.assertEqual(route_to_agent("Run the passport validation")["agent"], "document")
+        self.assertEqual(route_to_agent("List the power plant attribute names")["agent"], "data_catalog")
+
+    def test_each_keyword_counts_once(self):
+        """Repeating a keyword does not outweigh two different keywords."""
+        result = route_to_agent("stock stock stock stocks for my bank account")
+        self.assertEqual(result["agent"], "banking")
+        self.assertAlmostEqual(result["confidence"], 2 / 3)
+
+    def test_confidence_is_share_of_matches(self):
+        result = route_to_agent("stock price and market of my bank account")
+        self.assertEqual(result["agent"], "stock")
+        self.assertAlmostEqual(result["confidence"], 3 / 5)
+
+    def test_ties_go_to_the_first_agent(self):
+        """Agents are declared in priority order, which breaks ties."""
+        result = route_to_agent("bank stock")
+        self.assertEqual(result["agent"], "banking")
+        self.assertAlmostEqual(result["confidence"], 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
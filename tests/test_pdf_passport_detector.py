@@ -0,0 +1,70 @@
+from src.utils.document_processing.pdf_passport_detector_refactored import (
+    MRZ_LINE1_PATTERN, MRZ_LINE2_PATTERN, _mrz_check_digit, _mrz_line2_is_valid, find_mrz_text
+)
+import io
+import unittest
+
+import fitz
+
+# ICAO 9303 specimen passport
+SPECIMEN_LINE1 = "P<UTOERIKSSON<<ANNA<MARIA<<<<<<<<<<<<<<<<<<<"
+SPECIMEN_LINE2 = "L898902C36UTO7408122F1204159ZE184226B<<<<<10"
+
+
+def make_pdf(text):
+    """Build a one-page PDF whose text layer holds text, one line per line."""
+    document = fitz.open()
+    page = document.new_page()
+    for i, line in enumerate(text.splitlines()):
+        page.insert_text((36, 72 + 14 * i), line, fontname="cour", fontsize=9)
+    data = document.tobytes()
+    document.close()
+    return io.BytesIO(data)
+
+
+class TestMRZCheckDigits(unittest.TestCase):
+
+    def test_check_digit(self):
+        self.assertEqual(_mrz_check_digit("L898902C3"), "6")
+        self.assertEqual(_mrz_check_digit("740812"), "2")
+        self.assertEqual(_mrz_check_digit("120415"), "9")
+        self.assertEqual(_mrz_check_digit("<<<<<<"), "0")
+
+    def test_specimen_is_valid(self):
+        self.assertTrue(MRZ_LINE1_PATTERN.match(SPECIMEN_LINE1))
+        self.assertTrue(MRZ_LINE2_PATTERN.match(SPECIMEN_LINE2))
+        self.assertTrue(_mrz_line2_is_valid(SPECIMEN_LINE2))
+
+    def test_wrong_check_digit_is_invalid(self):
+        for position in (9, 19, 27, 43):
+            line = SPECIMEN_LINE2[:position] + str((int(SPECIMEN_LINE2[position]) + 1) % 10) + SPECIMEN_LINE2[position + 1:]
+            with self.subTest(position=position):
+                self.assertFalse(_mrz_line2_is_valid(line))
+
+    def test_all_caps_text_is_not_a_first_line(self):
+        for text in ("PLEASEREADTHETERMSANDCONDITIONSCAREFULLYBEFOR",
+                     "PERSONAL CHECKING ACCOUNT STATEMENT FOR JANUA"):
+            with self.subTest(text=text):
+                self.assertIsNone(MRZ_LINE1_PATTERN.match(text))
+
+
+class TestFindMRZText(unittest.TestCase):
+
+    def test_finds_mrz_in_text_layer(self):
+        pdf = make_pdf(f"PASSPORT\n{SPECIMEN_LINE1}\n{SPECIMEN_LINE2}")
+        self.assertEqual(find_mrz_text(pdf, "passport.pdf"), f"{SPECIMEN_LINE1}\n{SPECIMEN_LINE2}")
+
+    def test_ignores_all_caps_statement(self):
+        pdf = make_pdf("PERSONAL CHECKING ACCOUNT STATEMENT\nPLEASE READ THE TERMS AND CONDITIONS CAREFULLY")
+        self.assertIsNone(find_mrz_text(pdf, "statement.pdf"))
+
+    def test_ignores_mrz_with_bad_check_digits(self):
+        pdf = make_pdf(f"{SPECIMEN_LINE1}\n{SPECIMEN_LINE2[:-1]}1")
+        self.assertIsNone(find_mrz_text(pdf, "passport.pdf"))
+
+    def test_skips_images(self):
+        self.assertIsNone(find_mrz_text(io.BytesIO(b"\xff\xd8"), "passport.jpg"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+from src.agents.strands._rate_limit import AdaptiveLimiter, THROTTLE_COOLDOWN, _is_throttling_error, run_limited
+import asyncio
+import threading
+import time
+import unittest
+
+
+class ModelThrottledException(Exception):
+    pass
+
+
+class TestAdaptiveLimiter(unittest.TestCase):
+
+    def _acquire_in_thread(self, limiter, timeout=1.0):
+        """Call limiter.acquire() in a thread and report whether it returned within timeout."""
+        thread = threading.Thread(target=limiter.acquire, daemon=True)
+        thread.start()
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    def test_rejects_non_positive_rate(self):
+        """A rate of zero or below is rejected when the limiter is built."""
+        for rate in (0, -1):
+            with self.assertRaises(ValueError):
+                AdaptiveLimiter(4, rate)
+
+    def test_rejects_zero_concurrency(self):
+        with self.assertRaises(ValueError):
+            AdaptiveLimiter(0, 5)
+
+    def test_sub_one_rate_admits_calls(self):
+        """Below one call per second the bucket still holds a whole token."""
+        limiter = AdaptiveLimiter(4, 0.5)
+        self.assertEqual(limiter.burst, 1.0)
+        self.assertTrue(self._acquire_in_thread(limiter))
+
+        # The next token is due 1 / rate seconds later; move the clock forward by that much
+        thread = threading.Thread(target=limiter.acquire, daemon=True)
+        thread.start()
+        thread.join(0.2)
+        self.assertTrue(thread.is_alive())
+        with limiter._condition:
+            limiter._refilled_at -= 2.0
+            limiter._condition.notify_all()
+        thread.join(1.0)
+        self.assertFalse(thread.is_alive())
+
+    def test_refill_accrues_tokens_at_rate(self):
+        """After the burst is spent, the next call waits for the next token."""
+        limiter = AdaptiveLimiter(10, 20)
+        for _ in range(20):
+            limiter.acquire()
+            limiter.release()
+
+        start = time.monotonic()
+        limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.03)
+
+    def test_refill_is_capped_at_burst(self):
+        limiter = AdaptiveLimiter(4, 2)
+        limiter._refill(limiter._refilled_at + 60)
+        self.assertEqual(limiter._tokens, 2)
+
+    def test_concurrency_cap_blocks_until_release(self):
+        limiter = AdaptiveLimiter(1, 100)
+        limiter.acquire()
+
+        thread = threading.Thread(target=limiter.acquire, daemon=True)
+        thread.start()
+        thread.join(0.1)
+        self.assertTrue(thread.is_alive())
+
+        limiter.release()
+        thread.join(1.0)
+        self.assertFalse(thread.is_alive())
+
+    def test_throttled_halves_cap_until_cooldown(self):
+        limiter = AdaptiveLimiter(4, 100)
+        limiter.throttled()
+        self.assertEqual(limiter._limit, 2)
+        self.assertAlmostEqual(limiter._restore_at, time.monotonic() + THROTTLE_COOLDOWN, delta=1)
+
+        with limiter._condition:
+            limiter._refill(limiter._restore_at)
+        self.assertEqual(limiter._limit, 4)
+
+    def test_throttled_keeps_one_slot(self):
+        limiter = AdaptiveLimiter(1, 100)
+        limiter.throttled()
+        self.assertEqual(limiter._limit, 1)
+
+    def test_slot_backs_off_on_throttling(self):
+        limiter = AdaptiveLimiter(4, 100)
+        with self.assertRaises(ModelThrottledException):
+            with limiter.slot():
+                raise ModelThrottledException()
+        self.assertEqual(limiter._limit, 2)
+        self.assertEqual(limiter._in_flight, 0)
+
+    def test_slot_ignores_other_errors(self):
+        limiter = AdaptiveLimiter(4, 100)
+        with self.assertRaises(ValueError):
+            with limiter.slot():
+                raise ValueError()
+        self.assertEqual(limiter._limit, 4)
+        self.assertEqual(limiter._in_flight, 0)
+
+
+class TestThrottlingErrors(unittest.TestCase):
+
+    def test_matches_exception_name(self):
+        self.assertTrue(_is_throttling_error(ModelThrottledException()))
+        self.assertFalse(_is_throttling_error(ValueError()))
+
+    def test_matches_client_error_code(self):
+        error = Exception()
+        error.response = {"Error": {"Code": "ThrottlingException"}}
+        self.assertTrue(_is_throttling_error(error))
+        error.response = {"Error": {"Code": "ValidationException"}}
+        self.assertFalse(_is_throttling_error(error))
+
+
+class TestRunLimited(unittest.TestCase):
+
+    def test_returns_result(self):
+        self.assertEqual(asyncio.run(run_limited(lambda a, b: a + b, 1, 2)), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+from src.agents.simpleagents.base_agent import SimpleAgent, _estimate_tokens
+from unittest.mock import patch
+import unittest
+
+
+def make_agent(**kwargs):
+    """Create a Bedrock Claude SimpleAgent without a real Bedrock client."""
+    with patch('src.agents.simpleagents.base_agent._get_bedrock_client'):
+        return SimpleAgent(
+            name="Test Agent",
+            description="an agent under test",
+            model_name="anthropic.claude-3-sonnet-20240229-v1:0",
+            **kwargs
+        )
+
+
+class TestTrimHistory(unittest.TestCase):
+
+    def test_keeps_at_most_max_history_messages(self):
+        agent = make_agent(max_history_messages=4)
+        for i in range(10):
+            agent._append_message({"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i}"})
+            agent._trim_history()
+
+        self.assertLessEqual(len(agent._history), 4)
+        self.assertEqual(agent._history[-1]["content"], "message 9")
+
+    def test_window_starts_with_a_user_message(self):
+        agent = make_agent(max_history_messages=3)
+        for message in (
+            {"role": "user", "content": "question"},
+            {"role": "assistant", "content": None, "tool_calls": [{"id": "1"}]},
+            {"role": "tool", "tool_call_id": "1", "content": "result"},
+            {"role": "assistant", "content": "answer"},
+        ):
+            agent._append_message(message)
+        agent._trim_history()
+
+        # Once the question is evicted, its tool call and result are evicted with it
+        self.assertEqual([message["role"] for message in agent._history], ["assistant"])
+
+    def test_respects_token_budget(self):
+        agent = make_agent(max_tokens=10, max_context_tokens=200)
+        for i in range(20):
+            agent._append_message({"role": "user", "content": "x" * 100})
+            agent._trim_history()
+
+        budget = agent.max_context_tokens - agent.max_tokens - _estimate_tokens(agent._system_msg)
+        self.assertLessEqual(agent._history_tokens, budget)
+        self.assertEqual(agent._history_tokens, sum(map(_estimate_tokens, agent._history)))
+
+    def test_always_keeps_newest_message(self):
+        agent = make_agent(max_tokens=10, max_context_tokens=50)
+        agent._append_message({"role": "user", "content": "x" * 10000})
+        agent._trim_history()
+        self.assertEqual(len(agent._history), 1)
+
+    def test_system_message_is_kept_apart(self):
+        agent = make_agent(max_history_messages=2)
+        for i in range(5):
+            agent._append_message({"role": "user", "content": f"message {i}"})
+            agent._trim_history()
+        self.assertEqual(agent.messages[0]["role"], "system")
+
+
+class TestStreamMessage(unittest.TestCase):
+
+    def test_records_streamed_reply(self):
+        agent = make_agent()
+        agent._stream_impl = lambda messages: iter(["Hello", ", ", "world"])
+
+        self.assertEqual("".join(agent.stream_message("hi")), "Hello, world")
+        self.assertEqual(list(agent._history), [
+            {"role": "user", "content": "hi"},
+            {"role": "assistant", "content": "Hello, world"},
+        ])
+
+    def test_records_reply_when_closed_early(self):
+        agent = make_agent()
+        agent._stream_impl = lambda messages: iter(["Hello", ", ", "world"])
+
+        stream = agent.stream_message("hi")
+        self.assertEqual(next(stream), "Hello")
+        stream.close()
+
+        self.assertEqual([message["role"] for message in agent._history], ["user", "assistant"])
+        self.assertEqual(agent._history[-1]["content"], "Hello")
+
+    def test_records_error_as_reply(self):
+        agent = make_agent()
+
+        def failing_stream(messages):
+            yield "Partial"
+            raise RuntimeError("connection reset")
+
+        agent._stream_impl = failing_stream
+        reply = "".join(agent.stream_message("hi"))
+
+        self.assertEqual(reply, "PartialError: connection reset")
+        self.assertEqual(agent._history[-1], {"role": "assistant", "content": reply})
+
+
+if __name__ == "__main__":
+    unittest.main()
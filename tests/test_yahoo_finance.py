@@ -0,0 +1,127 @@
+from src.utils.finance.yahoo_finance import _ttl_cached
+import threading
+import time
+import unittest
+
+
+class FakeClient:
+    """Client whose lookups count their calls and can be held until released."""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    @_ttl_cached(60)
+    def get_history(self, ticker: str, period: str = '1mo', interval: str = '1d'):
+        self.calls += 1
+        self.release.wait(5)
+        return {'ticker': ticker, 'period': period, 'interval': interval, 'data': [1, 2, 3]}
+
+    @_ttl_cached(60)
+    def get_quotes(self, tickers: list):
+        self.calls += 1
+        return {ticker: {'price': 1.0} for ticker in tickers}
+
+    @_ttl_cached(60)
+    def get_failing(self, ticker: str):
+        self.calls += 1
+        return {'symbol': ticker, 'error': 'not found'}
+
+    @_ttl_cached(60)
+    def get_raising(self, ticker: str):
+        self.calls += 1
+        raise RuntimeError('network down')
+
+    @_ttl_cached(0.1)
+    def get_short_lived(self, ticker: str):
+        self.calls += 1
+        return {'ticker': ticker}
+
+
+class TestTTLCached(unittest.TestCase):
+
+    def test_repeated_call_is_served_from_cache(self):
+        client = FakeClient()
+        first = client.get_history('AAPL')
+        second = client.get_history('AAPL')
+        self.assertEqual(first, second)
+        self.assertEqual(client.calls, 1)
+
+    def test_cache_is_shared_between_clients(self):
+        first, second = FakeClient(), FakeClient()
+        first.get_history('SHARED')
+        second.get_history('SHARED')
+        self.assertEqual(first.calls + second.calls, 1)
+
+    def test_positional_keyword_and_default_arguments_share_an_entry(self):
+        client = FakeClient()
+        client.get_history('MSFT')
+        client.get_history('MSFT', '1mo', '1d')
+        client.get_history('MSFT', period='1mo', interval='1d')
+        client.get_history(ticker='MSFT', interval='1d')
+        self.assertEqual(client.calls, 1)
+
+        client.get_history('MSFT', period='1y')
+        self.assertEqual(client.calls, 2)
+
+    def test_list_arguments_are_keyed_by_value(self):
+        client = FakeClient()
+        client.get_quotes(['AAPL', 'MSFT'])
+        client.get_quotes(['AAPL', 'MSFT'])
+        self.assertEqual(client.calls, 1)
+
+    def test_callers_cannot_change_the_cached_result(self):
+        client = FakeClient()
+        first = client.get_history('GOOG')
+        first['analysis'] = 'stale'
+        first['data'].append(4)
+
+        second = client.get_history('GOOG')
+        self.assertNotIn('analysis', second)
+        self.assertEqual(second['data'], [1, 2, 3])
+
+    def test_error_results_are_not_cached(self):
+        client = FakeClient()
+        self.assertIn('error', client.get_failing('XXXX'))
+        client.get_failing('XXXX')
+        self.assertEqual(client.calls, 2)
+
+    def test_exceptions_are_not_cached(self):
+        client = FakeClient()
+        for _ in range(2):
+            with self.assertRaises(RuntimeError):
+                client.get_raising('XXXX')
+        self.assertEqual(client.calls, 2)
+
+    def test_entries_expire(self):
+        client = FakeClient()
+        client.get_short_lived('AMZN')
+        time.sleep(0.2)
+        client.get_short_lived('AMZN')
+        self.assertEqual(client.calls, 2)
+
+    def test_concurrent_calls_share_the_request_in_flight(self):
+        client = FakeClient()
+        client.release.clear()
+        results = []
+
+        def lookup():
+            results.append(client.get_history('NVDA', period='5d'))
+
+        threads = [threading.Thread(target=lookup) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        client.release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(client.calls, 1)
+        self.assertEqual(len(results), 5)
+        # Each waiter gets its own copy
+        self.assertEqual(len({id(result) for result in results}), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()